@@ -1,11 +1,25 @@
 """UltimateAbletonMCP Remote Script for Ableton Live.
 
-Per-request-ID queue architecture:
-1. TCP socket thread receives newline-delimited JSON commands
-2. Each command gets unique request_id, goes into command_queue
-3. update_display() (Live main thread, every tick) drains queue, dispatches
-4. Results go into response_queues[request_id]
-5. Socket thread picks up response, sends back
+Pipelined queue architecture:
+1. One selector-driven I/O thread serves every client (see network.py)
+2. Every complete line is enqueued on command_queue immediately, in the
+   priority lane its action is assigned (transport, write, read), with a
+   deadline; "cancel" requests are answered on the I/O thread
+3. update_display() (Live main thread, every tick) coalesces repeated
+   writes to the same target and merges identical reads, then drains
+   queue by priority within a time budget, dropping expired or cancelled
+   commands, dispatches. Commands a handler defers (DeferCommand) go back
+   to the queue for the next tick, and handlers with background work
+   (the browser index) get the rest of the budget through on_tick()
+4. Each response is queued on its client's write buffer, tagged with the
+   request id, and the I/O thread is woken to flush it. Requests sent
+   with "stream": true get their result as a sequence of frames instead,
+   built and encoded by the I/O thread as it writes them out (see
+   commands.stream_frames)
+5. Live listeners registered through "subscribe" mark their target dirty;
+   update_display() pushes one event frame per changed target per tick,
+   ahead of that tick's responses so a client's view of the set already
+   reflects a write when the write's response arrives (see subscriptions.py)
 
 No ControlSurface inheritance — raw Remote Script interface.
 """
@@ -14,15 +28,13 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 import json
 import os
-import socket
-import threading
+import time
 import traceback
 
-try:
-    import Queue as queue  # Python 2 (Ableton < 12)
-except ImportError:
-    import queue  # Python 3 (Ableton 12+)
-
+from .commands import Command, CommandQueue
+from .handlers import DeferCommand, PRIORITY_WRITE, PRIORITY_READ
+from .network import SelectorServer
+from .subscriptions import SubscriptionManager
 from .handlers.session import SessionHandler
 from .handlers.transport import TransportHandler
 from .handlers.track import TrackHandler
@@ -33,6 +45,10 @@ from .handlers.browser import BrowserHandler
 
 HOST = "localhost"
 DEFAULT_PORT = 9877
+DEFAULT_TICK_BUDGET_MS = 8.0
+DEFAULT_COMMAND_TIMEOUT = 15.0  # seconds, when the request sets no timeout
+DEFAULT_MAX_QUEUED = 1024
+BUSY_RETRY_AFTER = 0.1  # seconds, roughly one Live tick
 
 
 def create_instance(c_instance):
@@ -46,15 +62,23 @@ class UltimateAbletonMCP(object):
     def __init__(self, c_instance):
         self._c_instance = c_instance
         self._song = c_instance.song()
-        self._running = False
-        self._server_socket = None
-        self._server_thread = None
-        self._client_threads = []
-
-        # Per-request queuing
-        self._command_queue = queue.Queue()
-        self._response_queues = {}
-        self._response_lock = threading.Lock()
+        self._server = None
+
+        # Main-thread time allowed per update_display() call, in seconds
+        self._tick_budget = self._env_float(
+            "ABLETON_MCP_TICK_BUDGET_MS", DEFAULT_TICK_BUDGET_MS) / 1000.0
+        self._stats = {
+            "ticks": 0,
+            "executed": 0,
+            "budget_exhausted": 0,
+            "coalesced": 0,
+            "expired": 0,
+            "cancelled": 0,
+            "busy": 0,
+            "events": 0,
+            "shared_reads": 0,
+            "deferred": 0,
+        }
 
         # Initialize handlers
         self._handlers = {
@@ -67,8 +91,42 @@ class UltimateAbletonMCP(object):
             "browser": BrowserHandler(self._song, c_instance),
         }
 
-        # Action -> (handler_key, method_name) dispatch table
-        self._dispatch = self._build_dispatch_table()
+        # Live listeners registered for clients, flushed once per tick
+        self._subscriptions = SubscriptionManager(self._song, self.log)
+
+        # Actions implemented by the script itself rather than a handler
+        self._core_actions = {
+            "get_server_stats": self._get_server_stats,
+        }
+        # Core actions that also need the requesting client
+        self._client_actions = {
+            "batch": self._batch,
+            "subscribe": self._subscriptions.subscribe,
+            "unsubscribe": self._subscriptions.unsubscribe,
+            "get_snapshot": self._get_snapshot,
+        }
+        self._core_priorities = {
+            "get_server_stats": PRIORITY_READ,
+            "subscribe": PRIORITY_READ,
+            "unsubscribe": PRIORITY_READ,
+            "get_snapshot": PRIORITY_READ,
+        }
+
+        # Action -> method dispatch table, plus per-action queue metadata
+        self._dispatch, self._priorities, coalesce_keys = \
+            self._build_dispatch_table()
+        self._tick_hooks = [handler.on_tick for handler in self._handlers.values()
+                            if hasattr(handler, "on_tick")]
+
+        # Commands from every client, drained on the main thread by priority.
+        # Bounded so a runaway client gets BUSY instead of growing Live's memory.
+        # Handler reads depend only on their params, so identical ones queued
+        # in the same tick can share one execution.
+        self._command_queue = CommandQueue(
+            coalesce_keys,
+            int(self._env_float("ABLETON_MCP_MAX_QUEUE", DEFAULT_MAX_QUEUED)),
+            [action for action in self._dispatch
+             if self._priorities.get(action) == PRIORITY_READ])
 
         self._start_server()
         self.log("UltimateAbletonMCP initialized")
@@ -81,6 +139,13 @@ class UltimateAbletonMCP(object):
         except (ValueError, TypeError):
             return DEFAULT_PORT
 
+    @staticmethod
+    def _env_float(name, default):
+        try:
+            return float(os.environ.get(name, default))
+        except (ValueError, TypeError):
+            return default
+
     def log(self, msg):
         self._c_instance.log_message("[UltimateAbletonMCP] " + str(msg))
 
@@ -88,168 +153,286 @@ class UltimateAbletonMCP(object):
         self._c_instance.show_message(str(msg))
 
     def _build_dispatch_table(self):
-        """Build action -> (handler, method) mapping from all handlers."""
+        """Build action -> method, priority and coalesce-key maps from all handlers."""
         table = {}
+        priorities = dict(self._core_priorities)
+        coalesce_keys = {}
         for handler in self._handlers.values():
             for action, method in handler.get_actions().items():
                 table[action] = method
-        return table
+            priorities.update(handler.get_priorities())
+            if hasattr(handler, "get_coalesce_keys"):
+                coalesce_keys.update(handler.get_coalesce_keys())
+        return table, priorities, coalesce_keys
 
     # --- Server lifecycle ---
 
     def _start_server(self):
         try:
-            self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self._server_socket.bind((HOST, self._port))
-            self._server_socket.listen(5)
-            self._running = True
-
-            self._server_thread = threading.Thread(target=self._accept_loop)
-            self._server_thread.daemon = True
-            self._server_thread.start()
-
-            self.log("Server started on port %d" % self._port)
+            self._server = SelectorServer(HOST, self._port, self._on_client_line,
+                                          self.log,
+                                          self._subscriptions.client_closed)
+            self._server.start()
+            self.log("Server started on port %d" % self._server.port)
         except Exception as e:
+            if self._server:
+                self._server.stop()
+            self._server = None
             self.log("Error starting server: %s" % str(e))
             self._show_message("UltimateAbletonMCP: Server error - %s" % str(e))
 
     def disconnect(self):
         """Called by Ableton when script is removed or Live closes."""
         self.log("Disconnecting...")
-        self._running = False
-
-        if self._server_socket:
-            try:
-                self._server_socket.close()
-            except Exception:
-                pass
-
-        if self._server_thread and self._server_thread.is_alive():
-            self._server_thread.join(2.0)
-
+        if self._server:
+            self._server.stop()
+            self._server = None
+        self._subscriptions.clear()
+        for handler in self._handlers.values():
+            if hasattr(handler, "disconnect"):
+                handler.disconnect()
         self.log("Disconnected")
 
     # --- Main thread: drain command queue ---
 
     def update_display(self):
-        """Called by Live on every UI tick (~100ms). Drains the command queue."""
+        """Called by Live on every UI tick (~100ms). Drains the command queue.
+
+        Draining stops once the per-tick time budget is spent so a flood of
+        commands cannot stall Live's UI; whatever is left runs next tick.
+        At least one command runs per tick to guarantee progress. Deferred
+        commands are requeued and tick hooks run with what is left of the
+        budget. Pending subscription events are pushed after that, then the
+        responses.
+        """
+        start = time.perf_counter()
+        self._stats["ticks"] += 1
+        replies = []
+        deferred = []
         try:
-            while not self._command_queue.empty():
-                try:
-                    request_id, action, params = self._command_queue.get_nowait()
-                except queue.Empty:
+            self._stats["coalesced"] += self._command_queue.coalesce()
+            self._stats["shared_reads"] += self._command_queue.share_reads()
+            while True:
+                command = self._command_queue.pop()
+                if command is None:
                     break
 
-                response = self._execute(action, params)
-                response["id"] = request_id
+                if command.cancelled or command.expired(time.monotonic()):
+                    self._drop(command, replies)
+                    continue
 
-                with self._response_lock:
-                    rq = self._response_queues.get(request_id)
-                    if rq:
-                        rq.put(response)
+                try:
+                    response = self._execute(
+                        command.action, command.params, command.client)
+                except DeferCommand:
+                    # Counts against the budget like any other command
+                    deferred.append(command)
+                else:
+                    replies.append((command, response))
+                    self._stats["executed"] += 1
+
+                if (self._tick_budget > 0
+                        and time.perf_counter() - start >= self._tick_budget
+                        and not self._command_queue.empty()):
+                    self._stats["budget_exhausted"] += 1
+                    break
         except Exception as e:
             self.log("Error in update_display: %s" % str(e))
-
-    def _execute(self, action, params):
+        if deferred:
+            self._stats["deferred"] += len(deferred)
+            self._command_queue.requeue(deferred)
+        deadline = start + (self._tick_budget or DEFAULT_TICK_BUDGET_MS / 1000.0)
+        for hook in self._tick_hooks:
+            try:
+                hook(deadline)
+            except Exception as e:
+                self.log("Error in tick hook: %s" % str(e))
+        try:
+            self._stats["events"] += self._subscriptions.flush()
+        except Exception as e:
+            self.log("Error pushing events: %s" % str(e))
+        for command, response in replies:
+            try:
+                command.respond(response)
+            except Exception as e:
+                # One bad result must not cost the rest of the tick's replies
+                self.log("Error replying to %s: %s" % (command.action, str(e)))
+                try:
+                    command.respond({"ok": False, "code": "EXECUTION_ERROR",
+                                     "error": "Could not send result: %s" % str(e)})
+                except Exception:
+                    pass
+
+    def _drop(self, command, replies):
+        """Answer a cancelled or expired command without running it.
+
+        The commands it superseded may come from other clients and are
+        still wanted, so they are not failed with it: each one that is
+        itself cancelled or expired gets its own error, and the newest
+        live one goes back to the front of the queue to run in its place,
+        answering the older live ones as before.
+        """
+        now = time.monotonic()
+        live = []
+        for other in [command] + (command.superseded or []):
+            other.superseded = None
+            if other.cancelled:
+                self._stats["cancelled"] += 1
+                replies.append((other, {
+                    "ok": False, "code": "CANCELLED",
+                    "error": "Command was cancelled"}))
+            elif other.expired(now):
+                self._stats["expired"] += 1
+                replies.append((other, {
+                    "ok": False, "code": "EXPIRED",
+                    "error": "Command expired before Live could run it"}))
+            else:
+                live.append(other)
+        if live:
+            # superseded lists run oldest to newest
+            promoted = live.pop()
+            promoted.superseded = live or None
+            self._command_queue.requeue([promoted])
+
+    def _execute(self, action, params, client=None):
         """Dispatch action to the appropriate handler method."""
-        method = self._dispatch.get(action)
-        if method is None:
+        client_method = self._client_actions.get(action)
+        method = self._core_actions.get(action) or self._dispatch.get(action)
+        if method is None and client_method is None:
             return {"ok": False, "error": "Unknown action: %s" % action,
                     "code": "UNKNOWN_ACTION"}
         try:
-            result = method(params)
+            if client_method is not None:
+                result = client_method(client, params)
+            else:
+                result = method(params)
             return {"ok": True, "result": result}
+        except DeferCommand:
+            raise
         except Exception as e:
             self.log("Error executing %s: %s\n%s" % (
                 action, str(e), traceback.format_exc()))
             return {"ok": False, "error": str(e), "code": "EXECUTION_ERROR"}
 
-    # --- Socket threads ---
-
-    def _accept_loop(self):
-        self._server_socket.settimeout(1.0)
-        while self._running:
-            try:
-                client, addr = self._server_socket.accept()
-                self.log("Client connected from %s" % str(addr))
-                t = threading.Thread(target=self._handle_client, args=(client,))
-                t.daemon = True
-                t.start()
-                self._client_threads.append(t)
-                self._client_threads = [t for t in self._client_threads if t.is_alive()]
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self._running:
-                    self.log("Accept error: %s" % str(e))
-
-    def _handle_client(self, client):
-        buffer = ""
-        client.settimeout(None)
-        try:
-            while self._running:
-                data = client.recv(65536)
-                if not data:
-                    break
-
+    def _batch(self, client, params):
+        """Run a list of {action, params} entries back to back.
+
+        All entries execute inside the same update_display() drain, so N
+        commands cost one round trip and one tick. Each entry gets its own
+        ok/error response; a failing entry does not stop the others unless
+        stop_on_error is set.
+        """
+        commands = params.get("commands", [])
+        if not isinstance(commands, list):
+            raise ValueError("batch expects a list of commands")
+        stop_on_error = bool(params.get("stop_on_error", False))
+
+        results = []
+        errors = 0
+        for entry in commands:
+            if not isinstance(entry, dict):
+                response = {"ok": False, "error": "Batch entry must be an object",
+                            "code": "INVALID_BATCH"}
+            elif entry.get("action") == "batch":
+                response = {"ok": False, "error": "Nested batch is not allowed",
+                            "code": "INVALID_BATCH"}
+            else:
                 try:
-                    buffer += data.decode("utf-8")
-                except AttributeError:
-                    buffer += data
-
-                # Process all complete lines (newline-delimited JSON)
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        command = json.loads(line)
-                    except (ValueError, TypeError):
-                        self.log("Invalid JSON: %s" % line[:200])
-                        continue
-
-                    request_id = command.get("id", "unknown")
-                    action = command.get("action", "")
-                    params = command.get("params", {})
-
-                    # Create response queue for this request
-                    rq = queue.Queue()
-                    with self._response_lock:
-                        self._response_queues[request_id] = rq
-
-                    # Enqueue for main thread execution
-                    self._command_queue.put((request_id, action, params))
-
-                    # Wait for response (with timeout)
-                    try:
-                        response = rq.get(timeout=15.0)
-                    except queue.Empty:
-                        response = {
-                            "id": request_id,
-                            "ok": False,
-                            "error": "Timeout waiting for Ableton to process command",
-                            "code": "TIMEOUT",
-                        }
-
-                    # Cleanup
-                    with self._response_lock:
-                        self._response_queues.pop(request_id, None)
-
-                    # Send response as newline-delimited JSON
-                    resp_line = json.dumps(response) + "\n"
-                    try:
-                        client.sendall(resp_line.encode("utf-8"))
-                    except Exception:
-                        break
-
-        except Exception as e:
-            self.log("Client handler error: %s" % str(e))
-        finally:
-            try:
-                client.close()
-            except Exception:
-                pass
-            self.log("Client disconnected")
+                    response = self._execute(entry.get("action", ""),
+                                             entry.get("params") or {}, client)
+                except DeferCommand as e:
+                    # Earlier entries already ran, so the batch cannot requeue
+                    response = {"ok": False, "error": str(e),
+                                "code": "NOT_READY"}
+            results.append(response)
+            if not response["ok"]:
+                errors += 1
+                if stop_on_error:
+                    break
+        return {"results": results, "count": len(results), "errors": errors}
+
+    def _get_snapshot(self, client, params):
+        """Everything a client-side mirror of the set needs, read in one tick.
+
+        With subscribe set, the client is also subscribed to every topic on
+        every target so pushed events keep its mirror current. Events whose
+        tick is at least the snapshot's tick happened after it was read.
+        """
+        tracks = self._song.tracks
+        snapshot = {
+            "tick": self._subscriptions.tick,
+            "session": self._dispatch["get_session_state"]({}),
+            "tracks": self._dispatch["list_tracks"]({})["tracks"],
+            "scenes": self._dispatch["list_scenes"]({})["scenes"],
+            "mixer": [{"volume": float(t.mixer_device.volume.value),
+                       "panning": float(t.mixer_device.panning.value)}
+                      for t in tracks],
+            "devices": [[d.name for d in t.devices] for t in tracks],
+            "clip_slots": [[{"has_clip": slot.has_clip,
+                             "playing_status": slot.playing_status}
+                            for slot in t.clip_slots]
+                           for t in tracks],
+        }
+        if params.get("subscribe"):
+            snapshot["subscriptions"] = self._subscriptions.subscribe_all(client)
+        return snapshot
+
+    def _get_server_stats(self, params):
+        stats = dict(self._stats)
+        stats["queued"] = self._command_queue.qsize()
+        stats["queued_by_priority"] = self._command_queue.lane_sizes()
+        stats["max_queued"] = self._command_queue.max_size
+        stats["tick_budget_ms"] = self._tick_budget * 1000.0
+        stats["clients"] = self._server.client_count if self._server else 0
+        stats["subscriptions"] = len(self._subscriptions)
+        stats["browser_index"] = self._handlers["browser"].index_status()
+        return stats
+
+    # --- I/O thread ---
+
+    def _on_client_line(self, client, line):
+        """Enqueue one complete JSON line from a client for the main thread."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            command = json.loads(line)
+        except (ValueError, TypeError):
+            self.log("Invalid JSON: %s" % line[:200])
+            return
+
+        request_id = command.get("id", "unknown")
+        action = command.get("action", "")
+        params = command.get("params", {})
+
+        if action == "cancel":
+            # Answered right here: waiting for the main thread defeats the point
+            target = (params or {}).get("id")
+            cancelled = self._command_queue.cancel(client, target)
+            client.send_message({"id": request_id, "ok": True,
+                                 "result": {"id": target, "cancelled": cancelled}})
+            return
+
+        stream = bool(command.get("stream", False))
+        try:
+            timeout = float(command.get("timeout", DEFAULT_COMMAND_TIMEOUT))
+        except (ValueError, TypeError):
+            timeout = DEFAULT_COMMAND_TIMEOUT
+
+        queued = self._command_queue.put(Command(
+            request_id,
+            action,
+            params,
+            client.send_frames if stream else client.send_message,
+            self._priorities.get(action, PRIORITY_WRITE),
+            client=client,
+            deadline=time.monotonic() + timeout,
+            stream=stream,
+        ))
+        if not queued:
+            self._stats["busy"] += 1
+            client.send_message({
+                "id": request_id, "ok": False, "code": "BUSY",
+                "error": "Command queue full (%d queued)" % self._command_queue.max_size,
+                "retry_after": BUSY_RETRY_AFTER,
+            })
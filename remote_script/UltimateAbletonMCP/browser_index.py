@@ -0,0 +1,316 @@
+"""URI -> BrowserItem index of Live's content browser, built a tick at a time.
+
+Walking the browser touches one Python proxy per item, and a full library
+has tens of thousands of them, so the index is never built in one go.
+start() queues the category roots; each step() call then expands queued
+folders until its deadline passes, checking it every CHECK_EVERY children
+so one huge folder cannot overrun a tick (it resumes where it stopped,
+and each call expands at least one batch, so the walk makes progress). Until the walk is complete a lookup miss means "not yet known"
+rather than "does not exist"; callers defer and retry on a later tick.
+
+Every indexed item is also tokenized for search(): words of its name, and
+of its folder path and URI, go into an inverted index (exact and prefix
+matches), and trigrams of its name back a fuzzy fallback for typos.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import bisect
+import collections
+import hashlib
+import heapq
+import re
+import time
+
+CATEGORIES = ("instruments", "sounds", "drums", "audio_effects", "midi_effects")
+MAX_DEPTH = 10  # folder nesting below a category root, as the old walk used
+CHECK_EVERY = 16  # children expanded between deadline checks
+DEFAULT_SEARCH_LIMIT = 20
+
+# Per matched query word: in the item's name, as a name prefix, elsewhere
+_NAME_SCORE = 4.0
+_PREFIX_SCORE = 2.0
+_CONTEXT_SCORE = 1.0
+_MIN_TRIGRAM_SIMILARITY = 0.3
+
+_SPLIT = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def tokenize(text):
+    return [word for word in _SPLIT.split(text.lower()) if word]
+
+
+def trigrams(word):
+    padded = "  %s " % word
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class BrowserIndex(object):
+    """Lazily built map of browser URIs to items. Main thread only."""
+
+    def __init__(self, get_browser):
+        self._get_browser = get_browser
+        self._items = {}   # uri -> BrowserItem
+        self._paths = {}   # uri -> "category/Folder/Name"
+        self._loadable = set()  # uris read as loadable while walking
+        self._reset_search()
+        self._pending = collections.deque()  # (item, path, depth) to expand
+        self._current = None  # (children iterator, path, depth) part-expanded
+        self.started = False
+        self.complete = False
+        self.builds = 0
+        self.visited = 0
+        self.build_time = 0.0
+
+    def __len__(self):
+        return len(self._items)
+
+    def start(self):
+        """Queue a fresh walk of every category, dropping what was indexed.
+
+        Used on first need and by refresh_browser_index after Packs change.
+        """
+        browser = self._get_browser()
+        self._items = {}
+        self._paths = {}
+        self._loadable = set()
+        self._reset_search()
+        self._pending = collections.deque()
+        self._current = None
+        for name in CATEGORIES:
+            if hasattr(browser, name):
+                self._pending.append((getattr(browser, name), name, 0))
+        self.started = True
+        self.complete = not self._pending
+        self.builds += 1
+        self.visited = 0
+        self.build_time = 0.0
+
+    def ensure_started(self):
+        if not self.started:
+            self.start()
+
+    def step(self, deadline):
+        """Expand queued folders until time.perf_counter() passes deadline.
+
+        Returns the number of items added. A None deadline finishes the walk.
+        """
+        if not self.started or self.complete:
+            return 0
+        began = time.perf_counter()
+        added = 0
+        while self._current is not None or self._pending:
+            if self._current is None:
+                folder, path, depth = self._pending.popleft()
+                self._current = (iter(getattr(folder, "children", None) or ()),
+                                 path, depth)
+            children, path, depth = self._current
+            for count, child in enumerate(children, 1):
+                self.visited += 1
+                child_path = "%s/%s" % (path, getattr(child, "name", "?"))
+                uri = getattr(child, "uri", None)
+                if uri and uri not in self._items:
+                    self._items[uri] = child
+                    self._paths[uri] = child_path
+                    if getattr(child, "is_loadable", False):
+                        self._loadable.add(uri)
+                    self._index_words(uri, child_path)
+                    added += 1
+                if depth + 1 < MAX_DEPTH and getattr(child, "children", None):
+                    self._pending.append((child, child_path, depth + 1))
+                if count % CHECK_EVERY == 0 and deadline is not None \
+                        and time.perf_counter() >= deadline:
+                    break
+            else:
+                self._current = None
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.complete = self._current is None and not self._pending
+        self.build_time += time.perf_counter() - began
+        return added
+
+    def get(self, uri):
+        """The indexed item for uri, or None if unknown so far."""
+        return self._items.get(uri)
+
+    def discard(self, uri):
+        """Forget an entry whose proxy no longer matches its URI."""
+        self._items.pop(uri, None)
+        self._loadable.discard(uri)
+        path = self._paths.pop(uri, None)
+        if path is not None:
+            self._unindex_words(uri, path)
+
+    def path(self, uri):
+        return self._paths.get(uri)
+
+    def entries(self):
+        """[uri, path, is_loadable] for every indexed item, in walk order.
+
+        Built from what the walk recorded, without touching a single proxy.
+        """
+        return [[uri, self._paths[uri], uri in self._loadable]
+                for uri in self._items]
+
+    def fingerprint(self):
+        """Cheap digest of the category roots and their direct children.
+
+        Installing or removing a Pack changes it, without walking the
+        library; deeper changes are left to a full entries() comparison.
+        """
+        browser = self._get_browser()
+        digest = hashlib.sha1()
+        for name in CATEGORIES:
+            root = getattr(browser, name, None)
+            digest.update(("[%s]" % name).encode("utf-8"))
+            for child in getattr(root, "children", None) or ():
+                digest.update(("%s\n%s\n" % (getattr(child, "name", ""),
+                                              getattr(child, "uri", ""))).encode("utf-8"))
+        return digest.hexdigest()
+
+    def search(self, query, category=None, limit=DEFAULT_SEARCH_LIMIT):
+        """Rank indexed items against the words of query.
+
+        Every query word must match the item, as a whole word or a word
+        prefix of its name, path or URI; matches in the name score higher,
+        and an exact or leading name match higher still. Words with no such
+        match fall back to trigram similarity with name words. Returns
+        [(score, uri)], best first.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        scores = None
+        for word in words:
+            matched = self._match_word(word)
+            if scores is None:
+                scores = matched
+            else:
+                scores = dict((uri, scores[uri] + score)
+                              for uri, score in matched.items() if uri in scores)
+            if not scores:
+                return []
+        phrase = " ".join(words)
+        ranked = []
+        for uri, score in scores.items():
+            if category and self._category(uri) != category:
+                continue
+            name = " ".join(self._name_words[uri])
+            if name == phrase:
+                score += _NAME_SCORE * 2
+            elif name.startswith(phrase):
+                score += _NAME_SCORE
+            if uri in self._loadable:
+                score += 0.5
+            # Shallower items first on ties: "Operator" before its presets
+            ranked.append((-score, self._paths[uri].count("/"), uri))
+        best = heapq.nsmallest(max(1, int(limit)), ranked)
+        return [(-neg, uri) for neg, _, uri in best]
+
+    def describe(self, uri, score=None):
+        item = self._items[uri]
+        info = {
+            "name": getattr(item, "name", "Unknown"),
+            "uri": uri,
+            "path": self._paths[uri],
+            "category": self._category(uri),
+            "is_loadable": uri in self._loadable,
+        }
+        if score is not None:
+            info["score"] = round(score, 3)
+        return info
+
+    def status(self):
+        return {
+            "started": self.started,
+            "complete": self.complete,
+            "items": len(self._items),
+            "pending_folders": len(self._pending) + (self._current is not None),
+            "visited": self.visited,
+            "builds": self.builds,
+            "build_ms": round(self.build_time * 1000.0, 3),
+            "words": len(self._words),
+        }
+
+    # --- search structures ---
+
+    def _reset_search(self):
+        self._words = {}       # word -> {uri: score}
+        self._grams = {}       # trigram -> set(name word)
+        self._name_words = {}  # uri -> [words of the item name]
+        self._sorted = None    # sorted words for prefix lookup, rebuilt lazily
+
+    def _category(self, uri):
+        return self._paths[uri].split("/", 1)[0]
+
+    def _item_words(self, uri, path):
+        """Name words, and {word: score} over name, path and URI words."""
+        parts = path.split("/")
+        name_words = tokenize(parts[-1])
+        found = {}
+        for word in tokenize(" ".join(parts[:-1])) + tokenize(uri):
+            found[word] = _CONTEXT_SCORE
+        for word in name_words:
+            found[word] = _NAME_SCORE
+        return name_words, found
+
+    def _index_words(self, uri, path):
+        name_words, found = self._item_words(uri, path)
+        self._name_words[uri] = name_words
+        for word, score in found.items():
+            uris = self._words.get(word)
+            if uris is None:
+                uris = self._words[word] = {}
+                self._sorted = None
+            uris[uri] = score
+        for word in name_words:
+            for gram in trigrams(word):
+                self._grams.setdefault(gram, set()).add(word)
+
+    def _unindex_words(self, uri, path):
+        self._name_words.pop(uri, None)
+        for word in self._item_words(uri, path)[1]:
+            uris = self._words.get(word)
+            if uris is not None:
+                uris.pop(uri, None)
+                if not uris:
+                    del self._words[word]
+                    self._sorted = None
+
+    def _match_word(self, word):
+        """{uri: score} for one query word."""
+        matched = dict(self._words.get(word, {}))
+        if self._sorted is None:
+            self._sorted = sorted(self._words)
+        start = bisect.bisect_left(self._sorted, word)
+        for other in self._sorted[start:]:
+            if not other.startswith(word):
+                break
+            if other == word:
+                continue
+            for uri, score in self._words[other].items():
+                partial = score * _PREFIX_SCORE / _NAME_SCORE
+                if partial > matched.get(uri, 0.0):
+                    matched[uri] = partial
+        if matched or len(word) < 3:
+            return matched
+        return self._fuzzy(word)
+
+    def _fuzzy(self, word):
+        """Name words sharing enough trigrams with word (a likely typo)."""
+        grams = trigrams(word)
+        shared = collections.Counter()
+        for gram in grams:
+            for other in self._grams.get(gram, ()):
+                shared[other] += 1
+        matched = {}
+        for other, common in shared.items():
+            similarity = float(common) / len(grams | trigrams(other))
+            if similarity < _MIN_TRIGRAM_SIMILARITY:
+                continue
+            for uri, score in self._words.get(other, {}).items():
+                if score == _NAME_SCORE:
+                    value = _CONTEXT_SCORE * similarity
+                    if value > matched.get(uri, 0.0):
+                        matched[uri] = value
+        return matched
@@ -0,0 +1,284 @@
+"""Queued command representation shared by the socket and main threads."""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import json
+import threading
+import time
+
+from .handlers import PRIORITY_TRANSPORT, PRIORITY_WRITE, PRIORITY_READ
+
+STREAM_CHUNK_ITEMS = 256
+
+
+def stream_frames(response, chunk_items=STREAM_CHUNK_ITEMS):
+    """Yield the frames of a chunked reply to response.
+
+    Every non-empty list of the result goes out in slices of chunk_items
+    as {"frame", "key", "items"} frames, nested ones included: key is the
+    field name for a top-level list and the path to it otherwise, such as
+    ["categories", 2, "children"]. A dict inside a sliced list is sent
+    without its non-empty lists, whose frames follow. The final frame
+    carries the remaining fields with done=True. Errors are a single final
+    frame. Frames carry no id; the caller tags them.
+
+    A generator, so frames are only built as the reply is written out.
+    """
+    result = response.get("result")
+    if not response.get("ok") or not isinstance(result, dict):
+        final = dict(response)
+        final["done"] = True
+        yield final
+        return
+
+    nested = []
+    summary = _shell(result, [], nested)
+    stack = nested[::-1]
+    frames = 0
+    while stack:
+        path, value = stack.pop()
+        key = path[0] if len(path) == 1 else path
+        nested = []
+        for start in range(0, len(value), chunk_items):
+            items = [_shell(item, path + [start + i], nested)
+                     for i, item in enumerate(value[start:start + chunk_items])]
+            yield {"ok": True, "frame": frames, "key": key, "items": items}
+            frames += 1
+        stack.extend(reversed(nested))
+    yield {"ok": True, "done": True, "frames": frames, "result": summary}
+
+
+def _shell(value, path, nested):
+    """value without its non-empty lists, which go to nested as (path, list)."""
+    if not isinstance(value, dict):
+        return value
+    shell = {}
+    for key, field in value.items():
+        if isinstance(field, list) and field:
+            nested.append((path + [key], field))
+        else:
+            shell[key] = field
+    return shell
+
+
+class Command(object):
+    """One client request waiting for the Live main thread.
+
+    reply is a callable taking the finished response dict; it hands the
+    response back to whichever client connection sent the request. For a
+    stream command it takes an iterator of frames instead, built lazily.
+    """
+
+    __slots__ = ("id", "action", "params", "reply", "priority", "superseded",
+                 "client", "deadline", "cancelled", "stream")
+
+    def __init__(self, request_id, action, params, reply, priority=PRIORITY_WRITE,
+                 client=None, deadline=None, stream=False):
+        self.id = request_id
+        self.action = action
+        self.params = params
+        self.reply = reply
+        self.priority = priority
+        self.superseded = None  # earlier commands this one replaced
+        self.client = client  # owner, scopes cancellation by request id
+        self.deadline = deadline  # time.monotonic() after which it is stale
+        self.cancelled = False
+        self.stream = stream  # reply as chunked frames instead of one line
+
+    def expired(self, now):
+        return self.deadline is not None and now > self.deadline
+
+    def respond(self, response):
+        """Reply to this command and to every command it superseded."""
+        self._send(response)
+        for other in self.superseded or ():
+            shared = dict(response)
+            shared["coalesced"] = True
+            other._send(shared)
+
+    def _send(self, response):
+        if self.stream:
+            self.reply(self._frames(response))
+        else:
+            response["id"] = self.id
+            self.reply(response)
+
+    def _frames(self, response):
+        for frame in stream_frames(response):
+            frame["id"] = self.id
+            yield frame
+
+
+class CommandQueue(object):
+    """Thread-safe work queue with one FIFO lane per priority class.
+
+    pop() always serves the most urgent non-empty lane, so a transport or
+    launch command queued behind hundreds of parameter writes still runs
+    first on the next pop.
+
+    Lanes do reorder one client's pipeline, so put() keeps the order that
+    matters most: a transport command waits in the write lane, behind them,
+    while its client still has a structural write queued (any write
+    without coalesce keys, such as create_scene before fire_scene). What
+    stays reordered: transport still overtakes its client's earlier
+    parameter-style writes, and writes overtake that client's earlier
+    reads, which then see the written state. Clients that need strict
+    order for those should await each reply, or send a batch.
+    """
+
+    LANES = (PRIORITY_TRANSPORT, PRIORITY_WRITE, PRIORITY_READ)
+
+    def __init__(self, coalesce_keys=None, max_size=0, shared_reads=None):
+        self._lanes = [collections.deque() for _ in self.LANES]
+        self._lock = threading.Lock()
+        self._size = 0
+        self.max_size = max_size  # 0 means unbounded
+        # action -> param names identifying the target it writes
+        self._coalesce_keys = coalesce_keys or {}
+        # reads whose result depends only on action and params
+        self._shared_reads = frozenset(shared_reads or ())
+
+    def put(self, command):
+        """Enqueue a command. Returns False, without queueing, when full."""
+        with self._lock:
+            if self.max_size and self._size >= self.max_size:
+                return False
+            if command.priority < PRIORITY_WRITE and self._behind_barrier(command):
+                command.priority = PRIORITY_WRITE
+            self._lanes[command.priority].append(command)
+            self._size += 1
+        return True
+
+    def _behind_barrier(self, command):
+        """Whether the command's client has a structural write queued."""
+        if command.client is None:
+            return False
+        return any(queued.client is command.client and not queued.cancelled
+                   and queued.action not in self._coalesce_keys
+                   for queued in self._lanes[PRIORITY_WRITE])
+
+    def pop(self):
+        """Remove and return the next command, or None if all lanes are empty."""
+        with self._lock:
+            for lane in self._lanes:
+                if lane:
+                    self._size -= 1
+                    return lane.popleft()
+        return None
+
+    def requeue(self, commands):
+        """Put deferred commands back at the front of their lanes, in order.
+
+        They were already admitted, so the size bound does not apply.
+        """
+        with self._lock:
+            for command in reversed(commands):
+                self._lanes[command.priority].appendleft(command)
+                self._size += 1
+
+    def coalesce(self):
+        """Collapse queued writes to the same target, last writer wins.
+
+        Only the final write to each target stays in the queue; the ones it
+        replaced are attached to it and answered with its response. Any
+        write that is not coalescable (create/delete/...) is a barrier, so
+        writes are never merged across a change that could retarget them.
+        Returns the number of commands removed.
+        """
+        with self._lock:
+            lane = self._lanes[PRIORITY_WRITE]
+            if len(lane) < 2:
+                return 0
+            survivors = []
+            latest = {}  # target key -> index into survivors
+            removed = 0
+            for command in lane:
+                if command.cancelled:
+                    survivors.append(command)
+                    continue
+                keys = self._coalesce_keys.get(command.action)
+                if keys is None:
+                    latest = {}
+                    survivors.append(command)
+                    continue
+                params = command.params or {}
+                target = (command.action,) + tuple(
+                    str(params.get(k)) for k in keys)
+                previous = latest.get(target)
+                if previous is not None:
+                    replaced = survivors[previous]
+                    survivors[previous] = None
+                    command.superseded = ((replaced.superseded or []) + [replaced]
+                                          + (command.superseded or []))
+                    replaced.superseded = None
+                    removed += 1
+                latest[target] = len(survivors)
+                survivors.append(command)
+            if removed:
+                self._lanes[PRIORITY_WRITE] = collections.deque(
+                    c for c in survivors if c is not None)
+                self._size -= removed
+            return removed
+
+    def share_reads(self):
+        """Collapse identical queued reads so each runs once per drain.
+
+        Reads with the same action and params, from any client, are merged
+        into the first one; the rest are attached to it and get a copy of
+        its response. Cancelled and expired reads are left alone, so one
+        client's stale read never decides the answer another client gets
+        (a leader that goes stale after merging hands over to a live
+        follower, see UltimateAbletonMCP._drop). Returns the number of
+        commands removed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            lane = self._lanes[PRIORITY_READ]
+            if len(lane) < 2:
+                return 0
+            survivors = []
+            first = {}  # (action, params) -> surviving command
+            for command in lane:
+                if (command.cancelled or command.expired(now)
+                        or command.action not in self._shared_reads):
+                    survivors.append(command)
+                    continue
+                key = (command.action,
+                       json.dumps(command.params or {}, sort_keys=True))
+                leader = first.get(key)
+                if leader is None:
+                    first[key] = command
+                    survivors.append(command)
+                else:
+                    leader.superseded = (leader.superseded or []) + [command]
+            removed = len(lane) - len(survivors)
+            if removed:
+                self._lanes[PRIORITY_READ] = collections.deque(survivors)
+                self._size -= removed
+            return removed
+
+    def cancel(self, client, request_id):
+        """Mark a queued command from this client as cancelled.
+
+        The drain drops it instead of running it. Returns True if a queued
+        command was found.
+        """
+        with self._lock:
+            for lane in self._lanes:
+                for command in lane:
+                    if command.id == request_id and command.client is client:
+                        command.cancelled = True
+                        return True
+        return False
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def qsize(self):
+        with self._lock:
+            return self._size
+
+    def lane_sizes(self):
+        with self._lock:
+            return [len(lane) for lane in self._lanes]
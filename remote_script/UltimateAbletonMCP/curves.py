@@ -0,0 +1,41 @@
+"""Point decimation for automation curves written in one call.
+
+A smooth sweep sent as hundreds of samples mostly lies on straight lines,
+and Live interpolates linearly between envelope points, so only the
+corners need writing. simplify() is Ramer-Douglas-Peucker with the
+error measured vertically (in value units, at each sample's time) rather
+than perpendicular to the segment, since time and value have unrelated
+scales. It runs on an explicit stack, so long curves cannot hit the
+recursion limit.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+
+def simplify(times, values, tolerance):
+    """Indices of the points to keep so no dropped point is off by more
+    than tolerance from the line through its kept neighbours.
+
+    times must be non-decreasing. The first and last points are always kept.
+    """
+    count = len(times)
+    if count < 3:
+        return list(range(count))
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        t0, v0 = times[first], values[first]
+        span = times[last] - t0
+        slope = (values[last] - v0) / span if span > 0 else 0.0
+        worst, split = tolerance, None
+        for i in range(first + 1, last):
+            error = abs(values[i] - (v0 + slope * (times[i] - t0)))
+            if error > worst:
+                worst, split = error, i
+        if split is not None:
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return [i for i in range(count) if keep[i]]
@@ -1 +1,23 @@
-"""Handler modules for UltimateAbletonMCP Remote Script."""
+"""Handler modules for UltimateAbletonMCP Remote Script.
+
+Each handler exposes get_actions() (action -> method) and
+get_priorities() (action -> priority class for the main-thread queue).
+Actions missing from get_priorities() run as PRIORITY_WRITE. Handlers
+with idempotent setters may also expose get_coalesce_keys() (action ->
+param names identifying the written target) so queued writes to the
+same target collapse to the last one. Handlers with background work may
+expose on_tick(deadline), called once per tick after the queue drain with
+the time.perf_counter() value to finish by, and handlers holding Live
+listeners may expose disconnect() to remove them when the script unloads.
+"""
+
+# Main-thread queue priority classes, most urgent first
+PRIORITY_TRANSPORT = 0  # transport and clip/scene launches: timing-critical
+PRIORITY_WRITE = 1      # mutations of the set
+PRIORITY_READ = 2       # reads and bulk queries
+
+
+class DeferCommand(Exception):
+    """Raised by an action that cannot answer yet (e.g. an index still being
+    built): the command goes back to the front of its lane and is retried
+    next tick, until its deadline expires."""
@@ -1,11 +1,29 @@
 """Browser handler — content browser and groove pool."""
 
+import collections
+import time
+
+from . import DeferCommand, PRIORITY_READ
+from ..browser_index import BrowserIndex, CATEGORIES, DEFAULT_SEARCH_LIMIT
+
+# Walk time a load may spend on the index itself before deferring
+LOAD_STEP_SECONDS = 0.004
+DEFAULT_PAGE_SIZE = 100   # get_browser_items children per page
+DEFAULT_TREE_LIMIT = 50   # get_browser_tree children per folder
+MAX_PAGE_SIZE = 1000
+NODE_CACHE_SIZE = 512     # folders remembered by path and by uri
+
 
 class BrowserHandler(object):
 
     def __init__(self, song, c_instance):
         self._song = song
         self._c = c_instance
+        self._index = BrowserIndex(self._get_browser)
+        self._nodes = collections.OrderedDict()   # lowercased path -> folder
+        self._by_uri = collections.OrderedDict()  # uri -> folder
+        self._stepped = False  # a command already walked the index this tick
+        self.node_hits = 0
 
     def get_actions(self):
         return {
@@ -13,8 +31,30 @@ class BrowserHandler(object):
             "get_browser_items": self._get_items,
             "load_browser_item": self._load_item,
             "get_grooves": self._get_grooves,
+            "refresh_browser_index": self._refresh_index,
+            "search_browser": self._search,
+            "get_browser_fingerprint": self._get_fingerprint,
+            "get_browser_index": self._get_index,
         }
 
+    def get_priorities(self):
+        return {
+            "get_browser_tree": PRIORITY_READ,
+            "get_browser_items": PRIORITY_READ,
+            "get_grooves": PRIORITY_READ,
+            "search_browser": PRIORITY_READ,
+            "get_browser_fingerprint": PRIORITY_READ,
+            "get_browser_index": PRIORITY_READ,
+        }
+
+    def on_tick(self, deadline):
+        """Advance an unfinished index walk within this tick's budget."""
+        self._stepped = False
+        return self._index.step(deadline)
+
+    def index_status(self):
+        return self._index.status()
+
     def _get_browser(self):
         app = self._c.application()
         if not app or not hasattr(app, "browser"):
@@ -22,100 +62,182 @@ class BrowserHandler(object):
         return app.browser
 
     def _get_tree(self, params):
+        """Categories with their folders expanded to depth levels.
+
+        Every folder lists at most limit children, plus "total" when it
+        has more; top-level children page with offset/cursor when a single
+        category is requested.
+        """
         browser = self._get_browser()
         category = params.get("category", "all")
+        depth = int(params.get("depth", 2))
+        limit = self._limit(params, DEFAULT_TREE_LIMIT)
+        offset = int(params.get("offset") or 0)
+        cursor = params.get("cursor")
+        if cursor:
+            offset, kind, category = self._parse_cursor(cursor)
+            if kind != "tree":
+                raise ValueError("Cursor is not from get_browser_tree")
 
-        category_map = {
-            "instruments": "instruments",
-            "sounds": "sounds",
-            "drums": "drums",
-            "audio_effects": "audio_effects",
-            "midi_effects": "midi_effects",
-        }
-
-        categories = []
         if category == "all":
-            targets = list(category_map.keys())
+            targets = list(CATEGORIES)
+            offset = 0
         else:
-            targets = [category] if category in category_map else []
+            targets = [category] if category in CATEGORIES else []
 
+        categories = []
+        result = {"categories": categories}
         for cat_name in targets:
-            attr = category_map.get(cat_name)
-            if attr and hasattr(browser, attr):
-                root = getattr(browser, attr)
-                children = self._get_children(root, max_depth=2)
-                categories.append({
-                    "name": cat_name,
-                    "children": children,
-                })
+            if hasattr(browser, cat_name):
+                root = getattr(browser, cat_name)
+                children, total = self._get_children(
+                    root, cat_name, 0, depth, limit, offset)
+                entry = {"name": cat_name, "children": children}
+                if total > offset + len(children) or offset:
+                    entry["total"] = total
+                    entry["offset"] = offset
+                categories.append(entry)
+                if len(targets) == 1 and total > offset + len(children):
+                    result["next_cursor"] = self._cursor(
+                        offset + len(children), "tree", cat_name)
+        return result
 
-        return {"categories": categories}
-
-    def _get_children(self, item, depth=0, max_depth=2):
-        children = []
-        if not hasattr(item, "children") or depth >= max_depth:
-            return children
-        for child in item.children:
-            info = {
-                "name": child.name if hasattr(child, "name") else "Unknown",
-                "uri": child.uri if hasattr(child, "uri") else None,
-                "is_folder": getattr(child, "is_folder", hasattr(child, "children") and bool(child.children)),
-                "is_loadable": hasattr(child, "is_loadable") and child.is_loadable,
-            }
-            if info["is_folder"] and depth + 1 < max_depth:
-                info["children"] = self._get_children(child, depth + 1, max_depth)
-            children.append(info)
-        return children
+    def _get_children(self, item, path, depth, max_depth, limit, offset=0):
+        """(child infos, child count) of one folder, recursing into folders."""
+        if depth >= max_depth:
+            return [], 0
+        children = list(getattr(item, "children", None) or ())
+        infos = []
+        for child in children[offset:offset + limit]:
+            info = self._describe(child)
+            if info["is_folder"]:
+                child_path = "%s/%s" % (path, info["name"])
+                self._remember(child_path, child)
+                if depth + 1 < max_depth:
+                    info["children"], total = self._get_children(
+                        child, child_path, depth + 1, max_depth, limit)
+                    if total > limit:
+                        info["total"] = total
+            infos.append(info)
+        return infos, len(children)
 
     def _get_items(self, params):
-        browser = self._get_browser()
-        path = params.get("path", "")
-        parts = path.split("/")
-        if not parts:
-            raise ValueError("Empty path")
+        """One page of a folder's children, addressed by path, uri or cursor."""
+        offset = int(params.get("offset") or 0)
+        limit = self._limit(params, DEFAULT_PAGE_SIZE)
+        cursor = params.get("cursor")
+        kind, key = ("uri", params["uri"]) if params.get("uri") else \
+            ("path", params.get("path", ""))
+        if cursor:
+            offset, kind, key = self._parse_cursor(cursor)
+            if kind not in ("path", "uri"):
+                raise ValueError("Cursor is not from get_browser_items")
 
-        # Navigate to root category
-        root_name = parts[0].lower()
-        category_map = {
-            "instruments": "instruments",
-            "sounds": "sounds",
-            "drums": "drums",
-            "audio_effects": "audio_effects",
-            "midi_effects": "midi_effects",
+        if kind == "uri":
+            current = self._node_by_uri(key)
+        else:
+            key = "/".join(part for part in key.split("/") if part)
+            current = self._node_by_path(key)
+            if isinstance(current, dict):
+                return current  # error result, as returned before paging
+
+        children = list(getattr(current, "children", None) or ())
+        items = []
+        for child in children[offset:offset + limit]:
+            info = self._describe(child)
+            if info["is_folder"]:
+                self._remember("%s/%s" % (key, info["name"]) if kind == "path"
+                               else None, child)
+            items.append(info)
+        result = {kind: key, "items": items, "count": len(items),
+                  "total": len(children), "offset": offset}
+        if offset + len(items) < len(children):
+            result["next_cursor"] = self._cursor(offset + len(items), kind, key)
+        return result
+
+    @staticmethod
+    def _describe(child):
+        return {
+            "name": child.name if hasattr(child, "name") else "Unknown",
+            "uri": child.uri if hasattr(child, "uri") else None,
+            "is_folder": getattr(child, "is_folder", hasattr(child, "children") and bool(child.children)),
+            "is_loadable": hasattr(child, "is_loadable") and child.is_loadable,
         }
-        attr = category_map.get(root_name)
-        if not attr or not hasattr(browser, attr):
-            return {"error": "Unknown category: %s" % root_name,
-                    "available": list(category_map.keys())}
 
-        current = getattr(browser, attr)
+    @staticmethod
+    def _limit(params, default):
+        limit = int(params.get("limit") or default)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        return min(limit, MAX_PAGE_SIZE)
+
+    @staticmethod
+    def _cursor(offset, kind, key):
+        return "%d|%s|%s" % (offset, kind, key)
+
+    @staticmethod
+    def _parse_cursor(cursor):
+        try:
+            offset, kind, key = cursor.split("|", 2)
+            return int(offset), kind, key
+        except (ValueError, AttributeError):
+            raise ValueError("Invalid cursor: %s" % cursor)
 
-        # Navigate through remaining path parts
+    def _remember(self, path, node):
+        """Cache a folder by lowercased path and by uri, evicting the oldest."""
+        for cache, key in ((self._nodes, path and path.lower()),
+                           (self._by_uri, getattr(node, "uri", None))):
+            if key:
+                cache.pop(key, None)
+                cache[key] = node
+                while len(cache) > NODE_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+    def _node_by_path(self, path):
+        """Folder at "category/Folder/..."; an error dict if there is none.
+
+        Starts from the deepest cached prefix instead of the category root.
+        """
+        browser = self._get_browser()
+        parts = [part for part in path.split("/") if part] or [""]
+        root_name = parts[0].lower()
+        if root_name not in CATEGORIES or not hasattr(browser, root_name):
+            return {"error": "Unknown category: %s" % root_name,
+                    "available": list(CATEGORIES)}
+
+        keys = [root_name]
         for part in parts[1:]:
-            if not part:
-                continue
+            keys.append("%s/%s" % (keys[-1], part.lower()))
+        known = len(parts) - 1
+        while known > 0 and keys[known] not in self._nodes:
+            known -= 1
+        current = self._nodes[keys[known]] if known else getattr(browser, root_name)
+        if known:
+            self.node_hits += 1
+
+        for i in range(known + 1, len(parts)):
+            part = parts[i]
             if not hasattr(current, "children"):
                 return {"error": "No children at path part: %s" % part}
-            found = False
             for child in current.children:
                 if hasattr(child, "name") and child.name.lower() == part.lower():
                     current = child
-                    found = True
                     break
-            if not found:
+            else:
                 return {"error": "Path part '%s' not found" % part}
+            self._remember(keys[i], current)
+        return current
 
-        # Return items at current path
-        items = []
-        if hasattr(current, "children"):
-            for child in current.children:
-                items.append({
-                    "name": child.name if hasattr(child, "name") else "Unknown",
-                    "uri": child.uri if hasattr(child, "uri") else None,
-                    "is_folder": getattr(child, "is_folder", hasattr(child, "children") and bool(child.children)),
-                    "is_loadable": hasattr(child, "is_loadable") and child.is_loadable,
-                })
-        return {"path": path, "items": items, "count": len(items)}
+    def _node_by_uri(self, uri):
+        """A folder seen in an earlier listing, or found through the index."""
+        node = self._by_uri.get(uri)
+        if node is None:
+            node = self._index.get(uri)
+        if node is None:
+            node = self._walk_index().get(uri)
+        if node is None:
+            raise ValueError("Browser item not found: %s" % uri)
+        return node
 
     def _load_item(self, params):
         browser = self._get_browser()
@@ -131,10 +253,7 @@ class BrowserHandler(object):
 
         track = tracks[ti]
 
-        # Find the browser item by URI
-        item = self._find_by_uri(browser, uri)
-        if not item:
-            raise ValueError("Browser item not found: %s" % uri)
+        item = self._find_by_uri(uri)
 
         # Select track and load
         self._song.view.selected_track = track
@@ -142,30 +261,109 @@ class BrowserHandler(object):
 
         return {"loaded": True, "item_name": item.name, "track_index": ti}
 
-    def _find_by_uri(self, browser, uri, max_depth=10):
-        """Recursively find a browser item by URI."""
-        categories = []
-        for attr in ("instruments", "sounds", "drums", "audio_effects", "midi_effects"):
-            if hasattr(browser, attr):
-                categories.append(getattr(browser, attr))
+    def _search(self, params):
+        """Ranked search of browser item names, folder paths and URIs.
 
-        for cat in categories:
-            result = self._search_item(cat, uri, 0, max_depth)
-            if result:
-                return result
-        return None
+        Waits (deferred) for the index walk to finish unless partial is set,
+        in which case only what is indexed so far is searched.
+        """
+        query = params.get("query", "")
+        if not query or not query.strip():
+            raise ValueError("query required")
+        category = params.get("category") or "all"
+        if category != "all" and category not in CATEGORIES:
+            raise ValueError("Unknown category '%s'. Available: all, %s"
+                             % (category, ", ".join(CATEGORIES)))
+        limit = int(params.get("limit", DEFAULT_SEARCH_LIMIT))
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
 
-    def _search_item(self, item, uri, depth, max_depth):
-        if depth >= max_depth:
-            return None
-        if hasattr(item, "uri") and item.uri == uri:
-            return item
-        if hasattr(item, "children"):
-            for child in item.children:
-                result = self._search_item(child, uri, depth + 1, max_depth)
-                if result:
-                    return result
-        return None
+        index = self._walk_index(wait=not params.get("partial"))
+        hits = index.search(query, None if category == "all" else category, limit)
+        results = [index.describe(uri, score) for score, uri in hits]
+        return {"query": query, "results": results, "count": len(results),
+                "complete": index.complete}
+
+    def _walk_index(self, wait=True):
+        """The index, after a short walk; DeferCommand if wait and unfinished."""
+        index = self._step_once()
+        if wait and not index.complete:
+            raise DeferCommand("Browser index still building, %d items so far"
+                               % len(index))
+        return index
+
+    def _live_version(self):
+        app = self._c.application()
+        try:
+            return "%d.%d.%d" % (app.get_major_version(), app.get_minor_version(),
+                                 app.get_bugfix_version())
+        except Exception:
+            return "unknown"
+
+    def _get_fingerprint(self, params):
+        """Live version and browser digest, for validating a client's copy."""
+        return {"live_version": self._live_version(),
+                "fingerprint": self._index.fingerprint()}
+
+    def _get_index(self, params):
+        """Every indexed item as [uri, path, is_loadable], once complete.
+
+        Meant to be requested with "stream": true; deferred while the
+        index walk is unfinished.
+        """
+        index = self._walk_index()
+        items = index.entries()
+        return {"live_version": self._live_version(),
+                "fingerprint": index.fingerprint(),
+                "items": items, "count": len(items)}
+
+    def _step_once(self):
+        """Walk the index for LOAD_STEP_SECONDS, at most once per tick.
+
+        Every command waiting on the walk would otherwise spend its own
+        step, so a queue of them could overrun the tick budget; the rest
+        just defer and on_tick carries the walk on.
+        """
+        index = self._index
+        index.ensure_started()
+        if not index.complete and not self._stepped:
+            self._stepped = True
+            index.step(time.perf_counter() + LOAD_STEP_SECONDS)
+        return index
+
+    def _find_by_uri(self, uri):
+        """Look a URI up in the index, walking a little more of it on a miss.
+
+        Raises DeferCommand while the walk is unfinished, so the load is
+        retried next tick instead of stalling this one.
+        """
+        index = self._index
+        index.ensure_started()
+        item = index.get(uri)
+        if item is None and not index.complete:
+            self._step_once()
+            item = index.get(uri)
+        if item is not None:
+            try:
+                if item.uri == uri:
+                    return item
+            except Exception:
+                pass
+            index.discard(uri)  # proxy went stale, e.g. its Pack was removed
+            raise ValueError("Browser item no longer available: %s "
+                             "(run refresh_browser_index)" % uri)
+        if not index.complete:
+            raise DeferCommand("Browser index still building, %d items so far"
+                               % len(index))
+        raise ValueError("Browser item not found: %s" % uri)
+
+    def _refresh_index(self, params):
+        """Drop the URI index and rebuild it over the next ticks."""
+        self._nodes.clear()
+        self._by_uri.clear()
+        self._index.start()
+        self._stepped = False
+        return self._index.status()
 
     def _get_grooves(self, params):
         pool = self._song.groove_pool
@@ -1,5 +1,7 @@
 """Clip handler — session/arrangement clips and MIDI notes."""
 
+from . import PRIORITY_READ, PRIORITY_TRANSPORT
+
 
 class ClipHandler(object):
 
@@ -27,6 +29,16 @@ class ClipHandler(object):
             "stop_all_clips": self._stop_all,
         }
 
+    def get_priorities(self):
+        return {
+            "fire_clip": PRIORITY_TRANSPORT,
+            "stop_clip": PRIORITY_TRANSPORT,
+            "stop_all_clips": PRIORITY_TRANSPORT,
+            "get_clip": PRIORITY_READ,
+            "get_clip_notes": PRIORITY_READ,
+            "get_arrangement_clips": PRIORITY_READ,
+        }
+
     def _get_slot(self, params):
         ti = int(params.get("track_index", 0))
         si = int(params.get("scene_index", 0))
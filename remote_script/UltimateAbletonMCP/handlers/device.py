@@ -1,11 +1,19 @@
 """Device handler — parameters, presets, automation, racks."""
 
+from . import PRIORITY_READ
+from ..curves import simplify
+from ..param_index import ParamNameIndex
+
+# Default write_automation_curve tolerance, as a fraction of the parameter range
+DEFAULT_CURVE_TOLERANCE = 0.001
+
 
 class DeviceHandler(object):
 
     def __init__(self, song, c_instance):
         self._song = song
         self._c = c_instance
+        self._param_names = ParamNameIndex(c_instance.log_message)
 
     def get_actions(self):
         return {
@@ -13,17 +21,40 @@ class DeviceHandler(object):
             "get_device": self._get,
             "get_device_param": self._get_param,
             "set_device_param": self._set_param,
+            "set_device_params": self._set_params,
             "set_device_enabled": self._set_enabled,
             "get_device_presets": self._get_presets,
             "set_device_preset": self._set_preset,
             "get_device_chains": self._get_chains,
+            "dump_parameters": self._dump_parameters,
             "get_automation": self._get_automation,
             "create_automation": self._create_automation,
             "clear_automation": self._clear_automation,
             "insert_automation_point": self._insert_automation_point,
             "remove_automation_point": self._remove_automation_point,
+            "write_automation_curve": self._write_automation_curve,
+        }
+
+    def get_priorities(self):
+        return {
+            "list_devices": PRIORITY_READ,
+            "get_device": PRIORITY_READ,
+            "get_device_param": PRIORITY_READ,
+            "get_device_presets": PRIORITY_READ,
+            "get_device_chains": PRIORITY_READ,
+            "dump_parameters": PRIORITY_READ,
+            "get_automation": PRIORITY_READ,
+        }
+
+    def get_coalesce_keys(self):
+        return {
+            "set_device_param": ("track_index", "device_index", "param"),
         }
 
+    def disconnect(self):
+        """Remove the parameters listeners behind the name index."""
+        self._param_names.clear()
+
     def _get_track(self, index):
         tracks = self._song.tracks
         if index < 0 or index >= len(tracks):
@@ -74,10 +105,55 @@ class DeviceHandler(object):
             "parameters": parameters,
         }
 
+    def _dump_parameters(self, params):
+        """Every device parameter in the song as parallel arrays.
+
+        Parameter i belongs to device row device[i] (see the device_*
+        arrays) at parameter index param[i]; its name is names[name[i]],
+        each distinct name being sent once. track_indices and class_name
+        narrow the dump. All arrays are top level, so the result streams.
+        """
+        tracks = self._song.tracks
+        indices = params.get("track_indices")
+        if indices is None:
+            indices = range(len(tracks))
+        class_name = params.get("class_name") or None
+        columns = dict((key, []) for key in (
+            "device_track", "device_index", "device_name", "device_class",
+            "device", "param", "name", "value", "min", "max", "quantized"))
+        names = []
+        interned = {}
+        for ti in indices:
+            track = self._get_track(int(ti))
+            for di, device in enumerate(track.devices):
+                if class_name is not None and device.class_name != class_name:
+                    continue
+                row = len(columns["device_track"])
+                columns["device_track"].append(int(ti))
+                columns["device_index"].append(di)
+                columns["device_name"].append(device.name)
+                columns["device_class"].append(device.class_name)
+                for pi, p in enumerate(device.parameters):
+                    name = p.name
+                    ni = interned.get(name)
+                    if ni is None:
+                        ni = interned[name] = len(names)
+                        names.append(name)
+                    columns["device"].append(row)
+                    columns["param"].append(pi)
+                    columns["name"].append(ni)
+                    columns["value"].append(float(p.value))
+                    columns["min"].append(float(p.min))
+                    columns["max"].append(float(p.max))
+                    columns["quantized"].append(bool(p.is_quantized))
+        columns["names"] = names
+        columns["count"] = len(columns["param"])
+        return columns
+
     def _get_param(self, params):
         track, device = self._get_device_obj(params)
         param_ref = params.get("param", 0)
-        param = self._resolve_param(device, param_ref)
+        param = self._resolve_param(device, param_ref, params.get("fuzzy"))
         return {
             "name": param.name,
             "value": float(param.value),
@@ -89,25 +165,62 @@ class DeviceHandler(object):
         track, device = self._get_device_obj(params)
         param_ref = params.get("param", 0)
         value = float(params.get("value", 0))
-        param = self._resolve_param(device, param_ref)
+        param = self._resolve_param(device, param_ref, params.get("fuzzy"))
         clamped = max(float(param.min), min(float(param.max), value))
         param.value = clamped
         return {"name": param.name, "value": float(param.value)}
 
-    def _resolve_param(self, device, param_ref):
-        """Resolve param by index (int) or name (str)."""
+    def _set_params(self, params):
+        """Write many parameters, across devices and tracks, in one pass.
+
+        items is a list of [track_index, device_index, param, value], param
+        being an index or name as for set_device_param. Each device is
+        looked up once however many of its parameters are written. Items
+        that cannot be resolved are reported in their result and skipped;
+        the rest are all resolved before the first write. A write Live
+        rejects is reported the same way and does not stop the others.
+        """
+        fuzzy = params.get("fuzzy")
+        devices = {}  # (track_index, device_index) -> device
+        writes = []
+        results = []
+        for item in params.get("items") or []:
+            try:
+                ti, di, param_ref, value = item
+                key = (int(ti), int(di))
+                device = devices.get(key)
+                if device is None:
+                    device = devices[key] = self._get_device_obj(
+                        {"track_index": key[0], "device_index": key[1]})[1]
+                param = self._resolve_param(device, param_ref, fuzzy)
+                value = max(float(param.min), min(float(param.max), float(value)))
+            except (IndexError, ValueError, TypeError) as e:
+                results.append({"error": str(e)})
+                continue
+            writes.append((param, value, len(results)))
+            results.append(None)
+        written = 0
+        for param, value, position in writes:
+            try:
+                param.value = value
+            except (RuntimeError, ValueError, TypeError) as e:
+                # Live refuses some writes (disabled or macro-mapped params)
+                results[position] = {"error": str(e)}
+                continue
+            results[position] = {"name": param.name, "value": float(param.value)}
+            written += 1
+        return {"results": results, "written": written,
+                "failed": len(results) - written}
+
+    def _resolve_param(self, device, param_ref, fuzzy=False):
+        """Resolve param by index (int) or name (str), see param_index.py."""
         if isinstance(param_ref, int) or (isinstance(param_ref, str) and param_ref.isdigit()):
             idx = int(param_ref)
             params = device.parameters
             if idx < 0 or idx >= len(params):
                 raise IndexError("Parameter index out of range")
             return params[idx]
-        else:
-            name = str(param_ref).lower()
-            for p in device.parameters:
-                if p.name.lower() == name:
-                    return p
-            raise ValueError("Parameter '%s' not found" % param_ref)
+        return self._param_names.resolve(device, str(param_ref), bool(fuzzy))
 
     def _set_enabled(self, params):
         track, device = self._get_device_obj(params)
@@ -191,17 +304,60 @@ class DeviceHandler(object):
         value = float(params.get("value", 0))
         if not hasattr(clip, "automation_envelope"):
             return {"inserted": False, "error": "automation_envelope not available"}
+        envelope = self._envelope(clip, param)
+        if envelope is None:
+            return {"inserted": False, "error": "Could not create envelope"}
+        # insert_step(time, value) — NOT (time, duration, value)
+        envelope.insert_step(time, value)
+        return {"inserted": True, "time": time, "value": value}
+
+    def _envelope(self, clip, param):
+        """The clip's envelope for param, created if missing; None if it cannot be."""
         envelope = clip.automation_envelope(param)
         if envelope is None:
             # Try to create envelope first
             if hasattr(clip, "create_automation_envelope"):
                 clip.create_automation_envelope(param)
                 envelope = clip.automation_envelope(param)
-            if envelope is None:
-                return {"inserted": False, "error": "Could not create envelope"}
-        # insert_step(time, value) — NOT (time, duration, value)
-        envelope.insert_step(time, value)
-        return {"inserted": True, "time": time, "value": value}
+        return envelope
+
+    def _write_automation_curve(self, params):
+        """Write a whole curve to one envelope, dropping redundant points.
+
+        times and values are parallel arrays, sorted by time here if they
+        are not already. Values are clamped to the parameter range, then
+        points within tolerance (a fraction of that range) of the line
+        between their kept neighbours are dropped, see curves.py. clear
+        replaces the existing envelope instead of adding to it.
+        """
+        clip, param = self._get_clip_and_param(params)
+        times = [float(t) for t in params.get("times") or []]
+        values = [float(v) for v in params.get("values") or []]
+        if len(times) != len(values):
+            raise ValueError("times and values differ in length (%d vs %d)"
+                             % (len(times), len(values)))
+        if not times:
+            raise ValueError("Curve has no points")
+        low, high = float(param.min), float(param.max)
+        points = sorted(zip(times, [max(low, min(high, v)) for v in values]),
+                        key=lambda point: point[0])
+        times = [t for t, v in points]
+        values = [v for t, v in points]
+        tolerance = float(params.get("tolerance", DEFAULT_CURVE_TOLERANCE))
+        keep = simplify(times, values, max(0.0, tolerance) * (high - low))
+        if not hasattr(clip, "automation_envelope"):
+            return {"written": 0, "supplied": len(times),
+                    "error": "automation_envelope not available"}
+        if params.get("clear"):
+            clip.clear_envelope(param)
+        envelope = self._envelope(clip, param)
+        if envelope is None:
+            return {"written": 0, "supplied": len(times),
+                    "error": "Could not create envelope"}
+        for i in keep:
+            envelope.insert_step(times[i], values[i])
+        return {"written": len(keep), "supplied": len(times),
+                "param_name": param.name}
 
     def _remove_automation_point(self, params):
         clip, param = self._get_clip_and_param(params)
@@ -1,5 +1,7 @@
 """Scene handler — scene management."""
 
+from . import PRIORITY_READ, PRIORITY_TRANSPORT
+
 
 class SceneHandler(object):
 
@@ -20,6 +22,13 @@ class SceneHandler(object):
             "set_scene_tempo": self._set_tempo,
         }
 
+    def get_priorities(self):
+        return {
+            "fire_scene": PRIORITY_TRANSPORT,
+            "list_scenes": PRIORITY_READ,
+            "get_scene": PRIORITY_READ,
+        }
+
     def _get_scene(self, index):
         scenes = self._song.scenes
         if index < 0 or index >= len(scenes):
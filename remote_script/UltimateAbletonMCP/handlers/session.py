@@ -1,5 +1,7 @@
 """Session handler — global state operations."""
 
+from . import PRIORITY_READ, PRIORITY_TRANSPORT
+
 
 class SessionHandler(object):
 
@@ -22,6 +24,17 @@ class SessionHandler(object):
             "re_enable_automation": self._re_enable_automation,
         }
 
+    def get_priorities(self):
+        return {
+            "get_session_state": PRIORITY_READ,
+            "tap_tempo": PRIORITY_TRANSPORT,
+        }
+
+    def get_coalesce_keys(self):
+        return {
+            "set_tempo": (),
+        }
+
     def _get_state(self, params):
         s = self._song
         tracks = []
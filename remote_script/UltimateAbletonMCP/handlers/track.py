@@ -1,5 +1,15 @@
 """Track handler — CRUD, mixing, routing."""
 
+from . import PRIORITY_READ, PRIORITY_TRANSPORT
+
+# Fields get_mixer reports and set_mixer accepts, per kind of track. Return
+# tracks cannot be armed; the master has no mute, solo or sends.
+MIXER_FIELDS = {
+    "track": ("volume", "pan", "mute", "solo", "arm", "sends"),
+    "return": ("volume", "pan", "mute", "solo", "sends"),
+    "master": ("volume", "pan"),
+}
+
 
 class TrackHandler(object):
 
@@ -27,6 +37,29 @@ class TrackHandler(object):
             "freeze_track": self._freeze,
             "flatten_track": self._flatten,
             "stop_track_clips": self._stop_all_clips,
+            "get_mixer": self._get_mixer,
+            "set_mixer": self._set_mixer,
+            "get_send_matrix": self._get_send_matrix,
+            "set_send_matrix": self._set_send_matrix,
+        }
+
+    def get_priorities(self):
+        return {
+            "list_tracks": PRIORITY_READ,
+            "get_track": PRIORITY_READ,
+            "get_mixer": PRIORITY_READ,
+            "get_send_matrix": PRIORITY_READ,
+            "stop_track_clips": PRIORITY_TRANSPORT,
+        }
+
+    def get_coalesce_keys(self):
+        return {
+            "set_track_volume": ("track_index",),
+            "set_track_pan": ("track_index",),
+            "set_track_mute": ("track_index",),
+            "set_track_solo": ("track_index",),
+            "set_track_arm": ("track_index",),
+            "set_track_send": ("track_index", "send_index"),
         }
 
     def _get_track(self, index):
@@ -35,6 +68,19 @@ class TrackHandler(object):
             raise IndexError("Track index %d out of range (0-%d)" % (index, len(tracks) - 1))
         return tracks[index]
 
+    def _mixer_target(self, kind, index):
+        if kind == "master":
+            return self._song.master_track
+        if kind == "return":
+            returns = self._song.return_tracks
+            if index < 0 or index >= len(returns):
+                raise IndexError("Return track index %d out of range (0-%d)"
+                                 % (index, len(returns) - 1))
+            return returns[index]
+        if kind == "track":
+            return self._get_track(index)
+        raise ValueError("Unknown track kind: %s" % kind)
+
     def _track_info(self, track, index):
         devices = []
         for di, d in enumerate(track.devices):
@@ -226,3 +272,140 @@ class TrackHandler(object):
         track = self._get_track(idx)
         track.stop_all_clips()
         return {"index": idx, "stopped": True}
+
+    # --- bulk mixer ---
+
+    def _mixer_columns(self, tracks, kind):
+        """One array per field, indexed like tracks; sends as one row per track."""
+        fields = MIXER_FIELDS[kind]
+        columns = {"name": [t.name for t in tracks]}
+        mixers = [t.mixer_device for t in tracks]
+        columns["volume"] = [float(m.volume.value) for m in mixers]
+        columns["pan"] = [float(m.panning.value) for m in mixers]
+        for field in ("mute", "solo", "arm"):
+            if field in fields:
+                columns[field] = [bool(getattr(t, field)) for t in tracks]
+        if "sends" in fields:
+            columns["sends"] = [[float(s.value) for s in m.sends] for m in mixers]
+        return columns
+
+    def _get_mixer(self, params):
+        song = self._song
+        master = self._mixer_columns([song.master_track], "master")
+        return {
+            "tracks": self._mixer_columns(song.tracks, "track"),
+            "returns": self._mixer_columns(song.return_tracks, "return"),
+            "master": dict((field, values[0]) for field, values in master.items()),
+        }
+
+    def _mixer_writes(self, change):
+        """(object, attribute, value) writes for one set_mixer change.
+
+        Raises before anything is written if the change names an unknown
+        target, field or send, or a value that does not convert.
+        """
+        kind = change.get("kind", "track")
+        index = int(change.get("track_index", 0))
+        track = self._mixer_target(kind, index)
+        fields = MIXER_FIELDS.get(kind, ())
+        writes = []
+        for field, value in change.items():
+            if field in ("kind", "track_index"):
+                continue
+            if field not in fields:
+                raise ValueError("Field '%s' cannot be set on a %s track"
+                                 % (field, kind))
+            mixer = track.mixer_device
+            if field == "volume":
+                writes.append((mixer.volume, "value", max(0.0, min(1.0, float(value)))))
+            elif field == "pan":
+                writes.append((mixer.panning, "value", max(-1.0, min(1.0, float(value)))))
+            elif field == "sends":
+                sends = mixer.sends
+                # {send_index: value}, or a list with None for untouched sends
+                cells = value.items() if isinstance(value, dict) else enumerate(value)
+                for send_idx, send_value in cells:
+                    send_idx = int(send_idx)
+                    if send_value is None:
+                        continue
+                    if send_idx < 0 or send_idx >= len(sends):
+                        raise IndexError("Send index %d out of range" % send_idx)
+                    writes.append((sends[send_idx], "value",
+                                   max(0.0, min(1.0, float(send_value)))))
+            else:
+                if field == "arm" and not getattr(track, "can_be_armed", True):
+                    raise ValueError("Track %d cannot be armed" % index)
+                writes.append((track, field, bool(value)))
+        return writes
+
+    def _set_mixer(self, params):
+        """Apply many tracks' mixer changes at once, or none of them.
+
+        changes is a list of {"track_index", "kind"?, field: value, ...}
+        with kind "track" (default), "return" or "master". Every change is
+        validated before the first write, so a bad entry leaves the mix
+        untouched, and all writes land within the same tick. Values equal
+        to the current ones are skipped.
+        """
+        changes = params.get("changes") or []
+        writes = []
+        for position, change in enumerate(changes):
+            try:
+                writes.extend(self._mixer_writes(change))
+            except (IndexError, ValueError, TypeError, AttributeError) as e:
+                raise type(e)("changes[%d]: %s" % (position, e))
+        written = 0
+        for target, attr, value in writes:
+            if getattr(target, attr) != value:
+                setattr(target, attr, value)
+                written += 1
+        return {"changes": len(changes), "cells": len(writes), "written": written}
+
+    # --- send matrix ---
+
+    def _get_send_matrix(self, params):
+        """Every track's sends as one row-major array: values[row * columns + col]."""
+        song = self._song
+        columns = len(song.return_tracks)
+        values = []
+        for track in song.tracks:
+            sends = track.mixer_device.sends
+            values.extend(float(sends[col].value) if col < len(sends) else 0.0
+                          for col in range(columns))
+        return {
+            "rows": len(song.tracks),
+            "columns": columns,
+            "tracks": [t.name for t in song.tracks],
+            "returns": [t.name for t in song.return_tracks],
+            "values": values,
+        }
+
+    def _set_send_matrix(self, params):
+        """Write any subset of the send matrix, all cells or none.
+
+        cells is a list of [track_index, send_index, value]. Every cell is
+        checked before the first write; values equal to the current ones
+        are skipped.
+        """
+        cells = params.get("cells") or []
+        tracks = self._song.tracks
+        writes = []
+        for position, cell in enumerate(cells):
+            try:
+                row, col, value = cell
+                row, col = int(row), int(col)
+                if row < 0 or row >= len(tracks):
+                    raise IndexError("Track index %d out of range (0-%d)"
+                                     % (row, len(tracks) - 1))
+                sends = tracks[row].mixer_device.sends
+                if col < 0 or col >= len(sends):
+                    raise IndexError("Send index %d out of range" % col)
+                writes.append((sends[col], max(0.0, min(1.0, float(value)))))
+            except (IndexError, ValueError, TypeError) as e:
+                raise type(e)("cells[%d]: %s" % (position, e))
+        written = 0
+        for send, value in writes:
+            if send.value != value:
+                send.value = value
+                written += 1
+        return {"cells": len(writes), "written": written}
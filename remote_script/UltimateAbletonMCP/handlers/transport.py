@@ -1,5 +1,7 @@
 """Transport handler — playback and navigation."""
 
+from . import PRIORITY_TRANSPORT
+
 
 class TransportHandler(object):
 
@@ -19,6 +21,16 @@ class TransportHandler(object):
             "show_view": self._show_view,
         }
 
+    def get_priorities(self):
+        return {
+            "start_playback": PRIORITY_TRANSPORT,
+            "stop_playback": PRIORITY_TRANSPORT,
+            "continue_playback": PRIORITY_TRANSPORT,
+            "set_record": PRIORITY_TRANSPORT,
+            "seek": PRIORITY_TRANSPORT,
+            "jump_to_cue": PRIORITY_TRANSPORT,
+        }
+
     def _play(self, params):
         self._song.start_playing()
         return {"is_playing": self._song.is_playing}
@@ -0,0 +1,313 @@
+"""Single-threaded, selector-driven TCP server for the Remote Script.
+
+One I/O thread multiplexes the listening socket and every client over a
+selectors event loop with non-blocking sockets and per-client write
+buffers. The main thread never touches a socket: it queues outgoing
+messages and pokes a wakeup socket so the I/O thread flushes them.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import errno
+import json
+import selectors
+import socket
+import threading
+
+RECV_BUFFER = 65536
+
+_WAKEUP = object()
+_LISTENER = object()
+
+
+class ClientConnection(object):
+    """One connected client: socket plus inbound and outbound buffers."""
+
+    def __init__(self, server, sock, addr):
+        self.addr = addr
+        self._server = server
+        self._sock = sock
+        self._inbuf = b""
+        self._outbuf = collections.deque()
+        self._lock = threading.Lock()
+        self._events = 0
+        self.closed = False
+
+    def send_message(self, message):
+        """Queue one message for delivery. Safe to call from any thread.
+
+        It is encoded by the I/O thread when written out, so a large reply
+        costs Live's main thread nothing; the caller must not modify it
+        after handing it over.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self._outbuf.append(message)
+        self._server.wakeup(self)
+
+    def send_frames(self, frames):
+        """Queue an iterator of messages, each built and encoded only when
+        the I/O thread gets to write it. Safe to call from any thread."""
+        with self._lock:
+            if self.closed:
+                return
+            self._outbuf.append(iter(frames))
+        self._server.wakeup(self)
+
+    def has_output(self):
+        with self._lock:
+            return bool(self._outbuf)
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def _read_lines(self):
+        """Read what is available and return complete lines.
+
+        Returns None when the peer has closed the connection.
+        """
+        try:
+            data = self._sock.recv(RECV_BUFFER)
+        except socket.error as e:
+            if e.args and e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return []
+            return None
+        if not data:
+            return None
+        self._inbuf += data
+        if b"\n" not in data:
+            return []
+        lines = self._inbuf.split(b"\n")
+        self._inbuf = lines.pop()
+        return [line for line in lines if line.strip()]
+
+    def _flush(self):
+        """Write as much buffered output as the socket accepts.
+
+        Returns False if the connection failed.
+        """
+        with self._lock:
+            while self._outbuf:
+                data = self._outbuf[0]
+                if not isinstance(data, bytes):
+                    data = self._encode_next(data)
+                    if data is None:
+                        continue
+                try:
+                    sent = self._sock.send(data)
+                except socket.error as e:
+                    if e.args and e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                        return True
+                    return False
+                if sent < len(data):
+                    self._outbuf[0] = data[sent:]
+                    return True
+                self._outbuf.popleft()
+        return True
+
+    def _encode_next(self, pending):
+        """Encode a queued message, or the next one of a queued iterator,
+        in its place at the head of the buffer; None once an iterator is
+        exhausted. Called with _lock held."""
+        if isinstance(pending, dict):
+            message = pending
+            self._outbuf.popleft()
+        else:
+            message = next(pending, None)
+            if message is None:
+                self._outbuf.popleft()
+                return None
+        try:
+            data = (json.dumps(message) + "\n").encode("utf-8")
+        except (TypeError, ValueError) as e:
+            if not isinstance(pending, dict):
+                self._outbuf.popleft()  # the rest of a broken reply is useless
+            error = {"id": message.get("id"), "ok": False,
+                     "code": "EXECUTION_ERROR", "error": "Unencodable reply: %s" % e}
+            if "frame" in message or "done" in message:
+                error["done"] = True
+            data = (json.dumps(error) + "\n").encode("utf-8")
+        self._outbuf.appendleft(data)
+        return data
+
+    def _close(self):
+        with self._lock:
+            self.closed = True
+            self._outbuf.clear()
+        try:
+            self._sock.close()
+        except Exception:
+            pass
+
+
+class SelectorServer(object):
+    """Accepts clients and shuttles newline-delimited JSON on one thread.
+
+    on_line(client, line) is called on the I/O thread for every complete
+    line a client sends; on_disconnect(client), if given, once a client
+    is dropped.
+    """
+
+    def __init__(self, host, port, on_line, log, on_disconnect=None):
+        self._host = host
+        self._requested_port = port
+        self._on_line = on_line
+        self._on_disconnect = on_disconnect
+        self._log = log
+        self._selector = None
+        self._listener = None
+        self._wake_r = None
+        self._wake_w = None
+        self._thread = None
+        self._running = False
+        self._clients = set()
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+
+    @property
+    def port(self):
+        if self._listener:
+            return self._listener.getsockname()[1]
+        return self._requested_port
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((self._host, self._requested_port))
+        self._listener.listen(5)
+        self._listener.setblocking(False)
+
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, _LISTENER)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, _WAKEUP)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the I/O thread immediately and close every socket."""
+        self._running = False
+        self.wakeup()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(2.0)
+        for client in list(self._clients):
+            client._close()
+        self._clients.clear()
+        for sock in (self._listener, self._wake_r, self._wake_w):
+            if sock:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+        if self._selector:
+            self._selector.close()
+
+    def wakeup(self, client=None):
+        """Interrupt select(); optionally mark a client as having output."""
+        if client is not None:
+            with self._dirty_lock:
+                self._dirty.add(client)
+        if self._wake_w is None:
+            return
+        try:
+            self._wake_w.send(b"\0")
+        except socket.error:
+            pass  # buffer full means a wakeup is already pending
+
+    # --- I/O thread ---
+
+    def _run(self):
+        while self._running:
+            try:
+                events = self._selector.select()
+            except Exception as e:
+                if self._running:
+                    self._log("Selector error: %s" % str(e))
+                break
+            for key, mask in events:
+                if key.data is _LISTENER:
+                    self._accept()
+                elif key.data is _WAKEUP:
+                    self._drain_wakeup()
+                else:
+                    self._service(key.data, mask)
+            self._flush_dirty()
+
+    def _accept(self):
+        try:
+            sock, addr = self._listener.accept()
+        except socket.error:
+            return
+        sock.setblocking(False)
+        client = ClientConnection(self, sock, addr)
+        self._clients.add(client)
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        client._events = selectors.EVENT_READ
+        self._log("Client connected from %s" % str(addr))
+
+    def _drain_wakeup(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except socket.error:
+            pass
+
+    def _service(self, client, mask):
+        if mask & selectors.EVENT_READ:
+            lines = client._read_lines()
+            if lines is None:
+                self._drop(client)
+                return
+            for line in lines:
+                try:
+                    self._on_line(client, line.decode("utf-8"))
+                except Exception as e:
+                    self._log("Error handling line: %s" % str(e))
+        if mask & selectors.EVENT_WRITE:
+            self._flush_client(client)
+
+    def _flush_dirty(self):
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        for client in dirty:
+            if client in self._clients:
+                self._flush_client(client)
+
+    def _flush_client(self, client):
+        if not client._flush():
+            self._drop(client)
+            return
+        events = selectors.EVENT_READ
+        if client.has_output():
+            events |= selectors.EVENT_WRITE
+        if events != client._events:
+            self._selector.modify(client._sock, events, client)
+            client._events = events
+
+    def _drop(self, client):
+        if client not in self._clients:
+            return
+        self._clients.discard(client)
+        try:
+            self._selector.unregister(client._sock)
+        except Exception:
+            pass
+        client._close()
+        self._log("Client disconnected")
+        if self._on_disconnect:
+            try:
+                self._on_disconnect(client)
+            except Exception as e:
+                self._log("Error in disconnect callback: %s" % str(e))
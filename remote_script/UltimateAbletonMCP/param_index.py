@@ -0,0 +1,166 @@
+"""Parameter name -> index maps for devices, so name lookups are O(1).
+
+Plugin devices can expose hundreds of parameters, and resolving a name by
+scanning them costs one proxy read per parameter on every get or set. A
+ParamNames map is built once per device and kept until the device's
+parameters listener fires (plugin parameter lists change when a plugin is
+reconfigured). Every hit is also checked against the parameter it points
+at, so a map that missed a change is rebuilt rather than trusted.
+
+Lookups try, in order: the exact name, the name ignoring case, the name
+also ignoring spaces and punctuation, then a unique prefix of that. Fuzzy
+matching is opt-in, since a close-but-wrong name would write the wrong
+parameter. A miss reports the closest names.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import bisect
+import collections
+import difflib
+import re
+
+MAX_DEVICES = 256  # cached maps, least recently used dropped first
+CANDIDATES = 5
+FUZZY_CUTOFF = 0.75
+
+_PUNCTUATION = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _fold(name):
+    return name.lower()
+
+
+def _squash(name):
+    return _PUNCTUATION.sub("", name.lower())
+
+
+class ParamNames(object):
+    """Name -> parameter index for one device; duplicate names keep the first."""
+
+    def __init__(self, parameters):
+        self.names = [p.name for p in parameters]
+        self.exact = {}
+        self.folded = {}
+        self.squashed = {}
+        for index, name in enumerate(self.names):
+            self.exact.setdefault(name, index)
+            self.folded.setdefault(_fold(name), index)
+            self.squashed.setdefault(_squash(name), index)
+        self.sorted_squashed = sorted(self.squashed)
+
+    def find(self, name, fuzzy=False):
+        """Index of the parameter called name, or None."""
+        index = self.exact.get(name)
+        if index is None:
+            index = self.folded.get(_fold(name))
+        if index is None:
+            key = _squash(name)
+            index = self.squashed.get(key)
+            if index is None and key:
+                prefixed = self._prefixed(key, 2)
+                if len(prefixed) == 1:
+                    index = self.squashed[prefixed[0]]
+            if index is None and fuzzy:
+                close = difflib.get_close_matches(key, self.sorted_squashed, 1,
+                                                  FUZZY_CUTOFF)
+                if close:
+                    index = self.squashed[close[0]]
+        return index
+
+    def candidates(self, name, count=CANDIDATES):
+        """Names most like name: prefix matches first, then close spellings."""
+        key = _squash(name)
+        found = [self.names[self.squashed[other]]
+                 for other in self._prefixed(key, count)] if key else []
+        for other in difflib.get_close_matches(key, self.sorted_squashed, count, 0.5):
+            found.append(self.names[self.squashed[other]])
+        unique = []
+        for candidate in found:
+            if candidate not in unique:
+                unique.append(candidate)
+        return unique[:count]
+
+    def _prefixed(self, key, count):
+        """Up to count squashed names starting with key, in sorted order."""
+        start = bisect.bisect_left(self.sorted_squashed, key)
+        found = []
+        for other in self.sorted_squashed[start:start + count]:
+            if not other.startswith(key):
+                break
+            found.append(other)
+        return found
+
+
+class ParamNameIndex(object):
+    """ParamNames per device, invalidated by the device's parameters listener.
+
+    Main thread only.
+    """
+
+    def __init__(self, log=None):
+        self._log = log
+        # device -> [ParamNames or None once stale, listener or None]
+        self._maps = collections.OrderedDict()
+        self.builds = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._maps)
+
+    def resolve(self, device, name, fuzzy=False):
+        """The device parameter called name; ValueError with candidates if none."""
+        names = self._names(device)
+        index = names.find(name, fuzzy)
+        parameters = device.parameters
+        if index is not None and (index >= len(parameters)
+                                  or parameters[index].name != names.names[index]):
+            # Changed without a listener call: rebuild once and retry
+            self._maps[device][0] = None
+            names = self._names(device)
+            index = names.find(name, fuzzy)
+            parameters = device.parameters
+        if index is None:
+            candidates = names.candidates(name)
+            if candidates:
+                raise ValueError("Parameter '%s' not found. Closest: %s"
+                                 % (name, ", ".join(candidates)))
+            raise ValueError("Parameter '%s' not found" % name)
+        self.hits += 1
+        return parameters[index]
+
+    def forget(self, device):
+        """Drop a device's map and its listener."""
+        entry = self._maps.pop(device, None)
+        if entry is None or entry[1] is None:
+            return
+        try:
+            if device.parameters_has_listener(entry[1]):
+                device.remove_parameters_listener(entry[1])
+        except Exception as e:
+            # Device already deleted; its listeners went with it
+            if self._log:
+                self._log("Error removing parameters listener: %s" % str(e))
+
+    def clear(self):
+        for device in list(self._maps):
+            self.forget(device)
+
+    def _names(self, device):
+        entry = self._maps.pop(device, None)
+        if entry is None:
+            entry = [None, None]
+            if hasattr(device, "add_parameters_listener"):
+                # Only marks the map stale: listeners must not be removed
+                # from inside a notification
+                def listener():
+                    entry[0] = None
+                device.add_parameters_listener(listener)
+                entry[1] = listener
+        if entry[0] is None:
+            entry[0] = ParamNames(device.parameters)
+            self.builds += 1
+        self._maps[device] = entry  # most recently used last
+        while len(self._maps) > MAX_DEVICES:
+            self.forget(next(iter(self._maps)))
+        return entry[0]
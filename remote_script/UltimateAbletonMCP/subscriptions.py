@@ -0,0 +1,364 @@
+"""LOM property subscriptions pushed to clients as event frames.
+
+A client subscribes to a topic (optionally scoped by track/scene index);
+the first subscriber registers one Live listener for that target and later
+subscribers share it. Listener callbacks only mark the target dirty, so a
+property that changes many times in one tick produces a single event when
+update_display() flushes: {"event": topic, "params": {...}, "value": v,
+"tick": n}, where n counts flushes and lets a client order events against
+a snapshot taken during tick n.
+
+Index-scoped subscriptions follow their target, not the index: when tracks
+or scenes are added, removed or moved, each one is re-keyed to its
+target's new index (or dropped with it) before the next flush, so events
+always carry the index the target has now.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import threading
+
+
+def _song(song, params):
+    return song
+
+
+def _track(song, params):
+    return song.tracks[params["track_index"]]
+
+
+def _track_volume(song, params):
+    return _track(song, params).mixer_device.volume
+
+
+def _track_panning(song, params):
+    return _track(song, params).mixer_device.panning
+
+
+def _clip_slot(song, params):
+    return _track(song, params).clip_slots[params["scene_index"]]
+
+
+def _scene(song, params):
+    return song.scenes[params["scene_index"]]
+
+
+def _indexed(song, name, anchors):
+    """The list an index param indexes, given the anchors before it.
+
+    A scene index under a track picks that track's clip slot, so a
+    subscribed slot follows the slot itself.
+    """
+    if name == "track_index":
+        return song.tracks
+    if anchors:
+        return anchors[0].clip_slots
+    return song.scenes
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+def _scene_tempo(value):
+    return float(value) if value else None
+
+
+# topic -> (index params, target resolver, listenable property, value reader)
+TOPICS = {
+    "tempo": ((), _song, "tempo", None),
+    "is_playing": ((), _song, "is_playing", None),
+    "record_mode": ((), _song, "record_mode", None),
+    "metronome": ((), _song, "metronome", None),
+    "loop_start": ((), _song, "loop_start", None),
+    "loop_length": ((), _song, "loop_length", None),
+    "signature_numerator": ((), _song, "signature_numerator", None),
+    "signature_denominator": ((), _song, "signature_denominator", None),
+    "tracks": ((), _song, "tracks", _names),
+    "scenes": ((), _song, "scenes", _names),
+    "track.name": (("track_index",), _track, "name", None),
+    "track.mute": (("track_index",), _track, "mute", None),
+    "track.solo": (("track_index",), _track, "solo", None),
+    "track.arm": (("track_index",), _track, "arm", None),
+    "track.volume": (("track_index",), _track_volume, "value", None),
+    "track.panning": (("track_index",), _track_panning, "value", None),
+    "track.devices": (("track_index",), _track, "devices", _names),
+    "scene.name": (("scene_index",), _scene, "name", None),
+    "scene.color": (("scene_index",), _scene, "color", None),
+    "scene.tempo": (("scene_index",), _scene, "tempo", _scene_tempo),
+    "clip_slot.has_clip": (("track_index", "scene_index"), _clip_slot,
+                           "has_clip", None),
+    "clip_slot.playing_status": (("track_index", "scene_index"), _clip_slot,
+                                 "playing_status", None),
+}
+
+
+class _Subscription(object):
+    """One Live listener and the clients that receive its events.
+
+    clients subscribed explicitly; mirrors hold it through subscribe_all.
+    """
+
+    __slots__ = ("key", "topic", "params", "anchors", "target", "prop", "read",
+                 "listener", "clients", "mirrors", "value")
+
+    def __init__(self, key, topic, params, anchors, target, prop, read):
+        self.key = key
+        self.topic = topic
+        self.params = params
+        self.anchors = anchors  # the track/scene each index param named
+        self.target = target
+        self.prop = prop
+        self.read = read
+        self.listener = None
+        self.clients = set()
+        self.mirrors = set()
+        self.value = None
+
+    def current(self):
+        value = getattr(self.target, self.prop)
+        return self.read(value) if self.read else value
+
+
+class SubscriptionManager(object):
+    """Owns every Live listener registered on behalf of clients.
+
+    Everything except client_closed() runs on Live's main thread.
+    """
+
+    def __init__(self, song, log):
+        self._song = song
+        self._log = log
+        self._subs = {}
+        self._dirty = set()  # subscriptions whose target changed
+        self._gone = set()
+        self._gone_lock = threading.Lock()
+        self._layout_listener = None  # on song tracks/scenes, once any sub is scoped
+        self._moved = False
+        self.tick = 0
+
+    def __len__(self):
+        return len(self._subs)
+
+    def subscribe(self, client, params, mirror=False):
+        if client is None:
+            raise ValueError("subscribe needs a client connection")
+        self._rekey()
+        key, topic, scoped = self._key(params)
+        sub = self._subs.get(key)
+        if sub is None:
+            sub = self._listen(key, topic, scoped)
+            sub.value = sub.current()
+        # An existing sub keeps its last pushed value so a change still
+        # pending for the other subscribers is not swallowed
+        value = sub.current()
+        (sub.mirrors if mirror else sub.clients).add(client)
+        return {"topic": topic, "params": scoped, "value": value,
+                "subscribers": len(sub.clients | sub.mirrors)}
+
+    def unsubscribe(self, client, params):
+        """Drop one topic, or every subscription of the client if none given.
+
+        Only explicit subscriptions are touched; see subscribe_all.
+        """
+        if params.get("topic"):
+            key = self._key(params)[0]
+            keys = [key] if key in self._subs else []
+        else:
+            keys = list(self._subs)
+        removed = 0
+        for key in keys:
+            if client in self._subs[key].clients:
+                self._subs[key].clients.discard(client)
+                removed += 1
+                self._release(key)
+        return {"removed": removed, "subscriptions": len(self._subs)}
+
+    def subscribe_all(self, client):
+        """Subscribe a mirroring client to every topic on every target.
+
+        These mirror subscriptions are kept apart from the client's explicit
+        ones: calling this again replaces only them, unsubscribe leaves them
+        alone, and their events carry "mirror": true unless the client also
+        subscribed explicitly. Returns the number of mirror subscriptions.
+
+        A resync only touches the difference: subscriptions follow their
+        targets (see _rekey), so those the client already holds are kept,
+        and listeners are added and removed just for targets that came or
+        went since the last call.
+        """
+        self._rekey()
+        counts = {"track_index": len(self._song.tracks),
+                  "scene_index": len(self._song.scenes)}
+        wanted = {}  # key -> scope
+        for topic, (names, _, _, _) in sorted(TOPICS.items()):
+            scopes = [{}]
+            for name in names:
+                scopes = [dict(scope, **{name: i})
+                          for scope in scopes for i in range(counts[name])]
+            for scope in scopes:
+                key = (topic,) + tuple(scope[name] for name in names)
+                scope["topic"] = topic
+                wanted[key] = scope
+        for key in [key for key, sub in self._subs.items()
+                    if client in sub.mirrors and key not in wanted]:
+            self._subs[key].mirrors.discard(client)
+            self._release(key)
+        for key, scope in wanted.items():
+            sub = self._subs.get(key)
+            if sub is None or client not in sub.mirrors:
+                self.subscribe(client, scope, mirror=True)
+        return len(wanted)
+
+    def client_closed(self, client):
+        """Forget a disconnected client. Safe to call from any thread."""
+        with self._gone_lock:
+            self._gone.add(client)
+
+    def flush(self):
+        """Push one event per changed target; returns the number sent."""
+        with self._gone_lock:
+            gone, self._gone = self._gone, set()
+        for client in gone:
+            self.unsubscribe(client, {})
+            self._drop_mirror(client)
+        self._rekey()
+
+        dirty, self._dirty = self._dirty, set()
+        tick, self.tick = self.tick, self.tick + 1
+        sent = 0
+        for sub in dirty:
+            if self._subs.get(sub.key) is not sub:
+                continue
+            try:
+                value = sub.current()
+            except Exception as e:
+                # Target went away (track deleted): stop listening to it
+                self._log("Dropping subscription %s: %s" % (sub.topic, str(e)))
+                self._unlisten(sub.key)
+                continue
+            if value == sub.value:
+                continue
+            sub.value = value
+            event = {"event": sub.topic, "params": sub.params, "value": value,
+                     "tick": tick}
+            for client in list(sub.clients):
+                client.send_message(event)
+                sent += 1
+            mirror_event = None
+            for client in list(sub.mirrors - sub.clients):
+                if mirror_event is None:
+                    mirror_event = dict(event, mirror=True)
+                client.send_message(mirror_event)
+                sent += 1
+        return sent
+
+    def clear(self):
+        """Remove every Live listener."""
+        for key in list(self._subs):
+            self._unlisten(key)
+        self._dirty.clear()
+        if self._layout_listener is not None:
+            for prop in ("tracks", "scenes"):
+                try:
+                    getattr(self._song, "remove_%s_listener" % prop)(
+                        self._layout_listener)
+                except Exception as e:
+                    self._log("Error removing %s listener: %s" % (prop, str(e)))
+            self._layout_listener = None
+        self._moved = False
+
+    def _rekey(self):
+        """Move index-scoped subscriptions to their targets' current indices.
+
+        Runs after tracks or scenes changed; a subscription whose track or
+        scene is gone is dropped.
+        """
+        if not self._moved:
+            return
+        self._moved = False
+        positions = {}  # list owner -> {item: index}, built on first use
+        moved = []
+        for key, sub in list(self._subs.items()):
+            names = TOPICS[sub.topic][0]
+            if not names:
+                continue
+            indices = ()
+            for name, anchor in zip(names, sub.anchors):
+                owner = sub.anchors[0] if name == "scene_index" and indices else name
+                table = positions.get(owner)
+                if table is None:
+                    items = _indexed(self._song, name, sub.anchors[:len(indices)])
+                    table = positions[owner] = dict(
+                        (item, i) for i, item in enumerate(items))
+                index = table.get(anchor)
+                if index is None:
+                    break
+                indices += (index,)
+            if len(indices) < len(names):
+                self._unlisten(key)
+            elif indices != key[1:]:
+                del self._subs[key]
+                sub.key = (sub.topic,) + indices
+                sub.params = dict(zip(names, indices))
+                moved.append(sub)
+        for sub in moved:
+            self._subs[sub.key] = sub
+
+    def _drop_mirror(self, client):
+        for key in list(self._subs):
+            self._subs[key].mirrors.discard(client)
+            self._release(key)
+
+    def _release(self, key):
+        sub = self._subs[key]
+        if not sub.clients and not sub.mirrors:
+            self._unlisten(key)
+
+    def _key(self, params):
+        topic = params.get("topic", "")
+        if topic not in TOPICS:
+            raise ValueError("Unknown topic '%s'. Available: %s"
+                             % (topic, ", ".join(sorted(TOPICS))))
+        names = TOPICS[topic][0]
+        scoped = {}
+        for name in names:
+            if name not in params:
+                raise ValueError("Topic '%s' needs %s" % (topic, name))
+            scoped[name] = int(params[name])
+        return (topic,) + tuple(scoped[name] for name in names), topic, scoped
+
+    def _listen(self, key, topic, scoped):
+        names, resolve, prop, read = TOPICS[topic]
+        try:
+            target = resolve(self._song, scoped)
+            anchors = ()
+            for name in names:
+                anchors += (_indexed(self._song, name, anchors)[scoped[name]],)
+        except IndexError:
+            raise IndexError("No target for %s %s" % (topic, scoped))
+        if names and self._layout_listener is None:
+            def moved():
+                self._moved = True
+            for attr in ("tracks", "scenes"):
+                getattr(self._song, "add_%s_listener" % attr)(moved)
+            self._layout_listener = moved
+        sub = _Subscription(key, topic, scoped, anchors, target, prop, read)
+
+        def listener():
+            self._dirty.add(sub)
+
+        getattr(target, "add_%s_listener" % prop)(listener)
+        sub.listener = listener
+        self._subs[key] = sub
+        return sub
+
+    def _unlisten(self, key):
+        sub = self._subs.pop(key)
+        self._dirty.discard(sub)
+        try:
+            remove = getattr(sub.target, "remove_%s_listener" % sub.prop)
+            if getattr(sub.target, "%s_has_listener" % sub.prop)(sub.listener):
+                remove(sub.listener)
+        except Exception as e:
+            self._log("Error removing %s listener: %s" % (sub.topic, str(e)))
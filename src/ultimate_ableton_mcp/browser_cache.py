@@ -0,0 +1,269 @@
+"""On-disk copy of the Live browser index, so search works from launch.
+
+The Remote Script builds its browser index over many ticks after Live
+starts, and a search waits for it. This module keeps the last crawled
+index in a local sqlite file, memory-mapped when opened, and tagged with
+the Live version and the browser fingerprint it was crawled under. The
+first search of a session checks that tag with one cheap round trip
+(``get_browser_fingerprint``). If it matches, searches are answered from
+disk straight away. Either way, the full index is then fetched in the
+background (``get_browser_index``, streamed) and merged into the file
+row by row, so a stale copy catches up without blocking anyone.
+
+Set ABLETON_MCP_BROWSER_CACHE to a file path to move the cache, or to 0
+to disable it.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .connection import AsyncAbletonConnection, assemble_stream
+
+logger = logging.getLogger("ultimate-ableton-mcp")
+
+MMAP_BYTES = 256 * 1024 * 1024  # upper bound; sqlite maps only the file size
+CHECK_INTERVAL = 60.0  # seconds before the fingerprint is checked again
+FETCH_ATTEMPTS = 3  # background index fetches, each bounded by COMMAND_TIMEOUT
+SCHEMA_VERSION = "1"
+
+_SPLIT = re.compile(r"[\W_]+")
+
+
+def _words(text: str) -> list[str]:
+    return [word for word in _SPLIT.split(text.lower()) if word]
+
+
+def _score(phrase: str, name: str, is_loadable: int) -> float:
+    """Rank of one item for the query words in phrase; registered in sqlite
+    so ORDER BY ranks every matching row, not just the first few hundred."""
+    words = phrase.split()
+    name_words = _words(name)
+    score = 0.0
+    for word in words:
+        if word in name_words:
+            score += 4.0
+        elif any(w.startswith(word) for w in name_words):
+            score += 2.0
+        else:
+            score += 1.0
+    joined = " ".join(name_words)
+    if joined == phrase:
+        score += 8.0
+    elif joined.startswith(phrase):
+        score += 4.0
+    if is_loadable:
+        score += 0.5
+    return score
+
+
+def default_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ultimate-ableton-mcp", "browser.sqlite")
+
+
+class BrowserCache:
+    """sqlite store of browser items plus the session's validation state.
+
+    Storage methods are synchronous and thread-safe; search() and
+    revalidate() are the async entry points used by the browser tool.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.create_function("score", 3, _score, deterministic=True)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta "
+                             "(key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS items "
+                             "(uri TEXT PRIMARY KEY, name TEXT, path TEXT, "
+                             "category TEXT, is_loadable INTEGER, words TEXT)")
+        if self.meta().get("schema") != SCHEMA_VERSION:
+            self.store("", "", [])
+        self.fresh = False  # on-disk copy matches the running Live
+        self.checked_at: float | None = None
+        self.hits = 0
+        self.last_sync: dict = {}
+        self._check_lock = asyncio.Lock()
+        self._revalidation: asyncio.Task | None = None
+
+    # --- storage ---
+
+    def meta(self) -> dict:
+        with self._lock:
+            return dict(self._db.execute("SELECT key, value FROM meta"))
+
+    def matches(self, live_version: str, fingerprint: str) -> bool:
+        meta = self.meta()
+        return (bool(fingerprint) and meta.get("fingerprint") == fingerprint
+                and meta.get("live_version") == live_version)
+
+    def store(self, live_version: str, fingerprint: str,
+              entries: list[list]) -> dict:
+        """Merge a crawled index into the file; only changed rows are written.
+
+        entries are [uri, path, is_loadable] as sent by get_browser_index.
+        Returns counts of added, changed and removed rows.
+        """
+        rows = {}
+        for uri, path, is_loadable in entries:
+            name = path.rsplit("/", 1)[-1]
+            words = " ".join(_words(name) + _words(path) + _words(uri))
+            rows[uri] = (name, path, path.split("/", 1)[0], int(bool(is_loadable)),
+                         f" {words} ")
+        with self._lock, self._db:
+            old = {uri: tuple(rest) for uri, *rest in self._db.execute(
+                "SELECT uri, name, path, category, is_loadable, words FROM items")}
+            removed = [(uri,) for uri in old.keys() - rows.keys()]
+            upserts = [(uri,) + row for uri, row in rows.items()
+                       if old.get(uri) != row]
+            added = sum(1 for uri, *_ in upserts if uri not in old)
+            self._db.executemany("DELETE FROM items WHERE uri = ?", removed)
+            self._db.executemany("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                                 upserts)
+            self._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ("schema", SCHEMA_VERSION), ("live_version", live_version),
+                ("fingerprint", fingerprint), ("synced_at", str(time.time()))])
+        return {"added": added, "changed": len(upserts) - added,
+                "removed": len(removed), "items": len(rows)}
+
+    def lookup(self, query: str, category: str | None = None,
+               limit: int = 20) -> list[dict]:
+        """Rank stored items against the words of query.
+
+        Each word must start a word of the item's name, path or URI; the
+        ranking mirrors the Remote Script's search_browser and is done in
+        SQL, so the best match is found however many rows qualify.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        phrase = " ".join(words)
+        sql = ("SELECT uri, name, path, category, is_loadable, "
+               "score(?, name, is_loadable) AS rank FROM items WHERE "
+               + " AND ".join("instr(words, ?) > 0" for _ in words))
+        args: list = [phrase] + [f" {word}" for word in words]
+        if category:
+            sql += " AND category = ?"
+            args.append(category)
+        sql += (" ORDER BY rank DESC, length(path) - length(replace(path, '/', '')), "
+                "uri LIMIT ?")
+        args.append(max(1, limit))
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [{"name": name, "uri": uri, "path": path, "category": cat,
+                 "is_loadable": bool(is_loadable), "score": round(rank, 3)}
+                for uri, name, path, cat, is_loadable, rank in rows]
+
+    def stats(self) -> dict:
+        meta = self.meta()
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return {
+            "path": self.path,
+            "items": count,
+            "live_version": meta.get("live_version") or None,
+            "fresh": self.fresh,
+            "hits": self.hits,
+            "revalidating": bool(self._revalidation and not self._revalidation.done()),
+            "last_sync": self.last_sync,
+        }
+
+    def close(self) -> None:
+        if self._revalidation is not None:
+            self._revalidation.cancel()
+        with self._lock:
+            self._db.close()
+
+    # --- session ---
+
+    async def search(self, conn: AsyncAbletonConnection, query: str,
+                     category: str | None = None, limit: int = 20) -> dict | None:
+        """Answer a search from disk, or None when Live must answer it."""
+        await self.check(conn)
+        if not self.fresh:
+            return None
+        results = await asyncio.to_thread(self.lookup, query, category, limit)
+        if not results:
+            return None  # let Live try, with its typo-tolerant matching
+        self.hits += 1
+        return {"query": query, "results": results, "count": len(results),
+                "complete": True, "source": "disk"}
+
+    async def check(self, conn: AsyncAbletonConnection) -> None:
+        """Compare the stored tag with Live's, then revalidate in background."""
+        if self.checked_at is not None and \
+                time.monotonic() - self.checked_at < CHECK_INTERVAL:
+            return
+        async with self._check_lock:
+            if self.checked_at is not None and \
+                    time.monotonic() - self.checked_at < CHECK_INTERVAL:
+                return
+            try:
+                tag = await conn.send("get_browser_fingerprint")
+            except RuntimeError as e:
+                # Remote Script without browser index support
+                logger.warning("Browser cache unused: %s", e)
+                self.fresh = False
+                self.checked_at = time.monotonic()
+                return
+            self.fresh = self.matches(tag["live_version"], tag["fingerprint"])
+            first = self.checked_at is None
+            self.checked_at = time.monotonic()
+            if (first or not self.fresh) and (
+                    self._revalidation is None or self._revalidation.done()):
+                self._revalidation = asyncio.ensure_future(self.revalidate(conn))
+
+    async def revalidate(self, conn: AsyncAbletonConnection) -> dict | None:
+        """Fetch Live's full index and merge it into the file."""
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                index = assemble_stream(
+                    [frame async for frame in conn.stream("get_browser_index")])
+                break
+            except (RuntimeError, ConnectionError, TimeoutError) as e:
+                # EXPIRED or timed out while Live is still walking a large library
+                logger.info("Browser index not ready (%s), attempt %d",
+                            e, attempt + 1)
+        else:
+            return None
+        self.last_sync = await asyncio.to_thread(
+            self.store, index["live_version"], index["fingerprint"], index["items"])
+        self.fresh = True
+        logger.info("Browser cache synced: %s", self.last_sync)
+        return self.last_sync
+
+
+_cache: BrowserCache | None = None
+
+
+def get_browser_cache() -> BrowserCache | None:
+    """Open the singleton cache, or None if disabled or unusable."""
+    global _cache
+    if _cache is None:
+        path = os.environ.get("ABLETON_MCP_BROWSER_CACHE", "")
+        if path == "0":
+            return None
+        try:
+            _cache = BrowserCache(path or default_path())
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Browser cache disabled: %s", e)
+            return None
+    return _cache
+
+
+def shutdown_browser_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -1,11 +1,20 @@
 """TCP connection manager for Ableton Live Remote Script communication."""
 
+import asyncio
+import collections
 import json
 import logging
 import os
+import queue
+import random
 import socket
+import threading
 import time
 import uuid
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from .mirror import MIRRORED_ACTIONS, LiveMirror
 
 logger = logging.getLogger("ultimate-ableton-mcp")
 
@@ -14,125 +23,996 @@ DEFAULT_PORT = 9877
 RECV_BUFFER = 65536
 CONNECT_TIMEOUT = 5.0
 COMMAND_TIMEOUT = 15.0
+STREAM_LIMIT = 64 * 1024 * 1024  # max size of one response line
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.05  # seconds, doubled per retry
+EVENT_BUFFER = 256  # subscription events kept for drain_events()
+CACHE_ENTRIES = 512
+
+# Read action -> seconds its result may be served from the response cache
+CACHE_TTLS = {
+    "list_tracks": 2.0,
+    "get_track": 2.0,
+    "get_mixer": 2.0,
+    "get_send_matrix": 2.0,
+    "list_scenes": 2.0,
+    "get_scene": 2.0,
+    "get_clip": 2.0,
+    "get_clip_notes": 2.0,
+    "get_arrangement_clips": 5.0,
+    "list_devices": 5.0,
+    "get_device": 2.0,
+    "get_device_param": 1.0,
+    "get_device_presets": 30.0,
+    "get_device_chains": 5.0,
+    "dump_parameters": 2.0,
+    "get_automation": 2.0,
+    "get_grooves": 30.0,
+    "get_browser_tree": 60.0,
+    "get_browser_items": 60.0,
+    "search_browser": 60.0,
+}
+
+# Reads that are never cached but must not invalidate anything either
+UNCACHED_READS = frozenset({
+    "get_session_state", "get_snapshot", "get_server_stats",
+    "subscribe", "unsubscribe", "cancel",
+    "get_browser_fingerprint", "get_browser_index",
+})
+
+# Reads that concurrent identical calls may share one wire request for
+SHARED_READS = frozenset(CACHE_TTLS) | {"get_session_state", "get_server_stats"}
+
+_TRACK = (("list_tracks", ()), ("get_track", ("track_index",)), ("get_mixer", ()),
+          ("get_send_matrix", ()))
+_SCENE = (("list_scenes", ()), ("get_scene", ("scene_index",)))
+# get_track lists its clip slots: has_clip, name, length, is_playing
+_CLIP = (("get_clip", ("track_index", "scene_index")),
+         ("get_scene", ("scene_index",)), ("get_track", ("track_index",)))
+_NOTES = (("get_clip_notes", ("track_index", "scene_index")),
+          ("get_clip", ("track_index", "scene_index")),
+          ("get_track", ("track_index",)))
+_DEVICE = (("list_devices", ("track_index",)),
+           ("get_device", ("track_index", "device_index")),
+           ("get_device_param", ("track_index", "device_index")),
+           ("dump_parameters", ()))
+_PLAYING = (("get_clip", ()), ("get_scene", ()), ("get_track", ()))
+
+# Write action -> (read action, scope) pairs it makes stale. A read entry is
+# dropped when its params agree with the write's on every scope name; an
+# empty scope drops every entry of that read. Writes missing from this map
+# clear the whole cache.
+INVALIDATES = {
+    "rename_track": _TRACK,
+    "set_track_volume": _TRACK,
+    "set_track_pan": _TRACK,
+    "set_track_mute": _TRACK,
+    "set_track_solo": _TRACK,
+    "set_track_arm": _TRACK,
+    "set_track_color": _TRACK,
+    "set_track_send": _TRACK,
+    "set_track_input_routing": _TRACK,
+    "set_track_output_routing": _TRACK,
+    "set_mixer": (("list_tracks", ()), ("get_track", ()), ("get_mixer", ()),
+                  ("get_send_matrix", ())),
+    "set_send_matrix": (("get_track", ()), ("get_mixer", ()), ("get_send_matrix", ())),
+    "rename_scene": _SCENE,
+    "set_scene_color": _SCENE,
+    "set_scene_tempo": _SCENE,
+    "create_clip": _CLIP + _NOTES,
+    "delete_clip": _CLIP + _NOTES,
+    "rename_clip": _CLIP,
+    "set_clip_loop": _CLIP,
+    "set_clip_groove": _CLIP,
+    "add_clip_notes": _NOTES,
+    "remove_clip_notes": _NOTES,
+    "set_clip_notes": _NOTES,
+    "duplicate_clip_to_arrangement": (("get_arrangement_clips", ("track_index",)),),
+    "set_device_param": _DEVICE,
+    "set_device_params": (("list_devices", ()), ("get_device", ()),
+                          ("get_device_param", ()), ("dump_parameters", ())),
+    "set_device_enabled": _DEVICE,
+    "set_device_preset": _DEVICE + (("get_device_presets",
+                                     ("track_index", "device_index")),),
+    "create_automation": (("get_automation", ("track_index",)),),
+    "clear_automation": (("get_automation", ("track_index",)),),
+    "insert_automation_point": (("get_automation", ("track_index",)),),
+    "remove_automation_point": (("get_automation", ("track_index",)),),
+    "write_automation_curve": (("get_automation", ("track_index",)),),
+    "fire_clip": _PLAYING,
+    "stop_clip": _PLAYING,
+    "fire_scene": _PLAYING,
+    "stop_all_clips": _PLAYING,
+    "stop_track_clips": _PLAYING,
+    "start_playback": _PLAYING,
+    "stop_playback": _PLAYING,
+    "continue_playback": _PLAYING,
+    "set_tempo": (),
+    "set_time_signature": (),
+    "set_loop": (),
+    "set_metronome": (),
+    "tap_tempo": (),
+    "set_arrangement_overdub": (),
+    "set_session_automation_record": (),
+    "re_enable_automation": (("get_automation", ()),),
+    "set_record": (),
+    "seek": (),
+    "jump_to_cue": (),
+    "scroll_to_time": (),
+    "show_view": (),
+    "refresh_browser_index": (("get_browser_tree", ()), ("get_browser_items", ()),
+                              ("search_browser", ())),
+}
+
+
+def _new_request_id() -> str:
+    return f"req_{uuid.uuid4().hex[:8]}"
+
+
+def _encode_command(request_id: str, action: str, params: dict | None,
+                    stream: bool = False) -> bytes:
+    # timeout lets the Remote Script drop the command once we stop waiting
+    command = {"id": request_id, "action": action, "params": params or {},
+               "timeout": COMMAND_TIMEOUT}
+    if stream:
+        command["stream"] = True
+    return (json.dumps(command) + "\n").encode("utf-8")
+
+
+def _batch_params(commands: list[tuple[str, dict | None]]) -> dict:
+    return {"commands": [{"action": action, "params": params or {}}
+                         for action, params in commands]}
+
+
+def _read_key(action: str, params: dict | None) -> tuple:
+    """Identity of a read: action plus its params in canonical form."""
+    return action, json.dumps(params or {}, sort_keys=True)
+
+
+def _is_busy(response: dict) -> bool:
+    return not response.get("ok", False) and response.get("code") == "BUSY"
+
+
+def _busy_delay(response: dict, attempt: int) -> float:
+    """Jittered exponential backoff, never shorter than the server's hint."""
+    delay = max(float(response.get("retry_after", 0)), BUSY_BACKOFF * 2 ** attempt)
+    return random.uniform(delay, delay * 2)
+
+
+def _unwrap(response: dict) -> dict:
+    """Return the result of a response message, raising on error."""
+    if not response.get("ok", False):
+        error = response.get("error", "Unknown error from Ableton")
+        code = response.get("code", "UNKNOWN")
+        raise RuntimeError(f"[{code}] {error}")
+    return response.get("result", {})
+
+
+def _is_event(msg: dict) -> bool:
+    """True for an unsolicited subscription event pushed by the Remote Script."""
+    return "event" in msg and "id" not in msg
+
+
+def _is_final(msg: dict) -> bool:
+    """True for the last message of a reply: a done frame or any error."""
+    return bool(msg.get("done")) or not msg.get("ok", False)
+
+
+def assemble_stream(frames: Iterable[dict]) -> dict:
+    """Rebuild the full result dict from the frames of a streamed reply.
+
+    A frame whose key is a path (``["categories", 2, "children"]``) extends
+    a list nested in an item an earlier frame delivered.
+    """
+    lists: dict[str, list] = {}
+    for frame in frames:
+        if frame.get("done"):
+            result = dict(frame.get("result", {}))
+            for key, items in lists.items():
+                result.setdefault(key, []).extend(items)
+            return result
+        key = frame["key"]
+        if isinstance(key, list):
+            target = lists[key[0]]
+            for step in key[1:-1]:
+                target = target[step]
+            target.setdefault(key[-1], []).extend(frame["items"])
+        else:
+            lists.setdefault(key, []).extend(frame["items"])
+    raise ConnectionError("Stream ended without a final frame")
+
+
+class ResponseCache:
+    """Read-through TTL + LRU cache of read results, invalidated by writes.
+
+    Only actions in CACHE_TTLS are cached, keyed by action and params. Every
+    other action is treated as a write: the INVALIDATES map says which
+    entries it drops, and a write missing from the map clears everything.
+    Each write also bumps ``generation`` so a read that was in flight
+    across it is not stored. Thread-safe; cached results are shared, so
+    treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._entries: collections.OrderedDict[tuple, tuple] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, action: str, params: dict | None) -> tuple | None:
+        """Cache key for a cacheable read, None for anything else."""
+        if action not in CACHE_TTLS:
+            return None
+        return _read_key(action, params)
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, result: dict, params: dict | None,
+            generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return  # a write went out while this read was in flight
+            if result.get("complete") is False:
+                return  # e.g. a partial search while the browser index builds
+            expires = time.monotonic() + CACHE_TTLS[key[0]]
+            self._entries[key] = (expires, result, params or {})
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def note_write(self, action: str, params: dict | None) -> None:
+        """Drop what ``action`` may change; a no-op for reads."""
+        with self._lock:
+            self._invalidate(action, params or {})
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+    def _invalidate(self, action: str, params: dict) -> None:
+        if action in CACHE_TTLS or action in UNCACHED_READS:
+            return
+        self.generation += 1
+        if action == "batch":
+            for entry in params.get("commands", []):
+                if isinstance(entry, dict):
+                    self._invalidate(entry.get("action", ""), entry.get("params") or {})
+            return
+        rules = INVALIDATES.get(action)
+        if rules is None:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            return
+        for read_action, scope in rules:
+            stale = [key for key, (_, _, cached) in self._entries.items()
+                     if key[0] == read_action
+                     and all(cached.get(name, 0) == params.get(name, 0)
+                             for name in scope)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
 
 
 class AbletonConnection:
     """Manages TCP connection to the Ableton Remote Script.
 
-    Uses newline-delimited JSON protocol with request IDs for
-    concurrent request support.
+    Uses newline-delimited JSON protocol with request IDs. A background
+    reader thread routes every response to the future registered for its
+    ID, so any number of requests can be in flight on the one socket and
+    callers sharing the connection never see each other's responses.
+    Streamed requests register a queue instead and receive every frame.
+    Subscription events go to the callbacks added with add_event_listener,
+    called on the reader thread. With ``cache`` set, reads go through a
+    ResponseCache. Identical reads issued concurrently from several threads
+    share one wire request (single flight).
     """
 
-    def __init__(self):
+    def __init__(self, cache: bool = False):
         self.host = os.environ.get("ABLETON_MCP_HOST", DEFAULT_HOST)
         self.port = int(os.environ.get("ABLETON_MCP_PORT", DEFAULT_PORT))
         self._sock: socket.socket | None = None
+        self._reader: threading.Thread | None = None
+        self._pending: dict[str, Future | queue.Queue] = {}
+        self._lock = threading.Lock()  # guards _sock and _pending
+        self._write_lock = threading.Lock()
+        self._event_listeners: list[Callable[[dict], None]] = []
+        self.cache: ResponseCache | None = ResponseCache() if cache else None
+        self._inflight: dict[tuple, Future] = {}  # guarded by _lock
+        self.shared_reads = 0
 
     @property
     def connected(self) -> bool:
         return self._sock is not None
 
     def connect(self) -> None:
-        if self._sock:
-            return
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(CONNECT_TIMEOUT)
-            sock.connect((self.host, self.port))
-            sock.settimeout(None)
+        with self._lock:
+            if self._sock:
+                return
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.settimeout(CONNECT_TIMEOUT)
+                sock.connect((self.host, self.port))
+                sock.settimeout(None)
+            except Exception as e:
+                logger.error("Failed to connect to Ableton: %s", e)
+                raise ConnectionError(
+                    f"Cannot connect to Ableton at {self.host}:{self.port}. "
+                    "Is the Remote Script loaded?"
+                ) from e
             self._sock = sock
+            self._reader = threading.Thread(
+                target=self._read_loop, args=(sock,),
+                name="ableton-reader", daemon=True)
+            self._reader.start()
             logger.info("Connected to Ableton at %s:%d", self.host, self.port)
-        except Exception as e:
-            logger.error("Failed to connect to Ableton: %s", e)
-            raise ConnectionError(
-                f"Cannot connect to Ableton at {self.host}:{self.port}. "
-                "Is the Remote Script loaded?"
-            ) from e
 
     def disconnect(self) -> None:
-        if self._sock:
+        with self._lock:
+            sock, self._sock = self._sock, None
+            pending, self._pending = self._pending, {}
+        if sock:
             try:
-                self._sock.close()
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                sock.close()
             except Exception:
                 pass
-            self._sock = None
             logger.info("Disconnected from Ableton")
+        self._fail_pending(pending, ConnectionError("Disconnected from Ableton"))
+
+    def submit(self, action: str, params: dict | None = None) -> Future:
+        """Send a command without waiting for its response.
+
+        Returns a future resolved with the raw response message. Use
+        ``send`` or ``send_many`` to get unwrapped results.
+        """
+        _, future = self._submit(action, params)
+        return future
+
+    def add_event_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call ``callback(event)`` for every subscription event received."""
+        self._event_listeners.append(callback)
+
+    def remove_event_listener(self, callback: Callable[[dict], None]) -> None:
+        self._event_listeners.remove(callback)
 
     def send(self, action: str, params: dict | None = None) -> dict:
         """Send a command and wait for the matching response.
 
         Returns the result dict on success, raises on error.
         """
+        key = self.cache.key(action, params) if self.cache is not None else None
+        if key is not None:  # writes and uncached reads are not lookups
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if action not in SHARED_READS:
+            return self._fetch(action, params)
+
+        flight = _read_key(action, params)
+        with self._lock:
+            shared = self._inflight.get(flight)
+            leader = shared is None
+            if leader:
+                shared = self._inflight[flight] = Future()
+            else:
+                self.shared_reads += 1
+        if not leader:
+            return shared.result()  # the leader's own timeout bounds this
+        try:
+            result = self._fetch(action, params)
+        except BaseException as e:
+            shared.set_exception(e)
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(flight, None)
+
+    def _fetch(self, action: str, params: dict | None) -> dict:
+        """One wire round trip, storing cacheable results."""
+        cache = self.cache
+        key = cache.key(action, params) if cache else None
+        if key is not None:
+            generation = cache.generation
+        request_id, future = self._submit(action, params)
+        response = self._wait(request_id, future)
+        result = _unwrap(self._retry_busy(action, params, response))
+        if key is not None:
+            cache.put(key, result, params, generation)
+        return result
+
+    def send_many(self, commands: list[tuple[str, dict | None]]) -> list[dict]:
+        """Pipeline several commands and return their results in order.
+
+        Every command is written before any response is awaited, so the
+        whole burst costs one round trip instead of one per command.
+        """
+        submitted = [self._submit(action, params) for action, params in commands]
+        results = []
+        for (action, params), (rid, fut) in zip(commands, submitted):
+            response = self._wait(rid, fut)
+            results.append(_unwrap(self._retry_busy(action, params, response)))
+        return results
+
+    def stream(self, action: str, params: dict | None = None) -> Iterator[dict]:
+        """Send a command in chunked mode and yield its frames as they arrive.
+
+        Data frames are ``{"frame", "key", "items"}`` slices of the result's
+        lists, nested ones included; the last frame has ``done`` set and
+        carries the other fields. Raises on error. ``assemble_stream`` rebuilds the result.
+        """
+        request_id, frames = self._submit(action, params, stream=True)
+        attempt = 0
+        try:
+            while True:
+                frame = self._next_frame(request_id, frames)
+                if _is_busy(frame) and attempt < BUSY_RETRIES:
+                    time.sleep(_busy_delay(frame, attempt))
+                    attempt += 1
+                    request_id, frames = self._submit(action, params, stream=True)
+                    continue
+                if _is_final(frame):
+                    request_id = None
+                    _unwrap(frame)
+                yield frame
+                if request_id is None:
+                    return
+        finally:
+            if request_id is not None:
+                # Consumer stopped early: stop routing frames and drop the rest
+                with self._lock:
+                    self._pending.pop(request_id, None)
+                self._cancel(request_id)
+
+    def _next_frame(self, request_id: str, frames: queue.Queue) -> dict:
+        try:
+            frame = frames.get(timeout=COMMAND_TIMEOUT)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Timeout waiting for response to {request_id}"
+            ) from None
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+
+    def _retry_busy(self, action: str, params: dict | None, response: dict) -> dict:
+        """Resend while the Remote Script reports BUSY, backing off each time."""
+        for attempt in range(BUSY_RETRIES):
+            if not _is_busy(response):
+                break
+            time.sleep(_busy_delay(response, attempt))
+            request_id, future = self._submit(action, params)
+            response = self._wait(request_id, future)
+        return response
+
+    def batch(self, commands: list[tuple[str, dict | None]]) -> list[dict]:
+        """Run several commands in one round trip and one Live tick.
+
+        Returns the per-entry ``{ok, result | error, code}`` dicts in order;
+        failed entries are reported, not raised.
+        """
+        result = self.send("batch", _batch_params(commands))
+        return result["results"]
+
+    def _submit(self, action: str, params: dict | None,
+                stream: bool = False) -> tuple[str, Future | queue.Queue]:
         if not self._sock:
             self.connect()
+        if self.cache is not None:
+            self.cache.note_write(action, params)
 
-        request_id = f"req_{uuid.uuid4().hex[:8]}"
-        command = {"id": request_id, "action": action, "params": params or {}}
-        payload = json.dumps(command) + "\n"
+        request_id = _new_request_id()
+        payload = _encode_command(request_id, action, params, stream)
+        waiter: Future | queue.Queue = queue.Queue() if stream else Future()
+
+        with self._lock:
+            sock = self._sock
+            if sock is None:
+                raise ConnectionError("Lost connection to Ableton")
+            self._pending[request_id] = waiter
 
         try:
-            self._sock.sendall(payload.encode("utf-8"))
+            with self._write_lock:
+                sock.sendall(payload)
         except (BrokenPipeError, ConnectionResetError, OSError) as e:
-            self._sock = None
+            self._drop(sock)
             raise ConnectionError(f"Lost connection to Ableton: {e}") from e
 
-        # Read response lines until we find ours
-        response = self._read_response(request_id)
+        return request_id, waiter
 
-        if not response.get("ok", False):
-            error = response.get("error", "Unknown error from Ableton")
-            code = response.get("code", "UNKNOWN")
-            raise RuntimeError(f"[{code}] {error}")
+    def _wait(self, request_id: str, future: Future) -> dict:
+        try:
+            return future.result(timeout=COMMAND_TIMEOUT)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            self._cancel(request_id)
+            raise TimeoutError(
+                f"Timeout waiting for response to {request_id}"
+            ) from None
 
-        return response.get("result", {})
+    def _cancel(self, request_id: str) -> None:
+        """Best effort: ask the Remote Script to drop a request we gave up on."""
+        sock = self._sock
+        if sock is None:
+            return
+        payload = _encode_command(_new_request_id(), "cancel", {"id": request_id})
+        try:
+            with self._write_lock:
+                sock.sendall(payload)
+        except OSError:
+            pass
+
+    # --- Reader thread ---
 
-    def _read_response(self, request_id: str) -> dict:
-        """Read newline-delimited JSON until we find our request_id."""
-        buffer = ""
-        self._sock.settimeout(COMMAND_TIMEOUT)
+    def _read_loop(self, sock: socket.socket) -> None:
+        """Read newline-delimited JSON and resolve the matching futures.
 
+        The buffer grows in place and only newly received bytes are scanned
+        for newlines, so a line of any size costs linear time.
+        """
+        buffer = bytearray()
         try:
             while True:
-                chunk = self._sock.recv(RECV_BUFFER)
+                chunk = sock.recv(RECV_BUFFER)
                 if not chunk:
-                    self._sock = None
-                    raise ConnectionError("Ableton closed the connection")
+                    break
+                scan = len(buffer)
+                buffer += chunk
+                start = 0
+                while (end := buffer.find(b"\n", scan)) >= 0:
+                    line = bytes(buffer[start:end])
+                    if line.strip():
+                        self._dispatch(line)
+                    start = scan = end + 1
+                if start:
+                    del buffer[:start]
+        except OSError as e:
+            logger.debug("Reader stopped: %s", e)
+        finally:
+            self._drop(sock)
+
+    def _dispatch(self, line: bytes) -> None:
+        try:
+            msg = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Invalid JSON from Ableton: %s", line[:200])
+            return
+
+        if _is_event(msg):
+            self._emit_event(msg)
+            return
+
+        request_id = msg.get("id")
+        with self._lock:
+            waiter = self._pending.get(request_id)
+            if waiter is not None and (
+                    not isinstance(waiter, queue.Queue) or _is_final(msg)):
+                del self._pending[request_id]
+        if waiter is None:
+            # Only responses whose caller already timed out end up here
+            logger.debug("No pending request for response %s", request_id)
+            return
+        if isinstance(waiter, queue.Queue):
+            waiter.put(msg)
+        elif not waiter.done():
+            waiter.set_result(msg)
+
+    def _emit_event(self, event: dict) -> None:
+        for callback in list(self._event_listeners):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Event listener failed for %s", event.get("event"))
+
+    def _drop(self, sock: socket.socket) -> None:
+        """Forget a dead socket and fail every request still waiting on it."""
+        with self._lock:
+            if self._sock is not sock:
+                return
+            self._sock = None
+            pending, self._pending = self._pending, {}
+        try:
+            sock.close()
+        except Exception:
+            pass
+        self._fail_pending(pending, ConnectionError("Ableton closed the connection"))
+
+    @staticmethod
+    def _fail_pending(pending: dict[str, Future | queue.Queue],
+                      error: Exception) -> None:
+        for waiter in pending.values():
+            if isinstance(waiter, queue.Queue):
+                waiter.put(error)
+            elif not waiter.done():
+                waiter.set_exception(error)
+
+
+class AsyncAbletonConnection:
+    """asyncio-stream variant of AbletonConnection.
+
+    Same wire protocol and request multiplexing, but waits never block the
+    event loop: concurrent tool calls overlap their round trips instead of
+    queueing behind one blocking ``recv``. Subscription events go to the
+    event listeners, called on the loop, and into a bounded buffer read
+    by ``drain_events``.
+
+    With ``mirror`` set, a LiveMirror answers the reads it covers from
+    memory and is kept current by events (see mirror.py). With ``cache``
+    set, other reads go through a ResponseCache. Identical reads awaited
+    concurrently share one wire request (single flight).
+    """
+
+    def __init__(self, mirror: bool = False, cache: bool = False):
+        self.host = os.environ.get("ABLETON_MCP_HOST", DEFAULT_HOST)
+        self.port = int(os.environ.get("ABLETON_MCP_PORT", DEFAULT_PORT))
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: dict[str, asyncio.Future | asyncio.Queue] = {}
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._event_listeners: list[Callable[[dict], None]] = []
+        self._events: collections.deque[dict] = collections.deque(maxlen=EVENT_BUFFER)
+        self.mirror: LiveMirror | None = LiveMirror() if mirror else None
+        self.cache: ResponseCache | None = ResponseCache() if cache else None
+        self._resync_lock = asyncio.Lock()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.shared_reads = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def connect(self) -> None:
+        async with self._connect_lock:
+            if self._writer:
+                return
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port,
+                                            limit=STREAM_LIMIT),
+                    CONNECT_TIMEOUT)
+            except Exception as e:
+                logger.error("Failed to connect to Ableton: %s", e)
+                raise ConnectionError(
+                    f"Cannot connect to Ableton at {self.host}:{self.port}. "
+                    "Is the Remote Script loaded?"
+                ) from e
+            self._reader, self._writer = reader, writer
+            self._read_task = asyncio.create_task(self._read_loop(reader, writer))
+            logger.info("Connected to Ableton at %s:%d", self.host, self.port)
+
+    async def disconnect(self) -> None:
+        writer, self._writer = self._writer, None
+        task, self._read_task = self._read_task, None
+        self._reader = None
+        pending, self._pending = self._pending, {}
+        if writer:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+            logger.info("Disconnected from Ableton")
+        if self.mirror is not None:
+            self.mirror.invalidate()
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        self._fail_pending(pending, ConnectionError("Disconnected from Ableton"))
+
+    def add_event_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call ``callback(event)`` for every subscription event received."""
+        self._event_listeners.append(callback)
 
-                buffer += chunk.decode("utf-8")
+    def remove_event_listener(self, callback: Callable[[dict], None]) -> None:
+        self._event_listeners.remove(callback)
 
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
+    def drain_events(self) -> list[dict]:
+        """Return and forget the events buffered since the last call."""
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    async def send(self, action: str, params: dict | None = None) -> dict:
+        """Send a command and await the matching response.
+
+        Returns the result dict on success, raises on error.
+        """
+        if self.mirror is not None and action in MIRRORED_ACTIONS:
+            result = await self._from_mirror(action, params)
+            if result is not None:
+                return result
+        key = self.cache.key(action, params) if self.cache is not None else None
+        if key is not None:  # writes and uncached reads are not lookups
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if action not in SHARED_READS:
+            return await self._fetch(action, params)
+
+        flight = _read_key(action, params)
+        task = self._inflight.get(flight)
+        if task is None:
+            # A task, not the caller, owns the request: cancelling one waiter
+            # must not fail the others
+            task = asyncio.ensure_future(self._fetch(action, params))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda t: self._landed(flight, t))
+        else:
+            self.shared_reads += 1
+        return await asyncio.shield(task)
+
+    def _landed(self, flight: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(flight) is task:
+            del self._inflight[flight]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    async def _fetch(self, action: str, params: dict | None) -> dict:
+        """One wire round trip, storing cacheable results."""
+        cache = self.cache
+        key = cache.key(action, params) if cache else None
+        if key is not None:
+            generation = cache.generation
+        request_id, future = await self._submit(action, params)
+        response = await self._wait(request_id, future)
+        result = _unwrap(await self._retry_busy(action, params, response))
+        if key is not None:
+            cache.put(key, result, params, generation)
+        return result
+
+    async def _from_mirror(self, action: str, params: dict | None) -> dict | None:
+        """Answer a read from the mirror, loading a snapshot first if stale."""
+        mirror = self.mirror
+        if mirror.stale and not params:
+            async with self._resync_lock:
+                if mirror.stale:
+                    # Buffer events from here on; load() replays the newer ones
+                    mirror.invalidate()
                     try:
-                        msg = json.loads(line)
-                    except json.JSONDecodeError:
-                        logger.warning("Invalid JSON from Ableton: %s", line[:200])
-                        continue
-
-                    if msg.get("id") == request_id:
-                        return msg
-                    # Not our response — discard (or could queue for other consumers)
-                    logger.debug("Discarding response for %s", msg.get("id"))
-        except socket.timeout:
+                        snapshot = await self.send("get_snapshot", {"subscribe": True})
+                    except RuntimeError as e:
+                        # Remote Script without snapshot support
+                        logger.warning("Live mirror disabled: %s", e)
+                        self.mirror = None
+                        return None
+                    mirror.load(snapshot)
+        return mirror.answer(action, params)
+
+    async def send_many(self, commands: list[tuple[str, dict | None]]) -> list[dict]:
+        """Pipeline several commands and return their results in order."""
+        submitted = [await self._submit(action, params) for action, params in commands]
+        results = []
+        for (action, params), (rid, fut) in zip(commands, submitted):
+            response = await self._wait(rid, fut)
+            results.append(_unwrap(await self._retry_busy(action, params, response)))
+        return results
+
+    async def stream(self, action: str,
+                     params: dict | None = None) -> AsyncIterator[dict]:
+        """Send a command in chunked mode and yield its frames as they arrive.
+
+        Same frames as ``AbletonConnection.stream``.
+        """
+        request_id, frames = await self._submit(action, params, stream=True)
+        attempt = 0
+        try:
+            while True:
+                frame = await self._next_frame(request_id, frames)
+                if _is_busy(frame) and attempt < BUSY_RETRIES:
+                    await asyncio.sleep(_busy_delay(frame, attempt))
+                    attempt += 1
+                    request_id, frames = await self._submit(action, params,
+                                                            stream=True)
+                    continue
+                if _is_final(frame):
+                    request_id = None
+                    _unwrap(frame)
+                yield frame
+                if request_id is None:
+                    return
+        finally:
+            if request_id is not None:
+                self._pending.pop(request_id, None)
+                await self._cancel(request_id)
+
+    async def _next_frame(self, request_id: str, frames: asyncio.Queue) -> dict:
+        try:
+            frame = await asyncio.wait_for(frames.get(), COMMAND_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Timeout waiting for response to {request_id}"
+            ) from None
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+
+    async def _retry_busy(self, action: str, params: dict | None,
+                          response: dict) -> dict:
+        """Resend while the Remote Script reports BUSY, backing off each time."""
+        for attempt in range(BUSY_RETRIES):
+            if not _is_busy(response):
+                break
+            await asyncio.sleep(_busy_delay(response, attempt))
+            request_id, future = await self._submit(action, params)
+            response = await self._wait(request_id, future)
+        return response
+
+    async def batch(self, commands: list[tuple[str, dict | None]]) -> list[dict]:
+        """Run several commands in one round trip and one Live tick."""
+        result = await self.send("batch", _batch_params(commands))
+        return result["results"]
+
+    async def _submit(self, action: str, params: dict | None,
+                      stream: bool = False
+                      ) -> tuple[str, asyncio.Future | asyncio.Queue]:
+        if not self._writer:
+            await self.connect()
+        if self.cache is not None:
+            self.cache.note_write(action, params)
+        if self.mirror is not None:
+            self.mirror.note_write(action, params)
+
+        request_id = _new_request_id()
+        payload = _encode_command(request_id, action, params, stream)
+        waiter = (asyncio.Queue() if stream
+                  else asyncio.get_running_loop().create_future())
+        writer = self._writer
+        self._pending[request_id] = waiter
+
+        try:
+            async with self._write_lock:
+                writer.write(payload)
+                await writer.drain()
+        except (BrokenPipeError, ConnectionResetError, OSError) as e:
+            self._drop(writer)
+            raise ConnectionError(f"Lost connection to Ableton: {e}") from e
+
+        return request_id, waiter
+
+    async def _wait(self, request_id: str, future: asyncio.Future) -> dict:
+        try:
+            return await asyncio.wait_for(future, COMMAND_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._pending.pop(request_id, None)
+            await self._cancel(request_id)
             raise TimeoutError(
                 f"Timeout waiting for response to {request_id}"
-            )
+            ) from None
+
+    async def _cancel(self, request_id: str) -> None:
+        """Best effort: ask the Remote Script to drop a request we gave up on."""
+        writer = self._writer
+        if writer is None:
+            return
+        payload = _encode_command(_new_request_id(), "cancel", {"id": request_id})
+        try:
+            async with self._write_lock:
+                writer.write(payload)
+                await writer.drain()
+        except OSError:
+            pass
+
+    async def _read_loop(self, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    self._dispatch(line)
+        except (OSError, ValueError) as e:
+            logger.debug("Reader stopped: %s", e)
         finally:
-            if self._sock:
-                self._sock.settimeout(None)
+            self._drop(writer)
+
+    def _dispatch(self, line: bytes) -> None:
+        try:
+            msg = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Invalid JSON from Ableton: %s", line[:200])
+            return
+
+        if _is_event(msg):
+            self._emit_event(msg)
+            return
+
+        request_id = msg.get("id")
+        waiter = self._pending.get(request_id)
+        if waiter is None:
+            logger.debug("No pending request for response %s", request_id)
+            return
+        if isinstance(waiter, asyncio.Queue):
+            if _is_final(msg):
+                del self._pending[request_id]
+            waiter.put_nowait(msg)
+            return
+        del self._pending[request_id]
+        if not waiter.done():
+            waiter.set_result(msg)
+
+    def _emit_event(self, event: dict) -> None:
+        if self.mirror is not None:
+            self.mirror.apply(event)
+        if event.get("mirror"):
+            return  # only the mirror asked for it
+        self._events.append(event)
+        for callback in list(self._event_listeners):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Event listener failed for %s", event.get("event"))
+
+    def _drop(self, writer: asyncio.StreamWriter) -> None:
+        """Forget a dead stream and fail every request still waiting on it."""
+        if self._writer is not writer:
+            return
+        self._writer = None
+        self._reader = None
+        pending, self._pending = self._pending, {}
+        if self.mirror is not None:
+            self.mirror.invalidate()
+        writer.close()
+        self._fail_pending(pending, ConnectionError("Ableton closed the connection"))
 
+    @staticmethod
+    def _fail_pending(pending: dict[str, asyncio.Future | asyncio.Queue],
+                      error: Exception) -> None:
+        for waiter in pending.values():
+            if isinstance(waiter, asyncio.Queue):
+                waiter.put_nowait(error)
+            elif not waiter.done():
+                waiter.set_exception(error)
 
-# Module-level singleton
+
+# Module-level singletons
 _connection: AbletonConnection | None = None
+_async_connection: AsyncAbletonConnection | None = None
 
 
 def get_connection() -> AbletonConnection:
     """Get or create the singleton connection."""
     global _connection
     if _connection is None:
-        _connection = AbletonConnection()
+        _connection = AbletonConnection(
+            cache=os.environ.get("ABLETON_MCP_CACHE", "1") != "0")
     if not _connection.connected:
         _connection.connect()
     return _connection
@@ -144,3 +1024,23 @@ def shutdown_connection() -> None:
     if _connection:
         _connection.disconnect()
         _connection = None
+
+
+async def get_async_connection() -> AsyncAbletonConnection:
+    """Get or create the singleton asyncio connection."""
+    global _async_connection
+    if _async_connection is None:
+        _async_connection = AsyncAbletonConnection(
+            mirror=os.environ.get("ABLETON_MCP_MIRROR", "1") != "0",
+            cache=os.environ.get("ABLETON_MCP_CACHE", "1") != "0")
+    if not _async_connection.connected:
+        await _async_connection.connect()
+    return _async_connection
+
+
+async def shutdown_async_connection() -> None:
+    """Cleanly close the asyncio connection."""
+    global _async_connection
+    if _async_connection:
+        await _async_connection.disconnect()
+        _async_connection = None
@@ -0,0 +1,200 @@
+"""In-memory mirror of the Live set, kept current by pushed events.
+
+The mirror loads one ``get_snapshot`` (which also subscribes the connection
+to every topic on every target) and then applies subscription events as
+they arrive. While fresh it answers ``list_tracks``, ``list_scenes`` and
+``get_session_state`` without a round trip; the latter only while stopped,
+since song time is not pushed. Structural changes (tracks or scenes added,
+removed or moved), a reconnect, or MAX_AGE without a resync mark it stale;
+the next mirrored read then reloads the snapshot. So do writes whose effect
+no topic reports (note_write): seeks, return track changes, undo/redo, and
+stopping playback, after which song time has moved.
+"""
+
+import collections
+import time
+
+MAX_AGE = 30.0  # seconds before a full resync, for properties no topic covers
+BACKLOG = 4096  # events held while stale, replayed onto the next snapshot
+
+MIRRORED_ACTIONS = frozenset({"list_tracks", "list_scenes", "get_session_state"})
+
+# Song-level topics stored directly on the session dict
+_SESSION_TOPICS = {
+    "tempo", "is_playing", "record_mode", "metronome", "loop_start",
+    "loop_length", "signature_numerator", "signature_denominator",
+}
+
+# Per-track topic -> field in list_tracks / get_session_state entries
+_TRACK_FIELDS = {
+    "track.name": "name",
+    "track.mute": "muted",
+    "track.solo": "soloed",
+    "track.arm": "armed",
+    "track.volume": "volume",
+}
+
+# Per-scene topic -> field in list_scenes / get_session_state entries
+_SCENE_FIELDS = {
+    "scene.name": "name",
+    "scene.color": "color",
+    "scene.tempo": "tempo",
+}
+
+# Topics whose change shifts indices: only a fresh snapshot is trustworthy
+_STRUCTURAL_TOPICS = {"tracks", "scenes"}
+
+# Writes that change get_session_state fields no topic covers (song time,
+# return tracks), or could change anything
+_UNOBSERVED_WRITES = {"seek", "jump_to_cue", "scroll_to_time", "undo", "redo"}
+
+
+class LiveMirror:
+    """Snapshot of tracks, scenes, clip slots, devices and mixer values."""
+
+    def __init__(self):
+        self.session: dict = {}
+        self.tracks: list[dict] = []
+        self.scenes: list[dict] = []
+        self.mixer: list[dict] = []
+        self.devices: list[list[str]] = []
+        self.clip_slots: list[list[dict]] = []
+        self.synced_at: float | None = None
+        self.events_applied = 0
+        self.hits = 0
+        self._stale = True
+        self._backlog: collections.deque[dict] = collections.deque(maxlen=BACKLOG)
+
+    @property
+    def stale(self) -> bool:
+        return self._stale or self.age > MAX_AGE
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last full snapshot (infinite before the first)."""
+        if self.synced_at is None:
+            return float("inf")
+        return time.monotonic() - self.synced_at
+
+    def invalidate(self) -> None:
+        """Stop answering until the next snapshot, e.g. after a disconnect."""
+        self._stale = True
+
+    def load(self, snapshot: dict) -> None:
+        """Replace the model, then replay events that happened after it.
+
+        Events are tagged with the Remote Script tick that flushed them;
+        those from the snapshot's tick or later were read after it.
+        """
+        self.session = snapshot["session"]
+        self.tracks = snapshot["tracks"]
+        self.scenes = snapshot["scenes"]
+        self.mixer = snapshot["mixer"]
+        self.devices = snapshot["devices"]
+        self.clip_slots = snapshot["clip_slots"]
+        self.synced_at = time.monotonic()
+        self._stale = False
+        backlog, self._backlog = self._backlog, collections.deque(maxlen=BACKLOG)
+        for event in backlog:
+            if event.get("tick", 0) >= snapshot.get("tick", 0):
+                self.apply(event)
+
+    def note_write(self, action: str, params: dict | None) -> None:
+        """Go stale before a write whose effect no event will report."""
+        params = params or {}
+        if action == "batch":
+            for entry in params.get("commands") or ():
+                if isinstance(entry, dict):
+                    self.note_write(entry.get("action", ""), entry.get("params"))
+        elif action in _UNOBSERVED_WRITES or (
+                action == "create_track" and params.get("type") == "return"):
+            self._stale = True
+
+    def apply(self, event: dict) -> None:
+        """Fold one subscription event into the model."""
+        if self._stale:
+            self._backlog.append(event)
+            return
+        topic = event.get("event")
+        params = event.get("params", {})
+        value = event.get("value")
+        try:
+            if topic in _STRUCTURAL_TOPICS or (topic == "is_playing" and not value):
+                # Song time moved while playing and is not pushed
+                self._stale = True
+            elif topic in _SESSION_TOPICS:
+                self._apply_session(topic, value)
+            elif topic in _TRACK_FIELDS:
+                self._apply_track(params["track_index"], _TRACK_FIELDS[topic], value)
+            elif topic == "track.panning":
+                self.mixer[params["track_index"]]["panning"] = value
+            elif topic == "track.devices":
+                self.devices[params["track_index"]] = value
+            elif topic in _SCENE_FIELDS:
+                self._apply_scene(params["scene_index"], _SCENE_FIELDS[topic], value)
+            elif topic.startswith("clip_slot."):
+                slot = self.clip_slots[params["track_index"]][params["scene_index"]]
+                slot[topic[len("clip_slot."):]] = value
+            else:
+                return
+        except (IndexError, KeyError):
+            # Event for a target the snapshot does not know: resync
+            self._stale = True
+            return
+        self.events_applied += 1
+
+    def answer(self, action: str, params: dict | None) -> dict | None:
+        """The result for a mirrored read, or None if it must go to Live."""
+        if params or self.stale:
+            return None
+        if action == "list_tracks":
+            result = {"tracks": [dict(t) for t in self.tracks],
+                      "count": len(self.tracks)}
+        elif action == "list_scenes":
+            result = {"scenes": [dict(s) for s in self.scenes],
+                      "count": len(self.scenes)}
+        elif action == "get_session_state":
+            if self.session.get("is_playing"):
+                return None  # current_song_time moves every tick
+            result = self._session_state()
+        else:
+            return None
+        self.hits += 1
+        return result
+
+    def status(self) -> dict:
+        return {
+            "enabled": True,
+            "stale": self.stale,
+            "age": None if self.synced_at is None else round(self.age, 3),
+            "events_applied": self.events_applied,
+            "hits": self.hits,
+            "tracks": len(self.tracks),
+            "scenes": len(self.scenes),
+        }
+
+    def _apply_session(self, topic: str, value) -> None:
+        self.session[topic] = value
+        if topic.startswith("signature_"):
+            self.session["time_signature"] = "%d/%d" % (
+                self.session["signature_numerator"],
+                self.session["signature_denominator"])
+
+    def _apply_track(self, index: int, field: str, value) -> None:
+        self.tracks[index][field] = value
+        if field == "volume":
+            self.mixer[index]["volume"] = value
+        else:
+            self.session["tracks"][index][field] = value
+
+    def _apply_scene(self, index: int, field: str, value) -> None:
+        self.scenes[index][field] = value
+        if field == "name":
+            self.session["scenes"][index]["name"] = value
+
+    def _session_state(self) -> dict:
+        state = dict(self.session)
+        state["tracks"] = [dict(t) for t in self.session["tracks"]]
+        state["return_tracks"] = [dict(t) for t in self.session["return_tracks"]]
+        state["scenes"] = [dict(s) for s in self.session["scenes"]]
+        return state
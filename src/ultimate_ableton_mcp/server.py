@@ -6,7 +6,8 @@ from typing import AsyncIterator
 
 from mcp.server.fastmcp import FastMCP
 
-from .connection import get_connection, shutdown_connection
+from .browser_cache import get_browser_cache, shutdown_browser_cache
+from .connection import get_async_connection, shutdown_async_connection
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,12 +20,17 @@ logger = logging.getLogger("ultimate-ableton-mcp")
 async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
     """Connect on startup, disconnect on shutdown."""
     try:
-        conn = get_connection()
+        conn = await get_async_connection()
         logger.info("Ableton connection ready (%s:%d)", conn.host, conn.port)
+        cache = get_browser_cache()
+        if cache is not None:
+            # Validate the on-disk browser index before the first search
+            await cache.check(conn)
     except Exception as e:
         logger.warning("Could not connect on startup: %s", e)
     yield {}
-    shutdown_connection()
+    shutdown_browser_cache()
+    await shutdown_async_connection()
     logger.info("Server shut down")
 
 
@@ -1,38 +1,78 @@
 """ableton_browser — Content browser + groove pool."""
 
+import asyncio
 import json
 from ..server import mcp
-from ..connection import get_connection
+from ..browser_cache import get_browser_cache
+from ..connection import get_async_connection
+
+SEARCH_WAIT = 5.0  # seconds a search waits for the index before going partial
 
 
 @mcp.tool()
-def ableton_browser(operation: str, category: str = "all", path: str = "",
-                    track_index: int = 0, uri: str = "") -> str:
+async def ableton_browser(operation: str, category: str = "all", path: str = "",
+                          track_index: int = 0, uri: str = "", query: str = "",
+                          limit: int = 0, offset: int = 0, cursor: str = "",
+                          partial: bool = False) -> str:
     """Content browser and groove pool.
 
     Operations:
-    - get_tree: Browser category tree. Params: category? (instruments/sounds/drums/audio_effects/midi_effects/all)
-    - get_items: Items at path. Params: path
+    - get_tree: Browser category tree, two levels deep. Params: category? (instruments/sounds/drums/audio_effects/midi_effects/all), limit? (children per folder), offset?, cursor?
+    - get_items: One page of the items in a folder. Params: path or uri (a folder from an earlier listing), limit?, offset?, cursor? (next_cursor of the previous page)
     - load_item: Load onto track. Params: track_index, uri
+    - search: Ranked search of item names, folders and URIs; returns uris for load_item. Params: query, category?, limit?, partial? (don't wait for the index to finish building). While Live is still indexing, a search that waits too long returns what is indexed so far, with complete: false
+    - cache_stats: On-disk browser index cache status
     - get_grooves: List groove pool
+    - refresh_index: Rebuild the URI index used by load_item (after installing Packs)
     """
-    conn = get_connection()
+    conn = await get_async_connection()
 
     if operation == "get_tree":
-        result = conn.send("get_browser_tree", {"category": category})
+        result = await conn.send("get_browser_tree", {
+            "category": category, "limit": limit, "offset": offset, "cursor": cursor})
         return json.dumps(result, indent=2)
 
     elif operation == "get_items":
-        result = conn.send("get_browser_items", {"path": path})
+        result = await conn.send("get_browser_items", {
+            "path": path, "uri": uri, "limit": limit, "offset": offset,
+            "cursor": cursor})
         return json.dumps(result, indent=2)
 
     elif operation == "load_item":
-        result = conn.send("load_browser_item",
-                          {"track_index": track_index, "uri": uri})
+        result = await conn.send("load_browser_item",
+                                {"track_index": track_index, "uri": uri})
         return json.dumps(result)
 
+    elif operation == "search":
+        cache = get_browser_cache()
+        result = None
+        if cache is not None:
+            result = await cache.search(
+                conn, query, None if category == "all" else category, limit or 20)
+        if result is None:
+            params = {"query": query, "category": category, "limit": limit or 20}
+            if partial:
+                result = await conn.send("search_browser", {**params, "partial": True})
+            else:
+                try:
+                    result = await asyncio.wait_for(
+                        conn.send("search_browser", params), SEARCH_WAIT)
+                except asyncio.TimeoutError:
+                    # Index still building: settle for what it holds so far
+                    result = await conn.send("search_browser",
+                                             {**params, "partial": True})
+        return json.dumps(result, indent=2)
+
+    elif operation == "cache_stats":
+        cache = get_browser_cache()
+        return json.dumps(cache.stats() if cache else {"enabled": False}, indent=2)
+
     elif operation == "get_grooves":
-        result = conn.send("get_grooves")
+        result = await conn.send("get_grooves")
+        return json.dumps(result, indent=2)
+
+    elif operation == "refresh_index":
+        result = await conn.send("refresh_browser_index")
         return json.dumps(result, indent=2)
 
     else:
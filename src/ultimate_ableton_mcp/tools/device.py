@@ -3,22 +3,31 @@
 import json
 from typing import Any
 from ..server import mcp
-from ..connection import get_connection
+from ..connection import get_async_connection
 
 
 @mcp.tool()
-def ableton_device(operation: str, track_index: int = 0,
-                   device_index: int = 0, param: str | int = 0,
-                   value: float = 0, enabled: bool = True,
-                   preset_index: int = 0, clip_index: int = 0,
-                   param_index: int = 0, time: float = 0) -> str:
+async def ableton_device(operation: str, track_index: int = 0,
+                         device_index: int = 0, param: str | int = 0,
+                         value: float = 0, enabled: bool = True,
+                         preset_index: int = 0, clip_index: int = 0,
+                         param_index: int = 0, time: float = 0,
+                         fuzzy: bool = False,
+                         items: list[list[Any]] | None = None,
+                         track_indices: list[int] | None = None,
+                         class_name: str = "",
+                         times: list[float] | None = None,
+                         values: list[float] | None = None,
+                         tolerance: float = 0.001, clear: bool = False) -> str:
     """Device parameters, presets, automation, and rack chains.
 
     Operations:
     - list: All devices on track. Params: track_index
     - get: Device detail. Params: track_index, device_index
-    - get_param: Read parameter. Params: track_index, device_index, param (index or name)
-    - set_param: Write parameter. Params: track_index, device_index, param, value
+    - get_param: Read parameter. Params: track_index, device_index, param (index or name; case, spacing and unique prefixes are forgiven), fuzzy? (also accept close spellings)
+    - set_param: Write parameter. Params: track_index, device_index, param, value, fuzzy?
+    - set_params: Write many parameters at once, across devices. Params: items (list of [track_index, device_index, param, value]), fuzzy?
+    - dump_parameters: Every device parameter as parallel arrays (device, param, name id into names, value, min, max, quantized). Params: track_indices? (default all), class_name?
     - set_enabled: Enable/disable. Params: track_index, device_index, enabled
     - get_presets / set_preset: Params: track_index, device_index, preset_index?
     - get_chains: Rack chains. Params: track_index, device_index
@@ -27,73 +36,94 @@ def ableton_device(operation: str, track_index: int = 0,
     - clear_automation: Params: track_index, clip_index, device_index, param_index
     - insert_automation_point: Params: track_index, clip_index, device_index, param_index, time, value
     - remove_automation_point: Params: track_index, clip_index, device_index, param_index, time
+    - write_automation_curve: Whole curve in one call; points within tolerance (fraction of the parameter range) of a straight line are dropped. Params: track_index, clip_index, device_index, param_index, times, values, tolerance?, clear? (replace existing points)
     """
-    conn = get_connection()
+    conn = await get_async_connection()
     dev_ref = {"track_index": track_index, "device_index": device_index}
+    param_ref = {**dev_ref, "param": param, **({"fuzzy": True} if fuzzy else {})}
 
     if operation == "list":
-        result = conn.send("list_devices", {"track_index": track_index})
+        result = await conn.send("list_devices", {"track_index": track_index})
         return json.dumps(result, indent=2)
 
     elif operation == "get":
-        result = conn.send("get_device", dev_ref)
+        result = await conn.send("get_device", dev_ref)
         return json.dumps(result, indent=2)
 
     elif operation == "get_param":
-        result = conn.send("get_device_param", {**dev_ref, "param": param})
+        result = await conn.send("get_device_param", param_ref)
         return json.dumps(result)
 
     elif operation == "set_param":
-        result = conn.send("set_device_param",
-                          {**dev_ref, "param": param, "value": value})
+        result = await conn.send("set_device_param", {**param_ref, "value": value})
+        return json.dumps(result)
+
+    elif operation == "set_params":
+        result = await conn.send("set_device_params",
+                                {"items": items or [],
+                                 **({"fuzzy": True} if fuzzy else {})})
+        return json.dumps(result)
+
+    elif operation == "dump_parameters":
+        result = await conn.send("dump_parameters",
+                                {"track_indices": track_indices,
+                                 "class_name": class_name})
         return json.dumps(result)
 
     elif operation == "set_enabled":
-        result = conn.send("set_device_enabled",
-                          {**dev_ref, "enabled": enabled})
+        result = await conn.send("set_device_enabled",
+                                {**dev_ref, "enabled": enabled})
         return json.dumps(result)
 
     elif operation == "get_presets":
-        result = conn.send("get_device_presets", dev_ref)
+        result = await conn.send("get_device_presets", dev_ref)
         return json.dumps(result, indent=2)
 
     elif operation == "set_preset":
-        result = conn.send("set_device_preset",
-                          {**dev_ref, "preset_index": preset_index})
+        result = await conn.send("set_device_preset",
+                                {**dev_ref, "preset_index": preset_index})
         return json.dumps(result)
 
     elif operation == "get_chains":
-        result = conn.send("get_device_chains", dev_ref)
+        result = await conn.send("get_device_chains", dev_ref)
         return json.dumps(result, indent=2)
 
     elif operation == "get_automation":
         auto_ref = {**dev_ref, "clip_index": clip_index,
                     "param_index": param_index}
-        result = conn.send("get_automation", auto_ref)
+        result = await conn.send("get_automation", auto_ref)
         return json.dumps(result, indent=2)
 
     elif operation == "create_automation":
         auto_ref = {**dev_ref, "clip_index": clip_index,
                     "param_index": param_index}
-        result = conn.send("create_automation", auto_ref)
+        result = await conn.send("create_automation", auto_ref)
         return json.dumps(result)
 
     elif operation == "clear_automation":
         auto_ref = {**dev_ref, "clip_index": clip_index,
                     "param_index": param_index}
-        result = conn.send("clear_automation", auto_ref)
+        result = await conn.send("clear_automation", auto_ref)
         return json.dumps(result)
 
     elif operation == "insert_automation_point":
         auto_ref = {**dev_ref, "clip_index": clip_index,
                     "param_index": param_index, "time": time, "value": value}
-        result = conn.send("insert_automation_point", auto_ref)
+        result = await conn.send("insert_automation_point", auto_ref)
         return json.dumps(result)
 
     elif operation == "remove_automation_point":
         auto_ref = {**dev_ref, "clip_index": clip_index,
                     "param_index": param_index, "time": time}
-        result = conn.send("remove_automation_point", auto_ref)
+        result = await conn.send("remove_automation_point", auto_ref)
+        return json.dumps(result)
+
+    elif operation == "write_automation_curve":
+        auto_ref = {**dev_ref, "clip_index": clip_index,
+                    "param_index": param_index, "times": times or [],
+                    "values": values or [], "tolerance": tolerance,
+                    "clear": clear}
+        result = await conn.send("write_automation_curve", auto_ref)
         return json.dumps(result)
 
     else:
@@ -2,13 +2,14 @@
 
 import json
 from ..server import mcp
-from ..connection import get_connection
+from ..connection import get_async_connection
 
 
 @mcp.tool()
-def ableton_session(operation: str, bpm: float = 0, numerator: int = 0,
-                    denominator: int = 0, start: float = 0, length: float = 0,
-                    enabled: bool = False) -> str:
+async def ableton_session(operation: str, bpm: float = 0, numerator: int = 0,
+                          denominator: int = 0, start: float = 0, length: float = 0,
+                          enabled: bool = False, topic: str = "",
+                          track_index: int = -1, scene_index: int = -1) -> str:
     """Global session state: tempo, time signature, loop, metronome, undo/redo.
 
     Operations:
@@ -22,53 +23,85 @@ def ableton_session(operation: str, bpm: float = 0, numerator: int = 0,
     - set_arrangement_overdub: Params: enabled
     - set_session_automation_record: Params: enabled
     - re_enable_automation: Re-enable all automation
+    - subscribe: Push changes of a property instead of polling. Params: topic
+      (tempo, is_playing, record_mode, metronome, tracks, scenes, track.name,
+      track.mute, track.solo, track.arm, track.volume, track.panning,
+      clip_slot.has_clip, clip_slot.playing_status), track_index and
+      scene_index for track./clip_slot. topics
+    - unsubscribe: Params: topic (+ indices); no topic drops every subscription
+    - get_events: Changes pushed since the last call, oldest first
+    - mirror_status: Whether reads are served from the in-memory mirror of
+      the set, and how stale it is
+    - cache_stats: Hit/miss counters of the read cache
     """
-    conn = get_connection()
+    conn = await get_async_connection()
 
     if operation == "get_state":
-        result = conn.send("get_session_state")
+        result = await conn.send("get_session_state")
         return json.dumps(result, indent=2)
 
     elif operation == "set_tempo":
-        result = conn.send("set_tempo", {"bpm": bpm})
+        result = await conn.send("set_tempo", {"bpm": bpm})
         return json.dumps(result)
 
     elif operation == "set_time_signature":
-        result = conn.send("set_time_signature",
-                          {"numerator": numerator, "denominator": denominator})
+        result = await conn.send("set_time_signature",
+                                {"numerator": numerator, "denominator": denominator})
         return json.dumps(result)
 
     elif operation == "set_loop":
-        result = conn.send("set_loop", {"start": start, "length": length})
+        result = await conn.send("set_loop", {"start": start, "length": length})
         return json.dumps(result)
 
     elif operation == "set_metronome":
-        result = conn.send("set_metronome", {"enabled": enabled})
+        result = await conn.send("set_metronome", {"enabled": enabled})
         return json.dumps(result)
 
     elif operation == "tap_tempo":
-        result = conn.send("tap_tempo")
+        result = await conn.send("tap_tempo")
         return json.dumps(result)
 
     elif operation == "undo":
-        result = conn.send("undo")
+        result = await conn.send("undo")
         return json.dumps(result)
 
     elif operation == "redo":
-        result = conn.send("redo")
+        result = await conn.send("redo")
         return json.dumps(result)
 
     elif operation == "set_arrangement_overdub":
-        result = conn.send("set_arrangement_overdub", {"enabled": enabled})
+        result = await conn.send("set_arrangement_overdub", {"enabled": enabled})
         return json.dumps(result)
 
     elif operation == "set_session_automation_record":
-        result = conn.send("set_session_automation_record", {"enabled": enabled})
+        result = await conn.send("set_session_automation_record", {"enabled": enabled})
         return json.dumps(result)
 
     elif operation == "re_enable_automation":
-        result = conn.send("re_enable_automation")
+        result = await conn.send("re_enable_automation")
         return json.dumps(result)
 
+    elif operation in ("subscribe", "unsubscribe"):
+        params = {"topic": topic}
+        if track_index >= 0:
+            params["track_index"] = track_index
+        if scene_index >= 0:
+            params["scene_index"] = scene_index
+        result = await conn.send(operation, params)
+        return json.dumps(result)
+
+    elif operation == "get_events":
+        return json.dumps({"events": conn.drain_events()}, indent=2)
+
+    elif operation == "mirror_status":
+        if conn.mirror is None:
+            return json.dumps({"enabled": False})
+        return json.dumps(conn.mirror.status())
+
+    elif operation == "cache_stats":
+        if conn.cache is None:
+            return json.dumps({"enabled": False})
+        return json.dumps(conn.cache.stats())
+
     else:
         return f"Unknown operation: {operation}"
@@ -1,16 +1,19 @@
 """ableton_track — CRUD, mix, routing."""
 
 import json
+from typing import Any
 from ..server import mcp
-from ..connection import get_connection
+from ..connection import get_async_connection
 
 
 @mcp.tool()
-def ableton_track(operation: str, track_index: int = -1, type: str = "midi",
-                  name: str = "", index: int = -1, value: float = 0,
-                  send_index: int = 0, routing_type: str = "",
-                  channel: str = "", color: int = 0,
-                  enabled: bool = False) -> str:
+async def ableton_track(operation: str, track_index: int = -1, type: str = "midi",
+                        name: str = "", index: int = -1, value: float = 0,
+                        send_index: int = 0, routing_type: str = "",
+                        channel: str = "", color: int = 0,
+                        enabled: bool = False,
+                        changes: list[dict[str, Any]] | None = None,
+                        cells: list[list[float]] | None = None) -> str:
     """Track CRUD, mixing, and routing.
 
     Operations:
@@ -26,93 +29,117 @@ def ableton_track(operation: str, track_index: int = -1, type: str = "midi",
     - set_input_routing / set_output_routing: Params: track_index, routing_type, channel?
     - freeze / flatten: Params: track_index
     - stop_all_clips: Params: track_index
+    - get_mixer: Volume, pan, mute, solo, arm and sends of every track, return
+      and the master, as one array per field
+    - set_mixer: Apply many changes at once, all or none. Params: changes (list of
+      {track_index, kind? (track/return/master), volume?, pan?, mute?, solo?, arm?,
+      sends? ({send_index: value})})
+    - get_send_matrix: All tracks' sends as one row-major array (rows x columns)
+    - set_send_matrix: Write any cells at once, all or none. Params: cells (list of
+      [track_index, send_index, value])
     """
-    conn = get_connection()
+    conn = await get_async_connection()
 
     if operation == "list":
-        result = conn.send("list_tracks")
+        result = await conn.send("list_tracks")
         return json.dumps(result, indent=2)
 
     elif operation == "get":
-        result = conn.send("get_track", {"track_index": track_index})
+        result = await conn.send("get_track", {"track_index": track_index})
         return json.dumps(result, indent=2)
 
     elif operation == "create":
-        result = conn.send("create_track",
-                          {"type": type, "name": name, "index": index})
+        result = await conn.send("create_track",
+                                {"type": type, "name": name, "index": index})
         return json.dumps(result)
 
     elif operation == "delete":
-        result = conn.send("delete_track", {"track_index": track_index})
+        result = await conn.send("delete_track", {"track_index": track_index})
         return json.dumps(result)
 
     elif operation == "duplicate":
-        result = conn.send("duplicate_track", {"track_index": track_index})
+        result = await conn.send("duplicate_track", {"track_index": track_index})
         return json.dumps(result)
 
     elif operation == "rename":
-        result = conn.send("rename_track",
-                          {"track_index": track_index, "name": name})
+        result = await conn.send("rename_track",
+                                {"track_index": track_index, "name": name})
         return json.dumps(result)
 
     elif operation == "set_volume":
-        result = conn.send("set_track_volume",
-                          {"track_index": track_index, "value": value})
+        result = await conn.send("set_track_volume",
+                                {"track_index": track_index, "value": value})
         return json.dumps(result)
 
     elif operation == "set_pan":
-        result = conn.send("set_track_pan",
-                          {"track_index": track_index, "value": value})
+        result = await conn.send("set_track_pan",
+                                {"track_index": track_index, "value": value})
         return json.dumps(result)
 
     elif operation == "set_mute":
-        result = conn.send("set_track_mute",
-                          {"track_index": track_index, "enabled": enabled})
+        result = await conn.send("set_track_mute",
+                                {"track_index": track_index, "enabled": enabled})
         return json.dumps(result)
 
     elif operation == "set_solo":
-        result = conn.send("set_track_solo",
-                          {"track_index": track_index, "enabled": enabled})
+        result = await conn.send("set_track_solo",
+                                {"track_index": track_index, "enabled": enabled})
         return json.dumps(result)
 
     elif operation == "set_arm":
-        result = conn.send("set_track_arm",
-                          {"track_index": track_index, "enabled": enabled})
+        result = await conn.send("set_track_arm",
+                                {"track_index": track_index, "enabled": enabled})
         return json.dumps(result)
 
     elif operation == "set_color":
-        result = conn.send("set_track_color",
-                          {"track_index": track_index, "color": color})
+        result = await conn.send("set_track_color",
+                                {"track_index": track_index, "color": color})
         return json.dumps(result)
 
     elif operation == "set_send":
-        result = conn.send("set_track_send",
-                          {"track_index": track_index,
-                           "send_index": send_index, "value": value})
+        result = await conn.send("set_track_send",
+                                {"track_index": track_index,
+                                 "send_index": send_index, "value": value})
         return json.dumps(result)
 
     elif operation == "set_input_routing":
-        result = conn.send("set_track_input_routing",
-                          {"track_index": track_index,
-                           "routing_type": routing_type, "channel": channel})
+        result = await conn.send("set_track_input_routing",
+                                {"track_index": track_index,
+                                 "routing_type": routing_type, "channel": channel})
         return json.dumps(result)
 
     elif operation == "set_output_routing":
-        result = conn.send("set_track_output_routing",
-                          {"track_index": track_index,
-                           "routing_type": routing_type, "channel": channel})
+        result = await conn.send("set_track_output_routing",
+                                {"track_index": track_index,
+                                 "routing_type": routing_type, "channel": channel})
         return json.dumps(result)
 
     elif operation == "freeze":
-        result = conn.send("freeze_track", {"track_index": track_index})
+        result = await conn.send("freeze_track", {"track_index": track_index})
         return json.dumps(result)
 
     elif operation == "flatten":
-        result = conn.send("flatten_track", {"track_index": track_index})
+        result = await conn.send("flatten_track", {"track_index": track_index})
         return json.dumps(result)
 
     elif operation == "stop_all_clips":
-        result = conn.send("stop_track_clips", {"track_index": track_index})
+        result = await conn.send("stop_track_clips", {"track_index": track_index})
+        return json.dumps(result)
+
+    elif operation == "get_mixer":
+        result = await conn.send("get_mixer")
+        return json.dumps(result)
+
+    elif operation == "set_mixer":
+        result = await conn.send("set_mixer", {"changes": changes or []})
+        return json.dumps(result)
+
+    elif operation == "get_send_matrix":
+        result = await conn.send("get_send_matrix")
+        return json.dumps(result)
+
+    elif operation == "set_send_matrix":
+        result = await conn.send("set_send_matrix", {"cells": cells or []})
         return json.dumps(result)
 
     else:
@@ -2,12 +2,12 @@
 
 import json
 from ..server import mcp
-from ..connection import get_connection
+from ..connection import get_async_connection
 
 
 @mcp.tool()
-def ableton_transport(operation: str, enabled: bool = False, time: float = 0,
-                      direction: str = "next", view: str = "session") -> str:
+async def ableton_transport(operation: str, enabled: bool = False, time: float = 0,
+                            direction: str = "next", view: str = "session") -> str:
     """Playback control and navigation.
 
     Operations:
@@ -18,38 +18,38 @@ def ableton_transport(operation: str, enabled: bool = False, time: float = 0,
     - scroll_to_time: Scroll view. Params: time
     - show_view: Switch view. Params: view (session/arrangement/clip)
     """
-    conn = get_connection()
+    conn = await get_async_connection()
 
     if operation == "play":
-        result = conn.send("start_playback")
+        result = await conn.send("start_playback")
         return json.dumps(result)
 
     elif operation == "stop":
-        result = conn.send("stop_playback")
+        result = await conn.send("stop_playback")
         return json.dumps(result)
 
     elif operation == "continue":
-        result = conn.send("continue_playback")
+        result = await conn.send("continue_playback")
         return json.dumps(result)
 
     elif operation == "record":
-        result = conn.send("set_record", {"enabled": enabled})
+        result = await conn.send("set_record", {"enabled": enabled})
         return json.dumps(result)
 
     elif operation == "seek":
-        result = conn.send("seek", {"time": time})
+        result = await conn.send("seek", {"time": time})
         return json.dumps(result)
 
     elif operation == "jump_to_cue":
-        result = conn.send("jump_to_cue", {"direction": direction})
+        result = await conn.send("jump_to_cue", {"direction": direction})
         return json.dumps(result)
 
     elif operation == "scroll_to_time":
-        result = conn.send("scroll_to_time", {"time": time})
+        result = await conn.send("scroll_to_time", {"time": time})
         return json.dumps(result)
 
     elif operation == "show_view":
-        result = conn.send("show_view", {"view": view})
+        result = await conn.send("show_view", {"view": view})
         return json.dumps(result)
 
     else:
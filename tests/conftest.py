@@ -48,6 +48,8 @@ class FakeAbletonServer:
         self._thread = None
         self._running = False
         self._handler = None  # callable(request_dict) -> result_dict
+        self.error_code = "HANDLER_ERROR"  # code sent when the handler raises
+        self.stream_chunk = 2  # list items per frame for streamed requests
 
     @property
     def actual_port(self):
@@ -119,10 +121,14 @@ class FakeAbletonServer:
                         response = {"id": request_id, "ok": True, "result": result}
                     except Exception as e:
                         response = {"id": request_id, "ok": False,
-                                    "error": str(e), "code": "HANDLER_ERROR"}
-
-                    resp_line = json.dumps(response) + "\n"
-                    client.sendall(resp_line.encode("utf-8"))
+                                    "error": str(e), "code": self.error_code}
+
+                    if request.get("stream"):
+                        messages = self._frames(response)
+                    else:
+                        messages = [response]
+                    client.sendall("".join(
+                        json.dumps(m) + "\n" for m in messages).encode("utf-8"))
         except Exception:
             pass
         finally:
@@ -132,6 +138,24 @@ class FakeAbletonServer:
                 pass
 
 
+    def _frames(self, response):
+        """Split a response the way the Remote Script's stream mode does."""
+        if not response["ok"]:
+            return [dict(response, done=True)]
+        frames, summary = [], {}
+        for key, value in response["result"].items():
+            if not isinstance(value, list) or not value:
+                summary[key] = value
+                continue
+            for start in range(0, len(value), self.stream_chunk):
+                frames.append({"id": response["id"], "ok": True,
+                               "frame": len(frames), "key": key,
+                               "items": value[start:start + self.stream_chunk]})
+        frames.append({"id": response["id"], "ok": True, "done": True,
+                       "frames": len(frames), "result": summary})
+        return frames
+
+
 @pytest.fixture
 def fake_server():
     """A FakeAbletonServer that starts/stops around the test."""
@@ -6,7 +6,35 @@ Extracted from conftest.py so test modules can import directly.
 from unittest.mock import MagicMock
 
 
-class MockParam:
+class MockListenable:
+    """Live-style add_/remove_<prop>_listener and <prop>_has_listener.
+
+    Assigning a listened-to attribute calls its listeners, as Live does.
+    """
+
+    def __getattr__(self, name):
+        listeners = self.__dict__.setdefault("_listeners", {})
+        if name.endswith("_has_listener"):
+            prop = name[:-len("_has_listener")]
+            return lambda cb: cb in listeners.get(prop, [])
+        if name.startswith("add_") and name.endswith("_listener"):
+            prop = name[len("add_"):-len("_listener")]
+            return lambda cb: listeners.setdefault(prop, []).append(cb)
+        if name.startswith("remove_") and name.endswith("_listener"):
+            prop = name[len("remove_"):-len("_listener")]
+            return lambda cb: listeners[prop].remove(cb)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        self._notify(name)
+
+    def _notify(self, prop):
+        for cb in list(self.__dict__.get("_listeners", {}).get(prop, ())):
+            cb()
+
+
+class MockParam(MockListenable):
     """Simulates a Live DeviceParameter."""
 
     def __init__(self, name="Volume", value=0.85, min_val=0.0, max_val=1.0,
@@ -28,7 +56,7 @@ class MockMixerDevice:
         self.sends = [MockParam("Send A", 0.0), MockParam("Send B", 0.0)]
 
 
-class MockDevice:
+class MockDevice(MockListenable):
     """Simulates a Live Device."""
 
     def __init__(self, name="Simpler", class_name="OriginalSimpler"):
@@ -97,12 +125,13 @@ class MockEnvelope:
         self.points = [(t, v) for t, v in self.points if t != time]
 
 
-class MockClipSlot:
+class MockClipSlot(MockListenable):
     """Simulates a Live ClipSlot."""
 
     def __init__(self, has_clip=False, clip=None):
         self.has_clip = has_clip
         self.clip = clip
+        self.playing_status = 0
         self._fired = False
         self._stopped = False
 
@@ -116,9 +145,11 @@ class MockClipSlot:
 
     def fire(self):
         self._fired = True
+        self.playing_status = 1
 
     def stop(self):
         self._stopped = True
+        self.playing_status = 0
 
     def duplicate_clip_to(self, target):
         if self.clip:
@@ -133,7 +164,7 @@ class MockRoutingType:
         self.display_name = name
 
 
-class MockTrack:
+class MockTrack(MockListenable):
     """Simulates a Live Track."""
 
     def __init__(self, name="Track 1", is_midi=True, num_scenes=8):
@@ -168,7 +199,7 @@ class MockTrack:
         pass
 
 
-class MockScene:
+class MockScene(MockListenable):
     """Simulates a Live Scene."""
 
     def __init__(self, name="Scene 1"):
@@ -195,7 +226,7 @@ class MockView:
         self.selected_track = None
 
 
-class MockSong:
+class MockSong(MockListenable):
     """Simulates a Live Song."""
 
     def __init__(self):
@@ -213,6 +244,7 @@ class MockSong:
         self.tracks = [MockTrack("Track 1", is_midi=True),
                        MockTrack("Track 2", is_midi=False)]
         self.return_tracks = [MockTrack("Return A")]
+        self.master_track = MockTrack("Master")
         self.scenes = [MockScene("Scene 1"), MockScene("Scene 2")]
         self.groove_pool = MockGroovePool()
         self.view = MockView()
@@ -247,6 +279,7 @@ class MockSong:
             self.tracks.append(t)
         else:
             self.tracks.insert(index, t)
+        self._notify("tracks")
 
     def create_audio_track(self, index=-1):
         t = MockTrack("New Audio", is_midi=False)
@@ -254,26 +287,32 @@ class MockSong:
             self.tracks.append(t)
         else:
             self.tracks.insert(index, t)
+        self._notify("tracks")
 
     def create_return_track(self):
         self.return_tracks.append(MockTrack("New Return"))
 
     def delete_track(self, index):
         del self.tracks[index]
+        self._notify("tracks")
 
     def duplicate_track(self, index):
         t = MockTrack(self.tracks[index].name + " Copy")
         self.tracks.insert(index + 1, t)
+        self._notify("tracks")
 
     def create_scene(self, index):
         self.scenes.insert(index, MockScene("New Scene"))
+        self._notify("scenes")
 
     def delete_scene(self, index):
         del self.scenes[index]
+        self._notify("scenes")
 
     def duplicate_scene(self, index):
         s = MockScene(self.scenes[index].name + " Copy")
         self.scenes.insert(index + 1, s)
+        self._notify("scenes")
 
     def jump_to_next_cue(self):
         pass
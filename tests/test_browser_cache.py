@@ -0,0 +1,163 @@
+"""Tests for the on-disk browser index cache."""
+
+import json
+
+import pytest
+
+from ultimate_ableton_mcp import browser_cache as browser_cache_module
+from ultimate_ableton_mcp.browser_cache import BrowserCache
+from ultimate_ableton_mcp.connection import AsyncAbletonConnection
+
+ENTRIES = [
+    ["query:Synths#Operator", "instruments/Operator", True],
+    ["query:Synths#Op:Pluck", "instruments/Operator/Bass Operator Pluck", True],
+    ["query:Synths#Wavetable", "instruments/Wavetable", True],
+    ["query:Drums#Kicks", "drums/Kicks", False],
+    ["query:Drums#Kick808", "drums/Kicks/Kick 808 Long.wav", True],
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = BrowserCache(str(tmp_path / "browser.sqlite"))
+    yield cache
+    cache.close()
+
+
+class TestStorage:
+    def test_store_and_lookup(self, cache):
+        assert cache.store("12.1.0", "abc", ENTRIES)["added"] == 5
+        results = cache.lookup("operator")
+        assert results[0]["uri"] == "query:Synths#Operator"
+        assert results[0]["category"] == "instruments"
+        assert {r["name"] for r in results} == {"Operator", "Bass Operator Pluck"}
+
+    def test_prefix_and_every_word(self, cache):
+        cache.store("12.1.0", "abc", ENTRIES)
+        assert [r["name"] for r in cache.lookup("wave")] == ["Wavetable"]
+        assert [r["uri"] for r in cache.lookup("kick 808")] == ["query:Drums#Kick808"]
+        assert cache.lookup("ick") == []  # matches start words only
+
+    def test_category_and_limit(self, cache):
+        cache.store("12.1.0", "abc", ENTRIES)
+        assert cache.lookup("kick", category="instruments") == []
+        assert len(cache.lookup("kick", category="drums")) == 2
+        assert len(cache.lookup("operator", limit=1)) == 1
+
+    def test_best_match_ranked_among_many(self, cache):
+        samples = [[f"query:Samples#Kick{i}", f"samples/Kick Sample {i}.wav", True]
+                   for i in range(1000)]
+        cache.store("12.1.0", "abc", samples + [["query:Drums#Kick", "drums/Kick", True]])
+        assert cache.lookup("kick", limit=1)[0]["uri"] == "query:Drums#Kick"
+
+    def test_store_merges_changes(self, cache):
+        cache.store("12.1.0", "abc", ENTRIES)
+        changed = ENTRIES[1:] + [["query:New", "sounds/New Pad", True]]
+        changed[0] = ["query:Synths#Op:Pluck", "instruments/Operator/Pluck", True]
+        assert cache.store("12.1.0", "def", changed) == {
+            "added": 1, "changed": 1, "removed": 1, "items": 5}
+        assert cache.lookup("operator")[0]["name"] == "Pluck"
+
+    def test_matches_version_and_fingerprint(self, cache):
+        assert cache.matches("12.1.0", "abc") is False
+        cache.store("12.1.0", "abc", ENTRIES)
+        assert cache.matches("12.1.0", "abc") is True
+        assert cache.matches("12.2.0", "abc") is False
+        assert cache.matches("12.1.0", "xyz") is False
+
+    def test_persists_across_opens(self, tmp_path):
+        path = str(tmp_path / "browser.sqlite")
+        first = BrowserCache(path)
+        first.store("12.1.0", "abc", ENTRIES)
+        first.close()
+        second = BrowserCache(path)
+        assert second.matches("12.1.0", "abc")
+        assert second.stats()["items"] == 5
+        second.close()
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("ABLETON_MCP_BROWSER_CACHE", "0")
+        monkeypatch.setattr(browser_cache_module, "_cache", None)
+        assert browser_cache_module.get_browser_cache() is None
+
+
+class TestSession:
+    @staticmethod
+    def _live(fake_server, fingerprint="abc", entries=ENTRIES):
+        seen = []
+
+        def handler(req):
+            seen.append(req["action"])
+            tag = {"live_version": "12.1.0", "fingerprint": fingerprint}
+            if req["action"] == "get_browser_fingerprint":
+                return tag
+            if req["action"] == "get_browser_index":
+                return dict(tag, items=entries, count=len(entries))
+            return {"results": [], "count": 0, "complete": True}
+
+        fake_server.start(handler=handler)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        return conn, seen
+
+    async def test_cold_cache_defers_to_live_then_syncs(self, cache, fake_server):
+        conn, seen = self._live(fake_server)
+        assert await cache.search(conn, "operator") is None
+        await cache._revalidation
+        assert seen == ["get_browser_fingerprint", "get_browser_index"]
+        assert cache.fresh is True
+        result = await cache.search(conn, "operator")
+        assert result["source"] == "disk"
+        assert result["results"][0]["name"] == "Operator"
+        await conn.disconnect()
+
+    async def test_warm_cache_answers_immediately(self, cache, fake_server):
+        cache.store("12.1.0", "abc", ENTRIES)
+        conn, seen = self._live(fake_server)
+        result = await cache.search(conn, "kick 808")
+        assert result["count"] == 1
+        assert seen[0] == "get_browser_fingerprint"  # no wait for the index
+        sync = await cache._revalidation  # still revalidated once per session
+        assert sync == {"added": 0, "changed": 0, "removed": 0, "items": 5}
+        assert cache.hits == 1
+        await conn.disconnect()
+
+    async def test_changed_library_is_not_served(self, cache, fake_server):
+        cache.store("12.1.0", "old", ENTRIES)
+        conn, _ = self._live(fake_server, fingerprint="new")
+        assert await cache.search(conn, "operator") is None
+        await cache._revalidation
+        assert cache.matches("12.1.0", "new")
+        await conn.disconnect()
+
+    async def test_old_remote_script(self, cache, fake_server):
+        def handler(req):
+            raise ValueError("Unknown action: %s" % req["action"])
+
+        fake_server.start(handler=handler)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        assert await cache.search(conn, "operator") is None
+        assert cache._revalidation is None
+        assert json.dumps(cache.stats())
+        await conn.disconnect()
+
+    async def test_revalidate_retries_after_timeout(self, cache):
+        class SlowThenReady:
+            calls = 0
+
+            async def stream(self, action):
+                self.calls += 1
+                if self.calls == 1:
+                    raise TimeoutError("Timeout waiting for response")
+                yield {"done": True, "frames": 0, "result": {
+                    "live_version": "12.1.0", "fingerprint": "abc",
+                    "items": ENTRIES, "count": len(ENTRIES)}}
+
+        conn = SlowThenReady()
+        sync = await cache.revalidate(conn)
+        assert conn.calls == 2
+        assert sync["added"] == 5
+        assert cache.fresh is True
@@ -1,5 +1,6 @@
 """Tests for the TCP connection manager."""
 
+import asyncio
 import json
 import os
 import socket
@@ -11,9 +12,15 @@ import pytest
 
 from ultimate_ableton_mcp.connection import (
     AbletonConnection,
+    AsyncAbletonConnection,
+    CACHE_TTLS,
     DEFAULT_HOST,
+    ResponseCache,
     DEFAULT_PORT,
+    assemble_stream,
+    get_async_connection,
     get_connection,
+    shutdown_async_connection,
     shutdown_connection,
 )
 
@@ -252,3 +259,718 @@ class TestSingletonConnection:
             c2 = get_connection()
             assert c2 is not c1
             shutdown_connection()
+
+
+class _Busy(Exception):
+    pass
+
+
+class TestPipelinedConnection:
+    """Test multiplexing several in-flight requests over one socket."""
+
+    @staticmethod
+    def _reverse_order_server(n_requests):
+        """Accept one client, read n requests, answer them in reverse order."""
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_sock.bind(("localhost", 0))
+        server_sock.listen(1)
+
+        def serve():
+            server_sock.settimeout(5.0)
+            client, _ = server_sock.accept()
+            buffer = b""
+            requests = []
+            while len(requests) < n_requests:
+                buffer += client.recv(65536)
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    requests.append(json.loads(line))
+            for req in reversed(requests):
+                resp = {"id": req["id"], "ok": True,
+                        "result": {"action": req["action"]}}
+                client.sendall((json.dumps(resp) + "\n").encode("utf-8"))
+            time.sleep(0.2)
+            client.close()
+            server_sock.close()
+
+        t = threading.Thread(target=serve, daemon=True)
+        t.start()
+        return server_sock.getsockname()[1], t
+
+    def test_out_of_order_responses_are_routed(self):
+        port, t = self._reverse_order_server(3)
+        conn = AbletonConnection()
+        conn.host = "localhost"
+        conn.port = port
+        results = conn.send_many([("a", None), ("b", None), ("c", {"x": 1})])
+        assert [r["action"] for r in results] == ["a", "b", "c"]
+        t.join(timeout=2.0)
+        conn.disconnect()
+
+    def test_submit_returns_future(self, fake_server):
+        fake_server.start(handler=lambda req: {"echo": req["params"]["n"]})
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        futures = [conn.submit("ping", {"n": i}) for i in range(5)]
+        msgs = [f.result(timeout=2.0) for f in futures]
+        assert [m["result"]["echo"] for m in msgs] == list(range(5))
+        assert conn._pending == {}
+        conn.disconnect()
+
+    def test_batch_sends_one_command(self, fake_server):
+        captured = []
+
+        def batch_handler(req):
+            captured.append(req)
+            return {"results": [{"ok": True, "result": {}}
+                                for _ in req["params"]["commands"]]}
+
+        fake_server.start(handler=batch_handler)
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        results = conn.batch([("set_track_volume", {"track_index": 0, "value": 0.5}),
+                              ("undo", None)])
+        assert len(results) == 2
+        assert len(captured) == 1
+        assert captured[0]["action"] == "batch"
+        assert captured[0]["params"]["commands"][1] == {"action": "undo", "params": {}}
+        conn.disconnect()
+
+    def test_busy_is_retried_with_backoff(self, fake_server, monkeypatch):
+        monkeypatch.setattr("ultimate_ableton_mcp.connection.BUSY_BACKOFF", 0.01)
+        attempts = []
+
+        def busy_twice(req):
+            attempts.append(time.monotonic())
+            if len(attempts) <= 2:
+                raise _Busy()
+            return {"done": True}
+
+        fake_server.start(handler=busy_twice)
+        fake_server.error_code = "BUSY"
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        assert conn.send("set_tempo", {"bpm": 100}) == {"done": True}
+        assert len(attempts) == 3
+        conn.disconnect()
+
+    def test_busy_gives_up_after_retries(self, fake_server, monkeypatch):
+        monkeypatch.setattr("ultimate_ableton_mcp.connection.BUSY_BACKOFF", 0.001)
+        monkeypatch.setattr("ultimate_ableton_mcp.connection.BUSY_RETRIES", 2)
+        attempts = []
+
+        def always_busy(req):
+            attempts.append(req)
+            raise _Busy()
+
+        fake_server.start(handler=always_busy)
+        fake_server.error_code = "BUSY"
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        with pytest.raises(RuntimeError, match="BUSY"):
+            conn.send("set_tempo", {"bpm": 100})
+        assert len(attempts) == 3
+        conn.disconnect()
+
+    def test_concurrent_threads_share_connection(self, fake_server):
+        fake_server.start(handler=lambda req: {"n": req["params"]["n"]})
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        conn.connect()
+
+        results = {}
+
+        def worker(n):
+            results[n] = conn.send("ping", {"n": n})["n"]
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5.0)
+        assert results == {i: i for i in range(20)}
+        conn.disconnect()
+
+    def test_server_close_fails_pending(self):
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.bind(("localhost", 0))
+        server_sock.listen(1)
+
+        def accept_and_close():
+            client, _ = server_sock.accept()
+            client.recv(65536)
+            client.close()
+            server_sock.close()
+
+        t = threading.Thread(target=accept_and_close, daemon=True)
+        t.start()
+
+        conn = AbletonConnection()
+        conn.host = "localhost"
+        conn.port = server_sock.getsockname()[1]
+        with pytest.raises(ConnectionError):
+            conn.send("never_answered")
+        assert conn.connected is False
+        t.join(timeout=2.0)
+
+    def test_timeout_clears_pending(self, fake_server, monkeypatch):
+        monkeypatch.setattr("ultimate_ableton_mcp.connection.COMMAND_TIMEOUT", 0.2)
+        seen = []
+
+        def slow_handler(req):
+            seen.append(req)
+            if req["action"] == "slow":
+                time.sleep(0.5)
+            return {}
+
+        fake_server.start(handler=slow_handler)
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        with pytest.raises(TimeoutError):
+            conn.send("slow")
+        assert conn._pending == {}
+        assert seen[0]["timeout"] == 0.2
+
+        # Giving up sends a cancel for the abandoned request
+        time.sleep(0.5)
+        assert seen[1]["action"] == "cancel"
+        assert seen[1]["params"]["id"] == seen[0]["id"]
+        conn.disconnect()
+
+
+class TestStreamedResponses:
+    """Test chunked replies delivered as an iterator of frames."""
+
+    def _connect(self, fake_server, handler):
+        fake_server.start(handler=handler)
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        return conn
+
+    def test_frames_arrive_in_order(self, fake_server):
+        conn = self._connect(fake_server, lambda req: {
+            "notes": list(range(5)), "clip_name": "Bass"})
+        frames = list(conn.stream("get_clip_notes", {"track_index": 0}))
+        assert [f.get("items") for f in frames[:-1]] == [[0, 1], [2, 3], [4]]
+        assert frames[-1]["done"] is True
+        assert frames[-1]["result"] == {"clip_name": "Bass"}
+        conn.disconnect()
+
+    def test_assemble_rebuilds_result(self, fake_server):
+        result = {"notes": list(range(7)), "tracks": [], "tempo": 120.0}
+        conn = self._connect(fake_server, lambda req: result)
+        assert assemble_stream(conn.stream("get_clip_notes")) == result
+        conn.disconnect()
+
+    def test_stream_flag_is_sent(self, fake_server):
+        seen = []
+        conn = self._connect(fake_server, lambda req: seen.append(req) or {})
+        list(conn.stream("get_session_state"))
+        conn.send("get_session_state")
+        assert seen[0]["stream"] is True
+        assert "stream" not in seen[1]
+        conn.disconnect()
+
+    def test_error_frame_raises(self, fake_server):
+        def error_handler(req):
+            raise ValueError("No clip in slot")
+
+        conn = self._connect(fake_server, error_handler)
+        with pytest.raises(RuntimeError, match="No clip in slot"):
+            list(conn.stream("get_clip_notes"))
+        assert conn._pending == {}
+        conn.disconnect()
+
+    def test_early_exit_forgets_request(self, fake_server):
+        conn = self._connect(fake_server, lambda req: {"notes": list(range(10))})
+        frames = conn.stream("get_clip_notes")
+        next(frames)
+        frames.close()
+        assert conn._pending == {}
+        # The connection keeps working for later requests
+        assert conn.send("get_clip_notes")["notes"] == list(range(10))
+        conn.disconnect()
+
+    def test_huge_line_is_read(self, fake_server):
+        conn = self._connect(fake_server, lambda req: {"blob": "x" * 4000000})
+        assert len(conn.send("get_browser_tree")["blob"]) == 4000000
+        conn.disconnect()
+
+    async def test_async_stream(self, fake_server):
+        fake_server.start(handler=lambda req: {"notes": list(range(5)), "n": 5})
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        frames = [f async for f in conn.stream("get_clip_notes")]
+        assert len(frames) == 4
+        assert assemble_stream(frames) == {"notes": list(range(5)), "n": 5}
+        assert conn._pending == {}
+        await conn.disconnect()
+
+
+class TestSubscriptionEvents:
+    """Test unsolicited event frames routed to listeners."""
+
+    @staticmethod
+    def _event_server(events):
+        """Push `events` before answering the first request."""
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_sock.bind(("localhost", 0))
+        server_sock.listen(1)
+
+        def serve():
+            server_sock.settimeout(5.0)
+            client, _ = server_sock.accept()
+            buffer = b""
+            while b"\n" not in buffer:
+                buffer += client.recv(65536)
+            req = json.loads(buffer.split(b"\n", 1)[0])
+            lines = [json.dumps(e) for e in events]
+            lines.append(json.dumps({"id": req["id"], "ok": True, "result": {}}))
+            client.sendall(("\n".join(lines) + "\n").encode("utf-8"))
+            time.sleep(0.2)
+            client.close()
+            server_sock.close()
+
+        threading.Thread(target=serve, daemon=True).start()
+        return server_sock.getsockname()[1]
+
+    EVENTS = [{"event": "tempo", "params": {}, "value": 128.0},
+              {"event": "track.mute", "params": {"track_index": 0}, "value": True}]
+
+    def test_listener_receives_events(self):
+        conn = AbletonConnection()
+        conn.host = "localhost"
+        conn.port = self._event_server(self.EVENTS)
+        received = []
+        conn.add_event_listener(received.append)
+        assert conn.send("subscribe", {"topic": "tempo"}) == {}
+        assert received == self.EVENTS
+        conn.disconnect()
+
+    def test_failing_listener_does_not_break_reader(self):
+        conn = AbletonConnection()
+        conn.host = "localhost"
+        conn.port = self._event_server(self.EVENTS)
+
+        def broken(event):
+            raise ValueError("listener bug")
+
+        conn.add_event_listener(broken)
+        assert conn.send("subscribe", {"topic": "tempo"}) == {}
+        conn.remove_event_listener(broken)
+        conn.disconnect()
+
+    async def test_async_events_are_buffered(self):
+        conn = AsyncAbletonConnection()
+        conn.host = "localhost"
+        conn.port = self._event_server(self.EVENTS)
+        received = []
+        conn.add_event_listener(received.append)
+        await conn.send("subscribe", {"topic": "tempo"})
+        assert received == self.EVENTS
+        assert conn.drain_events() == self.EVENTS
+        assert conn.drain_events() == []
+        await conn.disconnect()
+
+
+class TestResponseCache:
+    """Test the read-through cache and its write invalidation."""
+
+    @staticmethod
+    def _fill(cache, action, params, result):
+        key = cache.key(action, params)
+        cache.put(key, result, params, cache.generation)
+        return key
+
+    def test_reads_only(self):
+        cache = ResponseCache()
+        assert cache.key("set_tempo", {"bpm": 120}) is None
+        assert cache.key("get_session_state", {}) is None
+        assert cache.key("list_tracks", None) == cache.key("list_tracks", {})
+
+    def test_key_ignores_param_order(self):
+        cache = ResponseCache()
+        assert (cache.key("get_device", {"track_index": 0, "device_index": 1})
+                == cache.key("get_device", {"device_index": 1, "track_index": 0}))
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        key = cache.key("list_tracks", {})
+        assert cache.get(key) is None
+        self._fill(cache, "list_tracks", {}, {"count": 2})
+        assert cache.get(key) == {"count": 2}
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self, monkeypatch):
+        monkeypatch.setitem(CACHE_TTLS, "list_tracks", 0.0)
+        cache = ResponseCache()
+        key = self._fill(cache, "list_tracks", {}, {"count": 2})
+        assert cache.get(key) is None
+
+    def test_incomplete_result_not_stored(self):
+        cache = ResponseCache()
+        params = {"query": "kick", "partial": True}
+        key = self._fill(cache, "search_browser", params,
+                         {"results": [], "complete": False})
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        a = self._fill(cache, "get_track", {"track_index": 0}, {"n": 0})
+        b = self._fill(cache, "get_track", {"track_index": 1}, {"n": 1})
+        cache.get(a)  # a is now most recently used
+        self._fill(cache, "get_track", {"track_index": 2}, {"n": 2})
+        assert cache.get(a) == {"n": 0}
+        assert cache.get(b) is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_scoped_invalidation(self):
+        cache = ResponseCache()
+        listed = self._fill(cache, "list_tracks", {}, {"count": 2})
+        t0 = self._fill(cache, "get_track", {"track_index": 0}, {"n": 0})
+        t1 = self._fill(cache, "get_track", {"track_index": 1}, {"n": 1})
+        scenes = self._fill(cache, "list_scenes", {}, {"count": 2})
+        cache.note_write("set_track_volume", {"track_index": 1, "volume": 0.5})
+        assert cache.get(listed) is None
+        assert cache.get(t1) is None
+        assert cache.get(t0) == {"n": 0}
+        assert cache.get(scenes) == {"count": 2}
+        assert cache.stats()["invalidations"] == 2
+
+    def test_bulk_mixer_write_drops_every_track_read(self):
+        cache = ResponseCache()
+        mixer = self._fill(cache, "get_mixer", {}, {"tracks": {}})
+        t0 = self._fill(cache, "get_track", {"track_index": 0}, {"n": 0})
+        scenes = self._fill(cache, "list_scenes", {}, {"count": 2})
+        cache.note_write("set_mixer", {"changes": [{"track_index": 3}]})
+        assert cache.get(mixer) is None
+        assert cache.get(t0) is None
+        assert cache.get(scenes) == {"count": 2}
+
+    @pytest.mark.parametrize("action", ["create_clip", "delete_clip", "rename_clip",
+                                        "set_clip_loop", "add_clip_notes"])
+    def test_clip_writes_drop_their_track(self, action):
+        cache = ResponseCache()
+        t0 = self._fill(cache, "get_track", {"track_index": 0}, {"n": 0})
+        t1 = self._fill(cache, "get_track", {"track_index": 1}, {"n": 1})
+        cache.note_write(action, {"track_index": 0, "scene_index": 0})
+        assert cache.get(t0) is None
+        assert cache.get(t1) == {"n": 1}
+
+    @pytest.mark.parametrize("action", ["fire_clip", "stop_clip", "fire_scene",
+                                        "stop_track_clips", "stop_playback"])
+    def test_playing_state_drops_every_track(self, action):
+        cache = ResponseCache()
+        t1 = self._fill(cache, "get_track", {"track_index": 1}, {"n": 1})
+        cache.note_write(action, {"track_index": 0, "scene_index": 0})
+        assert cache.get(t1) is None
+
+    def test_unmapped_write_clears_everything(self):
+        cache = ResponseCache()
+        self._fill(cache, "list_tracks", {}, {"count": 2})
+        self._fill(cache, "get_grooves", {}, {"grooves": []})
+        cache.note_write("delete_track", {"track_index": 0})
+        assert cache.stats()["entries"] == 0
+
+    def test_reads_do_not_invalidate(self):
+        cache = ResponseCache()
+        key = self._fill(cache, "list_tracks", {}, {"count": 2})
+        cache.note_write("get_session_state", {})
+        cache.note_write("get_track", {"track_index": 0})
+        assert cache.get(key) == {"count": 2}
+
+    def test_batch_invalidates_each_entry(self):
+        cache = ResponseCache()
+        t0 = self._fill(cache, "get_track", {"track_index": 0}, {"n": 0})
+        s0 = self._fill(cache, "get_scene", {"scene_index": 0}, {"n": 0})
+        grooves = self._fill(cache, "get_grooves", {}, {"grooves": []})
+        cache.note_write("batch", {"commands": [
+            {"action": "set_track_mute", "params": {"track_index": 0}},
+            {"action": "rename_scene", "params": {"scene_index": 0}},
+        ]})
+        assert cache.get(t0) is None
+        assert cache.get(s0) is None
+        assert cache.get(grooves) == {"grooves": []}
+
+    def test_read_racing_a_write_is_not_stored(self):
+        cache = ResponseCache()
+        key = cache.key("list_tracks", {})
+        generation = cache.generation
+        cache.note_write("set_track_name", {})
+        cache.put(key, {"count": 2}, {}, generation)
+        assert cache.get(key) is None
+
+    def test_connection_serves_repeat_reads(self, fake_server):
+        seen = []
+        fake_server.start(handler=lambda req: seen.append(req["action"]) or {"n": len(seen)})
+        conn = AbletonConnection(cache=True)
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        assert conn.send("list_devices", {"track_index": 0}) == {"n": 1}
+        assert conn.send("list_devices", {"track_index": 0}) == {"n": 1}
+        conn.send("set_device_enabled", {"track_index": 0, "device_index": 0})
+        assert conn.send("list_devices", {"track_index": 0}) == {"n": 3}
+        assert seen == ["list_devices", "set_device_enabled", "list_devices"]
+        stats = conn.cache.stats()  # writes are not counted as lookups
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        conn.disconnect()
+
+    async def test_async_connection_serves_repeat_reads(self, fake_server):
+        seen = []
+        fake_server.start(handler=lambda req: seen.append(req["action"]) or {})
+        conn = AsyncAbletonConnection(cache=True)
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        await conn.send("get_grooves")
+        await conn.send("get_grooves")
+        await conn.send("undo")
+        await conn.send("get_grooves")
+        assert seen == ["get_grooves", "undo", "get_grooves"]
+        stats = conn.cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        await conn.disconnect()
+
+
+class TestSingleFlight:
+    """Test that identical concurrent reads share one wire request."""
+
+    @staticmethod
+    def _slow_counter(fake_server, delay=0.2):
+        seen = []
+
+        def handler(req):
+            seen.append(req["action"])
+            time.sleep(delay)
+            return {"n": len(seen)}
+
+        fake_server.start(handler=handler)
+        return seen
+
+    def test_threads_share_one_request(self, fake_server):
+        seen = self._slow_counter(fake_server)
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(conn.send("get_session_state")))
+            for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5.0)
+        assert seen == ["get_session_state"]
+        assert results == [{"n": 1}] * 4
+        assert conn.shared_reads == 3
+        assert conn._inflight == {}
+        conn.disconnect()
+
+    def test_writes_are_not_shared(self, fake_server):
+        seen = self._slow_counter(fake_server, delay=0.05)
+        conn = AbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        threads = [threading.Thread(target=conn.send, args=("undo",))
+                   for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5.0)
+        assert seen == ["undo"] * 3
+        assert conn.shared_reads == 0
+        conn.disconnect()
+
+    async def test_async_waiters_share_one_request(self, fake_server):
+        seen = self._slow_counter(fake_server)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        results = await asyncio.gather(
+            conn.send("get_track", {"track_index": 0}),
+            conn.send("get_track", {"track_index": 0}),
+            conn.send("get_track", {"track_index": 1}))
+        assert seen == ["get_track", "get_track"]
+        assert results[0] is results[1]
+        assert conn.shared_reads == 1
+        assert conn._inflight == {}
+        await conn.disconnect()
+
+    async def test_cancelled_waiter_does_not_cancel_others(self, fake_server):
+        seen = self._slow_counter(fake_server)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        first = asyncio.ensure_future(conn.send("list_tracks"))
+        second = asyncio.ensure_future(conn.send("list_tracks"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        assert await second == {"n": 1}
+        assert seen == ["list_tracks"]
+        await conn.disconnect()
+
+    async def test_error_reaches_every_waiter(self, fake_server):
+        def handler(req):
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        fake_server.start(handler=handler)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        results = await asyncio.gather(
+            conn.send("list_scenes"), conn.send("list_scenes"),
+            return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        await conn.disconnect()
+
+
+class TestAsyncAbletonConnection:
+    """Test the asyncio-stream connection used by the MCP tools."""
+
+    @staticmethod
+    def _delayed_server(delay):
+        """Answer every request after `delay` seconds, each on its own timer."""
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_sock.bind(("localhost", 0))
+        server_sock.listen(1)
+
+        def serve():
+            server_sock.settimeout(5.0)
+            client, _ = server_sock.accept()
+            write_lock = threading.Lock()
+
+            def reply(req):
+                resp = {"id": req["id"], "ok": True, "result": {"n": req["params"]["n"]}}
+                with write_lock:
+                    client.sendall((json.dumps(resp) + "\n").encode("utf-8"))
+
+            buffer = b""
+            try:
+                while True:
+                    data = client.recv(65536)
+                    if not data:
+                        break
+                    buffer += data
+                    while b"\n" in buffer:
+                        line, buffer = buffer.split(b"\n", 1)
+                        threading.Timer(delay, reply, args=(json.loads(line),)).start()
+            except OSError:
+                pass
+            finally:
+                client.close()
+                server_sock.close()
+
+        threading.Thread(target=serve, daemon=True).start()
+        return server_sock.getsockname()[1]
+
+    async def test_send_receives_matching_response(self, fake_server):
+        fake_server.start(handler=lambda req: {"tempo": 140.0})
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        result = await conn.send("set_tempo", {"bpm": 140})
+        assert result == {"tempo": 140.0}
+        assert conn.connected is True
+        await conn.disconnect()
+        assert conn.connected is False
+
+    async def test_error_response_raises(self, fake_server):
+        def error_handler(req):
+            raise ValueError("BPM out of range")
+
+        fake_server.start(handler=error_handler)
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        with pytest.raises(RuntimeError, match="BPM out of range"):
+            await conn.send("set_tempo", {"bpm": -5})
+        await conn.disconnect()
+
+    async def test_connect_no_server_raises(self):
+        conn = AsyncAbletonConnection()
+        conn.host = "localhost"
+        conn.port = 1
+        with pytest.raises(ConnectionError, match="Cannot connect"):
+            await conn.connect()
+
+    async def test_concurrent_sends_overlap(self):
+        conn = AsyncAbletonConnection()
+        conn.host = "localhost"
+        conn.port = self._delayed_server(0.3)
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(conn.send("ping", {"n": i}) for i in range(5)))
+        elapsed = time.monotonic() - start
+        assert [r["n"] for r in results] == list(range(5))
+        assert elapsed < 1.0, "Concurrent sends should overlap their waits"
+        await conn.disconnect()
+
+    async def test_send_many(self, fake_server):
+        fake_server.start(handler=lambda req: {"n": req["params"]["n"]})
+        conn = AsyncAbletonConnection()
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        results = await conn.send_many([("ping", {"n": i}) for i in range(3)])
+        assert [r["n"] for r in results] == [0, 1, 2]
+        await conn.disconnect()
+
+    async def test_seek_resyncs_mirror(self, fake_server):
+        seen = []
+
+        def handler(req):
+            seen.append(req["action"])
+            if req["action"] == "get_snapshot":
+                return {"session": {"is_playing": False, "current_song_time": 0.0,
+                                    "tracks": [], "return_tracks": [], "scenes": []},
+                        "tracks": [], "scenes": [], "mixer": [], "devices": [],
+                        "clip_slots": [], "tick": 0}
+            return {}
+
+        fake_server.start(handler=handler)
+        conn = AsyncAbletonConnection(mirror=True)
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        await conn.send("get_session_state")
+        await conn.send("get_session_state")
+        await conn.send("seek", {"time": 8.0})
+        await conn.send("get_session_state")
+        assert seen == ["get_snapshot", "seek", "get_snapshot"]
+        await conn.disconnect()
+
+    async def test_mirror_disabled_without_snapshot_support(self, fake_server):
+        def handler(req):
+            if req["action"] == "get_snapshot":
+                raise ValueError("Unknown action: get_snapshot")
+            return {"tracks": [], "count": 0}
+
+        fake_server.start(handler=handler)
+        fake_server.error_code = "UNKNOWN_ACTION"
+        conn = AsyncAbletonConnection(mirror=True)
+        conn.host = fake_server.host
+        conn.port = fake_server.actual_port
+        assert await conn.send("list_tracks") == {"tracks": [], "count": 0}
+        assert conn.mirror is None
+        await conn.disconnect()
+
+    async def test_singleton(self, fake_server):
+        fake_server.start()
+        with patch.dict(os.environ, {"ABLETON_MCP_PORT": str(fake_server.actual_port)}):
+            await shutdown_async_connection()
+            c1 = await get_async_connection()
+            c2 = await get_async_connection()
+            assert c1 is c2
+            await shutdown_async_connection()
+            assert c1.connected is False
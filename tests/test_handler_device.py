@@ -6,6 +6,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "remote_script"))
 
+from UltimateAbletonMCP.curves import simplify
 from UltimateAbletonMCP.handlers.device import DeviceHandler
 from mocks import (MockSong, MockCInstance, MockDevice, MockParam,
                       MockClip, MockClipSlot)
@@ -81,6 +82,61 @@ class TestGetParam:
                 {"track_index": 0, "device_index": 0, "param": "Nonexistent"})
 
 
+class TestParamNameIndex:
+    @pytest.fixture
+    def plugin(self, mock_song):
+        device = MockDevice("Serum", "PluginDevice")
+        device.parameters = [MockParam("Device On", 1.0)] + [
+            MockParam("Env%d %s" % (i, stage), 0.0)
+            for i in range(1, 4) for stage in ("Attack", "Decay")] + [
+            MockParam("Filter_Cutoff", 0.5), MockParam("Master Volume", 0.7)]
+        mock_song.tracks[0].devices = [device]
+        return device
+
+    def get(self, handler, ref, **extra):
+        return handler._get_param(dict(
+            {"track_index": 0, "device_index": 0, "param": ref}, **extra))["name"]
+
+    def test_map_built_once(self, handler, plugin):
+        self.get(handler, "Env1 Attack")
+        self.get(handler, "Env3 Decay")
+        assert handler._param_names.builds == 1
+        assert handler._param_names.hits == 2
+
+    def test_ignores_spacing_and_punctuation(self, handler, plugin):
+        assert self.get(handler, "filter cutoff") == "Filter_Cutoff"
+        assert self.get(handler, "MASTERVOLUME") == "Master Volume"
+
+    def test_unique_prefix(self, handler, plugin):
+        assert self.get(handler, "master") == "Master Volume"
+        with pytest.raises(ValueError, match="Closest: Env1 Attack, Env1 Decay"):
+            self.get(handler, "env1")
+
+    def test_fuzzy_is_opt_in(self, handler, plugin):
+        with pytest.raises(ValueError, match="Closest: Filter_Cutoff"):
+            self.get(handler, "Filter Cutof f2")
+        assert self.get(handler, "Fliter Cutoff", fuzzy=True) == "Filter_Cutoff"
+
+    def test_listener_invalidates(self, handler, plugin):
+        self.get(handler, "Master Volume")
+        plugin.parameters = plugin.parameters + [MockParam("Macro 1", 0.0)]
+        assert self.get(handler, "Macro 1") == "Macro 1"
+        assert handler._param_names.builds == 2
+        assert len(plugin._listeners["parameters"]) == 1
+
+    def test_unnotified_change_is_caught(self, handler, plugin):
+        self.get(handler, "Master Volume")
+        object.__setattr__(plugin, "parameters", list(reversed(plugin.parameters)))
+        assert self.get(handler, "Master Volume") == "Master Volume"
+        assert handler._param_names.builds == 2
+
+    def test_disconnect_removes_listeners(self, handler, plugin):
+        self.get(handler, "Master Volume")
+        handler.disconnect()
+        assert plugin._listeners["parameters"] == []
+        assert len(handler._param_names) == 0
+
+
 class TestSetParam:
     def test_set(self, handler, mock_song):
         result = handler._set_param(
@@ -105,6 +161,77 @@ class TestSetParam:
         assert result["value"] == 5000.0
 
 
+class TestSetParams:
+    def test_many_devices(self, handler, mock_song):
+        mock_song.tracks[1].devices = [MockDevice("Reverb", "Reverb")]
+        result = handler._set_params({"items": [
+            [0, 0, 1, 0.4], [0, 0, "Filter Freq", 800.0], [1, 0, "volume", 0.2]]})
+        assert result["written"] == 3
+        assert result["results"][1] == {"name": "Filter Freq", "value": 800.0}
+        assert mock_song.tracks[1].devices[0].parameters[1].value == 0.2
+
+    def test_clamps_per_parameter(self, handler, mock_song):
+        result = handler._set_params({"items": [
+            [0, 0, 1, 5.0], [0, 0, 2, 5.0]]})
+        assert [r["value"] for r in result["results"]] == [1.0, 20.0]
+
+    def test_bad_items_reported_and_skipped(self, handler, mock_song):
+        result = handler._set_params({"items": [
+            [0, 0, "Nope", 0.1], [0, 3, 1, 0.1], [0, 0, 1, 0.3], [0, 0]]})
+        assert (result["written"], result["failed"]) == (1, 3)
+        assert "not found" in result["results"][0]["error"]
+        assert "Device index 3" in result["results"][1]["error"]
+        assert result["results"][2] == {"name": "Volume", "value": 0.3}
+        assert "error" in result["results"][3]
+
+    def test_rejected_write_does_not_stop_the_rest(self, handler, mock_song):
+        def reject():
+            raise RuntimeError("Parameter is not enabled")
+
+        mock_song.tracks[0].devices[0].parameters[1].add_value_listener(reject)
+        result = handler._set_params({"items": [
+            [0, 0, 1, 0.4], [0, 0, 2, 800.0]]})
+        assert (result["written"], result["failed"]) == (1, 1)
+        assert result["results"][0] == {"error": "Parameter is not enabled"}
+        assert result["results"][1] == {"name": "Filter Freq", "value": 800.0}
+
+    def test_device_resolved_once(self, handler, mock_song, monkeypatch):
+        calls = []
+        original = handler._get_device_obj
+        monkeypatch.setattr(handler, "_get_device_obj",
+                            lambda params: calls.append(params) or original(params))
+        handler._set_params({"items": [[0, 0, i % 3, 0.5] for i in range(30)]})
+        assert len(calls) == 1
+
+
+class TestDumpParameters:
+    def test_columns(self, handler, mock_song):
+        result = handler._dump_parameters({})
+        assert result["count"] == 6
+        assert result["device_track"] == [0, 1]
+        assert result["device"] == [0, 0, 0, 1, 1, 1]
+        assert result["param"] == [0, 1, 2, 0, 1, 2]
+        assert result["min"][2] == 20.0
+        assert result["quantized"] == [False] * 6
+
+    def test_names_interned(self, handler):
+        result = handler._dump_parameters({})
+        assert result["names"] == ["Device On", "Volume", "Filter Freq"]
+        assert result["name"] == [0, 1, 2, 0, 1, 2]
+
+    def test_filters(self, handler, mock_song):
+        mock_song.tracks[1].devices.append(MockDevice("Reverb", "Reverb"))
+        result = handler._dump_parameters({"track_indices": [1],
+                                           "class_name": "Reverb"})
+        assert result["device_track"] == [1]
+        assert result["device_index"] == [1]
+        assert result["device"] == [0, 0, 0]
+
+    def test_bad_track(self, handler):
+        with pytest.raises(IndexError):
+            handler._dump_parameters({"track_indices": [5]})
+
+
 class TestSetEnabled:
     def test_disable(self, handler, mock_song):
         handler._set_enabled(
@@ -177,6 +304,39 @@ class TestAutomation:
         assert result["inserted"] is True
         assert result["time"] == 2.0
 
+    def test_write_curve_decimates(self, handler, song_with_clip):
+        # A ramp up then down: only the corners are needed
+        times = [i * 0.05 for i in range(81)]
+        values = [min(t, 4.0 - t) / 2.0 for t in times]
+        result = handler._write_automation_curve(
+            {"track_index": 0, "clip_index": 0, "device_index": 0,
+             "param_index": 1, "times": times, "values": values})
+        assert (result["written"], result["supplied"]) == (3, 81)
+        env = song_with_clip.tracks[0].clip_slots[0].clip._envelopes["Volume"]
+        assert env.points == [(0.0, 0.0), (2.0, 1.0), (4.0, 0.0)]
+
+    def test_write_curve_zero_tolerance_keeps_bends(self, handler, song_with_clip):
+        result = handler._write_automation_curve(
+            {"track_index": 0, "clip_index": 0, "device_index": 0,
+             "param_index": 1, "times": [0, 1, 2, 3],
+             "values": [0.0, 0.5, 0.4, 0.9], "tolerance": 0})
+        assert result["written"] == 4
+
+    def test_write_curve_clear_and_clamp(self, handler, song_with_clip):
+        ref = {"track_index": 0, "clip_index": 0, "device_index": 0,
+               "param_index": 1}
+        handler._insert_automation_point(dict(ref, time=3.0, value=0.2))
+        handler._write_automation_curve(dict(
+            ref, times=[1.0, 0.0], values=[7.0, -1.0], clear=True))
+        env = song_with_clip.tracks[0].clip_slots[0].clip._envelopes["Volume"]
+        assert env.points == [(0.0, 0.0), (1.0, 1.0)]
+
+    def test_write_curve_length_mismatch(self, handler, song_with_clip):
+        with pytest.raises(ValueError, match="differ in length"):
+            handler._write_automation_curve(
+                {"track_index": 0, "clip_index": 0, "device_index": 0,
+                 "param_index": 1, "times": [0, 1], "values": [0.5]})
+
     def test_remove_automation_no_envelope(self, handler, song_with_clip):
         result = handler._remove_automation_point(
             {"track_index": 0, "clip_index": 0,
@@ -199,7 +359,26 @@ class TestActionRegistration:
             "set_device_preset", "get_device_chains", "get_automation",
             "create_automation", "clear_automation",
             "insert_automation_point", "remove_automation_point",
+            "set_device_params", "dump_parameters", "write_automation_curve",
         ]
         for action in expected:
             assert action in actions, f"Missing: {action}"
-        assert len(actions) == 13
+        assert len(actions) == 16
+
+
+class TestSimplify:
+    def test_short_curves_kept(self):
+        assert simplify([0.0, 1.0], [0.0, 1.0], 0.1) == [0, 1]
+
+    def test_line_collapses(self):
+        times = [float(i) for i in range(100)]
+        assert simplify(times, [t * 0.01 for t in times], 1e-9) == [0, 99]
+
+    def test_within_tolerance_dropped(self):
+        assert simplify([0, 1, 2], [0.0, 0.55, 1.0], 0.1) == [0, 2]
+        assert simplify([0, 1, 2], [0.0, 0.7, 1.0], 0.1) == [0, 1, 2]
+
+    def test_long_curve_no_recursion_limit(self):
+        times = [float(i) for i in range(5000)]
+        values = [float(i % 2) for i in range(5000)]
+        assert len(simplify(times, values, 0.1)) == 5000
@@ -7,8 +7,11 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "remote_script"))
 
 from UltimateAbletonMCP.handlers.scene import SceneHandler
+from UltimateAbletonMCP.handlers import DeferCommand
+from UltimateAbletonMCP.handlers import browser as browser_module
 from UltimateAbletonMCP.handlers.browser import BrowserHandler
-from mocks import MockSong, MockCInstance
+from UltimateAbletonMCP.browser_index import CHECK_EVERY
+from mocks import MockSong, MockCInstance, MockBrowserItem
 
 
 # ============================================================================
@@ -149,6 +152,63 @@ class TestBrowserGetItems:
         assert "error" in result
 
 
+class TestBrowserPaging:
+    @pytest.fixture
+    def big(self, browser_handler, mock_c_instance):
+        _big_library(mock_c_instance._app.browser)
+        return browser_handler
+
+    def test_items_page_and_cursor(self, big):
+        first = big._get_items({"path": "instruments/Folder 2", "limit": 20})
+        assert (first["count"], first["total"], first["offset"]) == (20, 50, 0)
+        assert first["items"][0]["name"] == "Preset 2-0"
+        names = [item["name"] for item in first["items"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = big._get_items({"cursor": cursor, "limit": 20})
+            names += [item["name"] for item in page["items"]]
+            cursor = page.get("next_cursor")
+        assert names == ["Preset 2-%d" % i for i in range(50)]
+
+    def test_offset(self, big):
+        page = big._get_items({"path": "instruments", "offset": 38})
+        assert [item["name"] for item in page["items"]] == ["Folder 38", "Folder 39"]
+        assert "next_cursor" not in page
+
+    def test_expand_by_uri(self, big):
+        folder = big._get_items({"path": "instruments", "limit": 5})["items"][3]
+        page = big._get_items({"uri": folder["uri"], "limit": 2})
+        assert [item["name"] for item in page["items"]] == ["Preset 3-0", "Preset 3-1"]
+        assert page["next_cursor"].endswith("|uri|" + folder["uri"])
+
+    def test_unknown_uri(self, browser_handler):
+        with pytest.raises(ValueError, match="not found"):
+            browser_handler._get_items({"uri": "query:Nope"})
+
+    def test_path_cache_skips_walk(self, big):
+        big._get_items({"path": "instruments/Folder 7"})
+        assert big.node_hits == 0
+        big._get_items({"path": "Instruments/folder 7", "offset": 10})
+        assert big.node_hits == 1
+
+    def test_tree_limits_each_folder(self, big):
+        result = big._get_tree({"category": "instruments", "limit": 3})
+        tree = result["categories"][0]
+        assert len(tree["children"]) == 3
+        assert tree["total"] == 40
+        assert len(tree["children"][0]["children"]) == 3
+        assert tree["children"][0]["total"] == 50
+        following = big._get_tree({"cursor": result["next_cursor"], "limit": 3})
+        assert following["categories"][0]["children"][0]["name"] == "Folder 3"
+
+    def test_bad_cursor(self, big):
+        with pytest.raises(ValueError, match="cursor"):
+            big._get_items({"cursor": "garbage"})
+        tree_cursor = big._get_tree({"category": "instruments", "limit": 1})["next_cursor"]
+        with pytest.raises(ValueError, match="get_browser_items"):
+            big._get_items({"cursor": tree_cursor})
+
+
 class TestBrowserLoadItem:
     def test_load_valid_uri(self, browser_handler, mock_c_instance):
         result = browser_handler._load_item(
@@ -172,6 +232,233 @@ class TestBrowserLoadItem:
                 {"track_index": 99, "uri": "query:Analog"})
 
 
+def _big_library(browser, folders=40, per_folder=50):
+    """Replace the instruments category with folders of loadable presets."""
+    browser.instruments = MockBrowserItem("Instruments", children=[
+        MockBrowserItem("Folder %d" % f, children=[
+            MockBrowserItem("Preset %d-%d" % (f, i), "query:P%d-%d" % (f, i),
+                            is_loadable=True)
+            for i in range(per_folder)])
+        for f in range(folders)])
+
+
+class TestBrowserIndex:
+    def test_built_lazily(self, browser_handler):
+        assert browser_handler.index_status()["started"] is False
+        browser_handler._load_item({"track_index": 0, "uri": "query:Analog"})
+        status = browser_handler.index_status()
+        assert status["complete"] is True
+        assert status["items"] == 1
+
+    def test_hit_skips_walk(self, browser_handler):
+        browser_handler._load_item({"track_index": 0, "uri": "query:Analog"})
+        visited = browser_handler.index_status()["visited"]
+        browser_handler._load_item({"track_index": 1, "uri": "query:Analog"})
+        assert browser_handler.index_status()["visited"] == visited
+
+    def test_step_stops_at_deadline(self, browser_handler, mock_c_instance):
+        _big_library(mock_c_instance._app.browser)
+        index = browser_handler._index
+        index.start()
+        index.step(0.0)  # already past: expands one batch of children
+        assert index.complete is False
+        assert len(index) == CHECK_EVERY
+        index.step(None)
+        assert index.complete is True
+        assert len(index) == 40 + 40 * 50
+        assert index.path("query:P3-7") == "instruments/Folder 3/Preset 3-7"
+
+    def test_large_folder_resumes_between_steps(self, browser_handler,
+                                                mock_c_instance):
+        _big_library(mock_c_instance._app.browser, folders=1, per_folder=100)
+        index = browser_handler._index
+        index.start()
+        added = []
+        while not index.complete:
+            added.append(index.step(0.0))
+        assert max(added) == CHECK_EVERY  # the big folder spans several ticks
+        assert index.path("query:P0-99") == "instruments/Folder 0/Preset 0-99"
+
+    def test_entries_read_no_proxies(self, browser_handler, mock_c_instance):
+        _big_library(mock_c_instance._app.browser, folders=2, per_folder=3)
+        index = browser_handler._index
+        index.start()
+        index.step(None)
+
+        class Gone(object):
+            @property
+            def is_loadable(self):
+                raise AssertionError("proxy read after the walk")
+
+        for uri in list(index._items):
+            index._items[uri] = Gone()
+        entries = dict((uri, loadable) for uri, _, loadable in index.entries())
+        assert entries["query:P1-2"] is True
+        assert entries["query:Folder 0"] is False
+        assert index.describe("query:P1-2")["is_loadable"] is True
+        assert index.search("preset 1 2")[0][1] == "query:P1-2"
+
+    def test_miss_while_building_defers(self, browser_handler, mock_c_instance,
+                                        monkeypatch):
+        _big_library(mock_c_instance._app.browser)
+        monkeypatch.setattr(browser_module, "LOAD_STEP_SECONDS", -1.0)
+        with pytest.raises(DeferCommand):
+            browser_handler._load_item({"track_index": 0, "uri": "query:P39-0"})
+        while not browser_handler._index.complete:
+            browser_handler.on_tick(0.0)
+        result = browser_handler._load_item({"track_index": 0, "uri": "query:P39-0"})
+        assert result["item_name"] == "Preset 39-0"
+
+    def test_one_walk_step_per_tick(self, browser_handler, mock_c_instance,
+                                    monkeypatch):
+        _big_library(mock_c_instance._app.browser)
+        monkeypatch.setattr(browser_module, "LOAD_STEP_SECONDS", -1.0)
+        for uri in ("query:P39-0", "query:P39-1", "query:P39-2"):
+            with pytest.raises(DeferCommand):
+                browser_handler._load_item({"track_index": 0, "uri": uri})
+        status = browser_handler.index_status()
+        assert status["visited"] == CHECK_EVERY  # only the first miss walked
+        browser_handler.on_tick(0.0)
+        visited = browser_handler.index_status()["visited"]
+        with pytest.raises(DeferCommand):
+            browser_handler._load_item({"track_index": 0, "uri": "query:P39-0"})
+        assert visited < browser_handler.index_status()["visited"] <= \
+            visited + CHECK_EVERY
+
+    def test_refresh_picks_up_new_items(self, browser_handler, mock_c_instance):
+        browser = mock_c_instance._app.browser
+        browser_handler._load_item({"track_index": 0, "uri": "query:Analog"})
+        browser.drums.children.append(
+            MockBrowserItem("Kit", "query:Kit", is_loadable=True))
+        with pytest.raises(ValueError, match="not found"):
+            browser_handler._load_item({"track_index": 0, "uri": "query:Kit"})
+        status = browser_handler._refresh_index({})
+        assert status["builds"] == 2
+        result = browser_handler._load_item({"track_index": 0, "uri": "query:Kit"})
+        assert result["item_name"] == "Kit"
+
+    def test_stale_proxy_dropped(self, browser_handler, mock_c_instance):
+        browser_handler._load_item({"track_index": 0, "uri": "query:Analog"})
+        mock_c_instance._app.browser.instruments.children[0].uri = "query:Moved"
+        with pytest.raises(ValueError, match="refresh_browser_index"):
+            browser_handler._load_item({"track_index": 0, "uri": "query:Analog"})
+        assert browser_handler._index.get("query:Analog") is None
+
+
+def _library(browser):
+    browser.instruments = MockBrowserItem("Instruments", children=[
+        MockBrowserItem("Operator", "query:Synths#Operator", is_loadable=True),
+        MockBrowserItem("Operator", "query:Synths#Operator:Presets", children=[
+            MockBrowserItem("Bass Operator Pluck", "query:Synths#Op:Pluck",
+                            is_loadable=True),
+            MockBrowserItem("Soft Keys", "query:Synths#Op:Keys",
+                            is_loadable=True),
+        ]),
+        MockBrowserItem("Wavetable", "query:Synths#Wavetable", is_loadable=True),
+    ])
+    browser.drums = MockBrowserItem("Drums", children=[
+        MockBrowserItem("Kicks", "query:Drums#Kicks", children=[
+            MockBrowserItem("Kick 808 Long.wav", "query:Drums#Kick808",
+                            is_loadable=True),
+            MockBrowserItem("Kick Acoustic.wav", "query:Drums#KickAc",
+                            is_loadable=True),
+        ]),
+    ])
+
+
+class TestBrowserSearch:
+    @pytest.fixture
+    def search(self, browser_handler, mock_c_instance):
+        _library(mock_c_instance._app.browser)
+        browser_handler._index.start()
+        browser_handler._index.step(None)  # no timing-dependent defers
+        return lambda **params: browser_handler._search(params)
+
+    def test_exact_name_ranks_first(self, search):
+        result = search(query="operator")
+        assert result["results"][0]["uri"] == "query:Synths#Operator"
+        assert result["results"][0]["is_loadable"] is True
+        names = [r["name"] for r in result["results"]]
+        assert "Bass Operator Pluck" in names
+        assert result["complete"] is True
+
+    def test_prefix_match(self, search):
+        result = search(query="wave")
+        assert [r["name"] for r in result["results"]] == ["Wavetable"]
+
+    def test_every_word_must_match(self, search):
+        result = search(query="kick 808")
+        assert [r["uri"] for r in result["results"]] == ["query:Drums#Kick808"]
+
+    def test_path_words_match(self, search):
+        names = [r["name"] for r in search(query="kicks acoustic")["results"]]
+        assert names == ["Kick Acoustic.wav"]
+
+    def test_typo_falls_back_to_trigrams(self, search):
+        result = search(query="wavetabel")
+        assert result["results"][0]["name"] == "Wavetable"
+
+    def test_category_filter(self, search):
+        assert search(query="kick", category="instruments")["count"] == 0
+        assert search(query="kick", category="drums")["count"] == 3  # + folder
+
+    def test_limit(self, search):
+        assert search(query="operator", limit=1)["count"] == 1
+
+    def test_result_path(self, search):
+        result = search(query="pluck")
+        assert result["results"][0]["path"] == \
+            "instruments/Operator/Bass Operator Pluck"
+
+    def test_bad_params(self, search):
+        with pytest.raises(ValueError, match="query"):
+            search(query=" ")
+        with pytest.raises(ValueError, match="Unknown category"):
+            search(query="kick", category="samples")
+
+    def test_defers_until_index_complete(self, browser_handler, mock_c_instance,
+                                         monkeypatch):
+        _big_library(mock_c_instance._app.browser)
+        monkeypatch.setattr(browser_module, "LOAD_STEP_SECONDS", -1.0)
+        with pytest.raises(DeferCommand):
+            browser_handler._search({"query": "preset"})
+        partial = browser_handler._search({"query": "preset", "partial": True})
+        assert partial["complete"] is False
+
+    def test_stale_entry_leaves_search(self, browser_handler, search,
+                                       mock_c_instance):
+        search(query="wavetable")
+        browser_handler._index.discard("query:Synths#Wavetable")
+        assert search(query="wavetable")["count"] == 0
+
+
+class TestBrowserIndexExport:
+    def test_fingerprint_tracks_top_level(self, browser_handler, mock_c_instance):
+        first = browser_handler._get_fingerprint({})
+        assert first["live_version"] == "unknown"  # mock app has no version
+        assert first == browser_handler._get_fingerprint({})
+        mock_c_instance._app.browser.drums.children.append(
+            MockBrowserItem("New Pack Kit", "query:NewKit"))
+        assert browser_handler._get_fingerprint({})["fingerprint"] != \
+            first["fingerprint"]
+
+    def test_index_entries(self, browser_handler, mock_c_instance):
+        _library(mock_c_instance._app.browser)
+        result = browser_handler._get_index({})
+        assert result["count"] == len(result["items"]) == 8
+        assert ["query:Drums#Kick808", "drums/Kicks/Kick 808 Long.wav", True] \
+            in result["items"]
+        assert result["fingerprint"] == \
+            browser_handler._get_fingerprint({})["fingerprint"]
+
+    def test_index_defers_while_building(self, browser_handler, mock_c_instance,
+                                         monkeypatch):
+        _big_library(mock_c_instance._app.browser)
+        monkeypatch.setattr(browser_module, "LOAD_STEP_SECONDS", -1.0)
+        with pytest.raises(DeferCommand):
+            browser_handler._get_index({})
+
+
 class TestBrowserGrooves:
     def test_empty_groove_pool(self, browser_handler):
         result = browser_handler._get_grooves({})
@@ -184,8 +471,9 @@ class TestBrowserActionRegistration:
         actions = browser_handler.get_actions()
         expected = [
             "get_browser_tree", "get_browser_items",
-            "load_browser_item", "get_grooves",
+            "load_browser_item", "get_grooves", "refresh_browser_index",
+            "search_browser", "get_browser_fingerprint", "get_browser_index",
         ]
         for action in expected:
             assert action in actions, f"Missing: {action}"
-        assert len(actions) == 4
+        assert len(actions) == 8
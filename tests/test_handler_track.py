@@ -194,6 +194,102 @@ class TestFreezeAndFlatten:
         assert result["flattened"] is True
 
 
+class TestGetMixer:
+    def test_track_columns(self, handler, mock_song):
+        mock_song.tracks[1].mute = True
+        mock_song.tracks[0].mixer_device.sends[1].value = 0.25
+        tracks = handler._get_mixer({})["tracks"]
+        assert tracks["name"] == ["Track 1", "Track 2"]
+        assert tracks["volume"] == [0.85, 0.85]
+        assert tracks["mute"] == [False, True]
+        assert tracks["sends"] == [[0.0, 0.25], [0.0, 0.0]]
+
+    def test_returns_have_no_arm(self, handler):
+        returns = handler._get_mixer({})["returns"]
+        assert returns["name"] == ["Return A"]
+        assert "arm" not in returns
+
+    def test_master(self, handler):
+        assert handler._get_mixer({})["master"] == {
+            "name": "Master", "volume": 0.85, "pan": 0.0}
+
+
+class TestSetMixer:
+    def test_sparse_changes(self, handler, mock_song):
+        result = handler._set_mixer({"changes": [
+            {"track_index": 0, "volume": 0.5, "mute": True},
+            {"track_index": 1, "sends": {"1": 0.7}},
+            {"kind": "return", "track_index": 0, "pan": -0.3},
+            {"kind": "master", "volume": 0.9},
+        ]})
+        assert result == {"changes": 4, "cells": 5, "written": 5}
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.5
+        assert mock_song.tracks[0].mute is True
+        assert mock_song.tracks[1].mixer_device.sends[1].value == 0.7
+        assert mock_song.return_tracks[0].mixer_device.panning.value == -0.3
+        assert mock_song.master_track.mixer_device.volume.value == 0.9
+
+    def test_send_list_skips_none(self, handler, mock_song):
+        handler._set_mixer({"changes": [
+            {"track_index": 0, "sends": [None, 0.4]}]})
+        sends = mock_song.tracks[0].mixer_device.sends
+        assert [s.value for s in sends] == [0.0, 0.4]
+
+    def test_clamps(self, handler, mock_song):
+        handler._set_mixer({"changes": [{"track_index": 0, "volume": 2.0,
+                                         "pan": -5}]})
+        mixer = mock_song.tracks[0].mixer_device
+        assert (mixer.volume.value, mixer.panning.value) == (1.0, -1.0)
+
+    def test_unchanged_not_written(self, handler):
+        result = handler._set_mixer({"changes": [
+            {"track_index": 0, "volume": 0.85, "solo": False}]})
+        assert result["written"] == 0
+
+    def test_bad_change_writes_nothing(self, handler, mock_song):
+        with pytest.raises(IndexError, match=r"changes\[1\]"):
+            handler._set_mixer({"changes": [
+                {"track_index": 0, "volume": 0.1},
+                {"track_index": 9, "volume": 0.1}]})
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.85
+
+    def test_field_not_on_kind(self, handler):
+        with pytest.raises(ValueError, match="cannot be set on a master"):
+            handler._set_mixer({"changes": [{"kind": "master", "mute": True}]})
+
+    def test_bad_send_index(self, handler):
+        with pytest.raises(IndexError, match="Send index 5"):
+            handler._set_mixer({"changes": [{"track_index": 0, "sends": {"5": 1}}]})
+
+
+class TestSendMatrix:
+    def test_row_major(self, handler, mock_song):
+        mock_song.create_return_track()
+        mock_song.tracks[1].mixer_device.sends[0].value = 0.3
+        result = handler._get_send_matrix({})
+        assert (result["rows"], result["columns"]) == (2, 2)
+        assert result["returns"] == ["Return A", "New Return"]
+        assert result["values"] == [0.0, 0.0, 0.3, 0.0]
+
+    def test_write_subset(self, handler, mock_song):
+        result = handler._set_send_matrix({"cells": [[0, 1, 0.6], [1, 0, 0.0]]})
+        assert result == {"cells": 2, "written": 1}
+        assert mock_song.tracks[0].mixer_device.sends[1].value == 0.6
+
+    def test_clamps(self, handler, mock_song):
+        handler._set_send_matrix({"cells": [[1, 1, 3.0]]})
+        assert mock_song.tracks[1].mixer_device.sends[1].value == 1.0
+
+    def test_bad_cell_writes_nothing(self, handler, mock_song):
+        with pytest.raises(IndexError, match=r"cells\[1\]: Send index 7"):
+            handler._set_send_matrix({"cells": [[0, 0, 0.5], [0, 7, 0.5]]})
+        assert mock_song.tracks[0].mixer_device.sends[0].value == 0.0
+
+    def test_malformed_cell(self, handler):
+        with pytest.raises(ValueError, match=r"cells\[0\]"):
+            handler._set_send_matrix({"cells": [[0, 1]]})
+
+
 class TestActionRegistration:
     def test_all_actions(self, handler):
         actions = handler.get_actions()
@@ -204,7 +300,8 @@ class TestActionRegistration:
             "set_track_arm", "set_track_color", "set_track_send",
             "set_track_input_routing", "set_track_output_routing",
             "freeze_track", "flatten_track", "stop_track_clips",
+            "get_mixer", "set_mixer", "get_send_matrix", "set_send_matrix",
         ]
         for action in expected:
             assert action in actions, f"Missing: {action}"
-        assert len(actions) == 18
+        assert len(actions) == 22
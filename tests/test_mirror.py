@@ -0,0 +1,185 @@
+"""Tests for the client-side mirror of the Live set."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "remote_script"))
+
+from UltimateAbletonMCP import UltimateAbletonMCP
+from ultimate_ableton_mcp import mirror as mirror_module
+from ultimate_ableton_mcp.mirror import LiveMirror
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def live(mock_c_instance, monkeypatch):
+    """A Remote Script instance on the mock song, without a socket."""
+    monkeypatch.setattr(UltimateAbletonMCP, "_start_server", lambda self: None)
+    instance = UltimateAbletonMCP(mock_c_instance)
+    yield instance
+    instance.disconnect()
+
+
+@pytest.fixture
+def synced(live):
+    """A mirror loaded from a subscribed snapshot, plus its event source."""
+    client = FakeClient()
+    mirror = LiveMirror()
+    mirror.load(live._get_snapshot(client, {"subscribe": True}))
+    return mirror, client
+
+
+def pump(live, mirror, client):
+    """Run one tick and feed the pushed events to the mirror."""
+    live.update_display()
+    for event in client.messages:
+        mirror.apply(event)
+    client.messages.clear()
+
+
+def read(live, action):
+    return live._execute(action, {})["result"]
+
+
+class TestSnapshot:
+    def test_stale_until_loaded(self):
+        mirror = LiveMirror()
+        assert mirror.stale is True
+        assert mirror.answer("list_tracks", None) is None
+
+    def test_answers_match_live(self, live, synced):
+        mirror, _ = synced
+        assert mirror.stale is False
+        for action in ("list_tracks", "list_scenes", "get_session_state"):
+            assert mirror.answer(action, None) == read(live, action)
+        assert mirror.hits == 3
+
+    def test_unmirrored_reads_fall_through(self, synced):
+        mirror, _ = synced
+        assert mirror.answer("get_track", None) is None
+        assert mirror.answer("list_tracks", {"verbose": True}) is None
+
+    def test_answers_are_copies(self, synced):
+        mirror, _ = synced
+        mirror.answer("list_tracks", None)["tracks"][0]["name"] = "changed"
+        assert mirror.tracks[0]["name"] == "Track 1"
+
+    def test_max_age_makes_stale(self, synced, monkeypatch):
+        mirror, _ = synced
+        monkeypatch.setattr(mirror_module, "MAX_AGE", -1.0)
+        assert mirror.stale is True
+
+
+class TestEvents:
+    def test_track_changes(self, live, synced, mock_song):
+        mirror, client = synced
+        track = mock_song.tracks[1]
+        track.mute = True
+        track.arm = True
+        track.name = "Bass"
+        track.mixer_device.volume.value = 0.4
+        pump(live, mirror, client)
+        assert mirror.answer("list_tracks", None) == read(live, "list_tracks")
+        assert mirror.answer("get_session_state", None) == read(live, "get_session_state")
+        assert mirror.mixer[1]["volume"] == 0.4
+
+    def test_session_changes(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.tempo = 93.0
+        mock_song.signature_numerator = 7
+        mock_song.metronome = True
+        pump(live, mirror, client)
+        assert mirror.answer("get_session_state", None) == read(live, "get_session_state")
+
+    def test_scene_changes(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.scenes[0].name = "Drop"
+        mock_song.scenes[1].tempo = 140.0
+        pump(live, mirror, client)
+        assert mirror.answer("list_scenes", None) == read(live, "list_scenes")
+
+    def test_clip_slot_and_device_changes(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.tracks[0].clip_slots[1].fire()
+        mock_song.tracks[0].devices = []
+        mock_song.tracks[1].mixer_device.panning.value = -0.5
+        pump(live, mirror, client)
+        assert mirror.clip_slots[0][1]["playing_status"] == 1
+        assert mirror.devices[0] == []
+        assert mirror.mixer[1]["panning"] == -0.5
+
+    def test_structural_change_makes_stale(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.create_midi_track(-1)
+        pump(live, mirror, client)
+        assert mirror.stale is True
+        assert mirror.answer("list_tracks", None) is None
+
+    def test_resync_replays_newer_events(self, live, synced, mock_song):
+        mirror, client = synced
+        mirror.invalidate()
+        mock_song.tempo = 100.0
+        pump(live, mirror, client)  # older than the snapshot below
+        snapshot = live._get_snapshot(client, {"subscribe": True})
+        mock_song.tempo = 110.0
+        pump(live, mirror, client)  # same tick as the snapshot, so newer
+        mirror.load(snapshot)
+        assert mirror.session["tempo"] == 110.0
+        assert mirror.answer("get_session_state", None) == read(live, "get_session_state")
+
+    def test_playing_session_state_goes_to_live(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.is_playing = True
+        pump(live, mirror, client)
+        assert mirror.answer("get_session_state", None) is None
+        assert mirror.answer("list_tracks", None) is not None
+
+    def test_stopping_makes_stale(self, live, synced, mock_song):
+        mirror, client = synced
+        mock_song.is_playing = True
+        pump(live, mirror, client)
+        mock_song.current_song_time = 16.0
+        mock_song.is_playing = False
+        pump(live, mirror, client)
+        assert mirror.stale is True
+
+    @pytest.mark.parametrize("action,params", [
+        ("seek", {"time": 8.0}),
+        ("jump_to_cue", {"direction": "next"}),
+        ("create_track", {"type": "return"}),
+        ("undo", {}),
+        ("batch", {"commands": [{"action": "set_tempo", "params": {}},
+                                {"action": "seek", "params": {"time": 4.0}}]}),
+    ])
+    def test_unobserved_write_makes_stale(self, synced, action, params):
+        mirror, _ = synced
+        mirror.note_write(action, params)
+        assert mirror.stale is True
+
+    def test_observed_write_keeps_mirror(self, synced):
+        mirror, _ = synced
+        mirror.note_write("set_tempo", {"bpm": 99})
+        mirror.note_write("create_track", {"type": "midi"})  # "tracks" event
+        assert mirror.stale is False
+
+    def test_unknown_target_makes_stale(self, synced):
+        mirror, _ = synced
+        mirror.apply({"event": "track.mute", "params": {"track_index": 9},
+                      "value": True, "tick": 0})
+        assert mirror.stale is True
+
+    def test_status(self, synced):
+        mirror, _ = synced
+        status = mirror.status()
+        assert status["enabled"] is True
+        assert status["stale"] is False
+        assert status["tracks"] == 2
@@ -15,41 +15,19 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "remote_script"
 
 from mocks import MockSong, MockCInstance
 from UltimateAbletonMCP import UltimateAbletonMCP, create_instance
+from UltimateAbletonMCP.commands import Command, CommandQueue, stream_frames
+from UltimateAbletonMCP.handlers import (
+    DeferCommand, PRIORITY_TRANSPORT, PRIORITY_WRITE, PRIORITY_READ)
 
 
 # We need to patch socket binding for tests
 @pytest.fixture
 def mock_c_instance_for_script(mock_song, mock_c_instance, monkeypatch):
     """Prevent the constructor from binding a real socket."""
-    monkeypatch.setattr("UltimateAbletonMCP.socket.socket", lambda *a, **kw: _FakeSocket())
+    monkeypatch.setattr(UltimateAbletonMCP, "_start_server", lambda self: None)
     return mock_c_instance
 
 
-class _FakeSocket:
-    """Minimal socket mock to prevent actual TCP binding in constructor."""
-
-    def setsockopt(self, *a):
-        pass
-
-    def bind(self, *a):
-        pass
-
-    def listen(self, *a):
-        pass
-
-    def settimeout(self, *a):
-        pass
-
-    def accept(self):
-        raise socket.timeout()
-
-    def close(self):
-        pass
-
-    def getsockname(self):
-        return ("localhost", 9877)
-
-
 class TestCreateInstance:
     def test_create_instance(self, mock_c_instance_for_script):
         instance = create_instance(mock_c_instance_for_script)
@@ -120,6 +98,63 @@ class TestExecute:
         instance.disconnect()
 
 
+class TestBatch:
+    """Test the batch action: many commands in one dispatch."""
+
+    def test_results_in_order(self, mock_c_instance_for_script, mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        response = instance._execute("batch", {"commands": [
+            {"action": "set_track_volume", "params": {"track_index": 0, "value": 0.5}},
+            {"action": "set_track_volume", "params": {"track_index": 1, "value": 0.6}},
+            {"action": "get_session_state", "params": {}},
+        ]})
+        assert response["ok"] is True
+        result = response["result"]
+        assert result["count"] == 3
+        assert result["errors"] == 0
+        assert [r["ok"] for r in result["results"]] == [True, True, True]
+        assert result["results"][1]["result"]["volume"] == 0.6
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.5
+        instance.disconnect()
+
+    def test_per_entry_errors(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        response = instance._execute("batch", {"commands": [
+            {"action": "nonexistent", "params": {}},
+            {"action": "get_track", "params": {"track_index": 99}},
+            {"action": "list_tracks"},
+        ]})
+        results = response["result"]["results"]
+        assert results[0]["code"] == "UNKNOWN_ACTION"
+        assert results[1]["code"] == "EXECUTION_ERROR"
+        assert results[2]["ok"] is True
+        assert response["result"]["errors"] == 2
+        instance.disconnect()
+
+    def test_stop_on_error(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        response = instance._execute("batch", {"stop_on_error": True, "commands": [
+            {"action": "nonexistent", "params": {}},
+            {"action": "list_tracks", "params": {}},
+        ]})
+        assert response["result"]["count"] == 1
+        instance.disconnect()
+
+    def test_nested_batch_rejected(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        response = instance._execute("batch", {"commands": [
+            {"action": "batch", "params": {"commands": []}},
+        ]})
+        assert response["result"]["results"][0]["code"] == "INVALID_BATCH"
+        instance.disconnect()
+
+    def test_invalid_commands(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        response = instance._execute("batch", {"commands": "list_tracks"})
+        assert response["ok"] is False
+        instance.disconnect()
+
+
 class TestUpdateDisplay:
     """Test the main-thread queue drain."""
 
@@ -128,10 +163,8 @@ class TestUpdateDisplay:
 
         # Simulate a command being enqueued
         rq = queue.Queue()
-        with instance._response_lock:
-            instance._response_queues["test_001"] = rq
-
-        instance._command_queue.put(("test_001", "get_session_state", {}))
+        instance._command_queue.put(
+            Command("test_001", "get_session_state", {}, rq.put))
 
         # Simulate Live calling update_display
         instance.update_display()
@@ -150,9 +183,8 @@ class TestUpdateDisplay:
         for i in range(5):
             req_id = "multi_%d" % i
             rq = queue.Queue()
-            with instance._response_lock:
-                instance._response_queues[req_id] = rq
-            instance._command_queue.put((req_id, "get_session_state", {}))
+            instance._command_queue.put(
+                Command(req_id, "get_session_state", {}, rq.put))
             responses[req_id] = rq
 
         instance.update_display()
@@ -169,12 +201,9 @@ class TestUpdateDisplay:
         rq_good = queue.Queue()
         rq_bad = queue.Queue()
 
-        with instance._response_lock:
-            instance._response_queues["good"] = rq_good
-            instance._response_queues["bad"] = rq_bad
-
-        instance._command_queue.put(("bad", "nonexistent", {}))
-        instance._command_queue.put(("good", "get_session_state", {}))
+        instance._command_queue.put(Command("bad", "nonexistent", {}, rq_bad.put))
+        instance._command_queue.put(
+            Command("good", "get_session_state", {}, rq_good.put))
 
         instance.update_display()
 
@@ -185,6 +214,652 @@ class TestUpdateDisplay:
         assert good_resp["ok"] is True
         instance.disconnect()
 
+    def test_unencodable_result_doesnt_block_others(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        instance._dispatch["weird"] = lambda params: {"x": object()}
+        sent = []
+
+        def encode(response):
+            sent.append(json.loads(json.dumps(response)))
+
+        instance._command_queue.put(Command("bad", "weird", {}, encode))
+        instance._command_queue.put(Command("good", "list_tracks", {}, encode))
+        instance.update_display()
+
+        assert sent[0]["id"] == "bad"
+        assert sent[0]["code"] == "EXECUTION_ERROR"
+        assert sent[1]["id"] == "good" and sent[1]["ok"] is True
+        instance.disconnect()
+
+
+class TestPriorityLanes:
+    """Test that the drain serves transport before writes before reads."""
+
+    def test_priorities_from_dispatch_table(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        assert instance._priorities["fire_scene"] == PRIORITY_TRANSPORT
+        assert instance._priorities["stop_playback"] == PRIORITY_TRANSPORT
+        assert instance._priorities["list_tracks"] == PRIORITY_READ
+        assert "set_device_param" not in instance._priorities
+        assert "duplicate_clip_to_arrangement" not in instance._priorities  # an edit
+        for action in instance._priorities:
+            assert (action in instance._dispatch
+                    or action in instance._core_actions
+                    or action in instance._client_actions)
+        instance.disconnect()
+
+    def test_transport_jumps_queue(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        order = []
+
+        def record(response):
+            order.append(response["id"])
+
+        for i in range(50):
+            instance._command_queue.put(Command(
+                "w%d" % i, "set_track_color",
+                {"track_index": 0, "color": i}, record, PRIORITY_WRITE))
+        instance._command_queue.put(
+            Command("read", "list_tracks", {}, record, PRIORITY_READ))
+        instance._command_queue.put(
+            Command("fire", "fire_scene", {"scene_index": 0}, record,
+                    PRIORITY_TRANSPORT))
+
+        instance.update_display()
+        assert order[0] == "fire"
+        assert order[-1] == "read"
+        assert order[1:-1] == ["w%d" % i for i in range(50)]
+        instance.disconnect()
+
+    def test_launch_waits_for_own_structural_write(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        order = []
+        mine, other = object(), object()
+
+        def record(response):
+            order.append(response["id"])
+
+        queue = instance._command_queue
+        queue.put(Command("w", "set_track_volume", {"track_index": 0, "volume": 0.5},
+                          record, PRIORITY_WRITE, client=mine))
+        queue.put(Command("create", "create_scene", {"index": -1}, record,
+                          PRIORITY_WRITE, client=mine))
+        queue.put(Command("fire", "fire_scene", {"scene_index": 2}, record,
+                          PRIORITY_TRANSPORT, client=mine))
+        queue.put(Command("stop", "stop_playback", {}, record,
+                          PRIORITY_TRANSPORT, client=other))
+        assert queue.lane_sizes() == [1, 3, 0]
+
+        instance.update_display()
+        assert order == ["stop", "w", "create", "fire"]
+        instance.disconnect()
+
+    def test_launch_still_overtakes_own_param_writes(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        client = object()
+        queue = instance._command_queue
+        queue.put(Command("w", "set_track_volume", {"track_index": 0, "volume": 0.5},
+                          lambda r: None, PRIORITY_WRITE, client=client))
+        queue.put(Command("fire", "fire_scene", {"scene_index": 0},
+                          lambda r: None, PRIORITY_TRANSPORT, client=client))
+        assert queue.pop().id == "fire"
+        instance.disconnect()
+
+    def test_on_client_line_assigns_priority(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+
+        class _Client(object):
+            def send_message(self, msg):
+                pass
+
+        instance._on_client_line(_Client(), json.dumps(
+            {"id": "1", "action": "list_scenes", "params": {}}))
+        instance._on_client_line(_Client(), json.dumps(
+            {"id": "2", "action": "start_playback", "params": {}}))
+        assert instance._command_queue.lane_sizes() == [1, 0, 1]
+        assert instance._command_queue.pop().id == "2"
+        instance.disconnect()
+
+
+class TestCoalescing:
+    """Test last-writer-wins collapsing of queued writes within a drain."""
+
+    def test_sweep_applies_only_final_value(self, mock_c_instance_for_script,
+                                            mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        param = mock_song.tracks[0].devices[0].parameters[2]
+        responses = []
+        for i, value in enumerate([200.0, 400.0, 800.0, 1600.0]):
+            instance._command_queue.put(Command(
+                "p%d" % i, "set_device_param",
+                {"track_index": 0, "device_index": 0, "param": 2, "value": value},
+                responses.append))
+
+        instance.update_display()
+        assert param.value == 1600.0
+        assert instance._stats["coalesced"] == 3
+        assert instance._stats["executed"] == 1
+        assert sorted(r["id"] for r in responses) == ["p0", "p1", "p2", "p3"]
+        for r in responses:
+            assert r["ok"] is True
+            assert r["result"]["value"] == 1600.0
+        assert sum(1 for r in responses if r.get("coalesced")) == 3
+        instance.disconnect()
+
+    def test_different_targets_not_merged(self, mock_c_instance_for_script,
+                                          mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        instance._command_queue.put(Command(
+            "a", "set_track_volume", {"track_index": 0, "value": 0.1},
+            responses.append))
+        instance._command_queue.put(Command(
+            "b", "set_track_volume", {"track_index": 1, "value": 0.2},
+            responses.append))
+        instance._command_queue.put(Command(
+            "c", "set_track_send", {"track_index": 0, "send_index": 1, "value": 0.3},
+            responses.append))
+        instance.update_display()
+        assert instance._stats["coalesced"] == 0
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.1
+        assert mock_song.tracks[1].mixer_device.volume.value == 0.2
+        assert len(responses) == 3
+        instance.disconnect()
+
+    def test_structural_write_is_barrier(self, mock_c_instance_for_script,
+                                         mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        first = mock_song.tracks[0]
+        instance._command_queue.put(Command(
+            "v1", "set_track_volume", {"track_index": 0, "value": 0.1},
+            responses.append))
+        instance._command_queue.put(Command(
+            "new", "create_track", {"type": "midi", "index": 0},
+            responses.append))
+        instance._command_queue.put(Command(
+            "v2", "set_track_volume", {"track_index": 0, "value": 0.7},
+            responses.append))
+        instance.update_display()
+        assert instance._stats["coalesced"] == 0
+        assert first.mixer_device.volume.value == 0.1
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.7
+        instance.disconnect()
+
+    def test_transport_not_coalesced(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        for i in range(3):
+            instance._command_queue.put(Command(
+                "f%d" % i, "fire_scene", {"scene_index": 0}, responses.append,
+                PRIORITY_TRANSPORT))
+        instance.update_display()
+        assert instance._stats["executed"] == 3
+        instance.disconnect()
+
+
+class TestSharedReads:
+    """Test that identical reads queued in one tick run once."""
+
+    def test_identical_reads_from_two_clients(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        first, second = [], []
+        instance._command_queue.put(Command(
+            "a", "get_track", {"track_index": 0}, first.append, PRIORITY_READ))
+        instance._command_queue.put(Command(
+            "b", "get_track", {"track_index": 0}, second.append, PRIORITY_READ))
+        instance.update_display()
+        assert instance._stats["executed"] == 1
+        assert instance._stats["shared_reads"] == 1
+        assert first[0]["id"] == "a" and second[0]["id"] == "b"
+        assert first[0]["result"] == second[0]["result"]
+        assert second[0]["coalesced"] is True
+        assert "coalesced" not in first[0]
+        instance.disconnect()
+
+    def test_different_params_not_shared(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        for i in range(2):
+            instance._command_queue.put(Command(
+                "t%d" % i, "get_track", {"track_index": i}, responses.append,
+                PRIORITY_READ))
+        instance.update_display()
+        assert instance._stats["executed"] == 2
+        assert instance._stats["shared_reads"] == 0
+        instance.disconnect()
+
+    def test_expired_read_not_shared(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        first, second = [], []
+        instance._command_queue.put(Command(
+            "a", "get_track", {"track_index": 0}, first.append, PRIORITY_READ,
+            deadline=time.monotonic() - 1.0))
+        instance._command_queue.put(Command(
+            "b", "get_track", {"track_index": 0}, second.append, PRIORITY_READ))
+        instance.update_display()
+        assert instance._stats["shared_reads"] == 0
+        assert first[0]["code"] == "EXPIRED"
+        assert second[0]["ok"] is True
+        instance.disconnect()
+
+    def test_stale_leader_hands_over(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        first, second = [], []
+        instance._command_queue.put(Command(
+            "a", "get_track", {"track_index": 0}, first.append, PRIORITY_READ,
+            deadline=time.monotonic() + 0.05))
+        instance._command_queue.put(Command(
+            "b", "get_track", {"track_index": 0}, second.append, PRIORITY_READ))
+        assert instance._command_queue.share_reads() == 1
+        time.sleep(0.06)
+        instance.update_display()
+        assert first[0]["code"] == "EXPIRED"
+        assert second[0]["ok"] is True
+        assert second[0]["result"]["name"] == "Track 1"
+        instance.disconnect()
+
+    def test_queue_only_shares_listed_actions(self):
+        queue = CommandQueue(shared_reads=["list_tracks"])
+        for i in range(2):
+            queue.put(Command("l%d" % i, "list_tracks", {}, None, PRIORITY_READ))
+            queue.put(Command("p%d" % i, "ping", {}, None, PRIORITY_READ))
+        assert queue.share_reads() == 1
+        assert queue.qsize() == 3
+
+
+class TestDeferredCommands:
+    """Test commands a handler defers until a later tick."""
+
+    @staticmethod
+    def _deferring_instance(c_instance, ready_after):
+        instance = create_instance(c_instance)
+        calls = []
+
+        def not_yet(params):
+            calls.append(params)
+            if len(calls) < ready_after:
+                raise DeferCommand("not ready")
+            return {"calls": len(calls)}
+
+        instance._dispatch["not_yet"] = not_yet
+        return instance
+
+    def test_retried_next_tick(self, mock_c_instance_for_script):
+        instance = self._deferring_instance(mock_c_instance_for_script, 3)
+        responses = []
+        instance._command_queue.put(Command("d", "not_yet", {}, responses.append))
+        instance._command_queue.put(Command("v", "get_server_stats", {},
+                                            responses.append, PRIORITY_READ))
+        instance.update_display()
+        assert [r["id"] for r in responses] == ["v"]
+        assert instance._command_queue.qsize() == 1
+        instance.update_display()
+        instance.update_display()
+        assert responses[-1] == {"id": "d", "ok": True, "result": {"calls": 3}}
+        assert instance._stats["deferred"] == 2
+        instance.disconnect()
+
+    def test_deadline_still_applies(self, mock_c_instance_for_script):
+        instance = self._deferring_instance(mock_c_instance_for_script, 99)
+        responses = []
+        instance._command_queue.put(Command(
+            "d", "not_yet", {}, responses.append,
+            deadline=time.monotonic() + 0.01))
+        instance.update_display()
+        time.sleep(0.02)
+        instance.update_display()
+        assert responses[0]["code"] == "EXPIRED"
+        instance.disconnect()
+
+    def test_batch_entry_not_ready(self, mock_c_instance_for_script):
+        instance = self._deferring_instance(mock_c_instance_for_script, 99)
+        result = instance._batch(None, {"commands": [
+            {"action": "get_server_stats"}, {"action": "not_yet"}]})
+        assert result["results"][1]["code"] == "NOT_READY"
+        assert result["errors"] == 1
+        instance.disconnect()
+
+    def test_browser_index_advances_on_tick(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        instance._execute("refresh_browser_index", {})
+        instance.update_display()
+        stats = instance._execute("get_server_stats", {})["result"]
+        assert stats["browser_index"]["complete"] is True
+        instance.disconnect()
+
+
+class TestDeadlinesAndCancel:
+    """Test that expired or cancelled commands are dropped, not run."""
+
+    def test_expired_command_not_run(self, mock_c_instance_for_script, mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        instance._command_queue.put(Command(
+            "old", "set_metronome", {"enabled": True}, responses.append,
+            deadline=time.monotonic() - 1.0))
+        instance._command_queue.put(Command(
+            "fresh", "set_tempo", {"bpm": 100}, responses.append,
+            deadline=time.monotonic() + 10.0))
+        instance.update_display()
+        by_id = {r["id"]: r for r in responses}
+        assert by_id["old"]["code"] == "EXPIRED"
+        assert by_id["fresh"]["ok"] is True
+        assert mock_song.tempo == 100
+        assert mock_song.metronome is False
+        assert instance._stats["expired"] == 1
+        instance.disconnect()
+
+    def test_cancel_is_scoped_to_client(self, mock_c_instance_for_script,
+                                        mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+
+        class _Client(object):
+            def __init__(self):
+                self.sent = []
+
+            def send_message(self, msg):
+                self.sent.append(msg)
+
+        a, b = _Client(), _Client()
+        instance._on_client_line(a, json.dumps(
+            {"id": "r1", "action": "set_tempo", "params": {"bpm": 95}}))
+        instance._on_client_line(b, json.dumps(
+            {"id": "c1", "action": "cancel", "params": {"id": "r1"}}))
+        assert b.sent[0]["result"]["cancelled"] is False
+
+        instance._on_client_line(a, json.dumps(
+            {"id": "c2", "action": "cancel", "params": {"id": "r1"}}))
+        assert a.sent[0]["id"] == "c2"
+        assert a.sent[0]["result"]["cancelled"] is True
+
+        instance.update_display()
+        assert a.sent[1]["id"] == "r1"
+        assert a.sent[1]["code"] == "CANCELLED"
+        assert mock_song.tempo == 120.0
+        assert instance._stats["cancelled"] == 1
+        instance.disconnect()
+
+    def test_cancelled_survivor_promotes_superseded(self, mock_c_instance_for_script,
+                                                   mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        a, b = object(), object()
+        responses = []
+        volume = {"track_index": 0, "value": 0.3}
+        instance._command_queue.put(Command(
+            "b1", "set_track_volume", volume, responses.append, client=b))
+        instance._command_queue.put(Command(
+            "a1", "set_track_volume", dict(volume, value=0.6), responses.append,
+            client=a))
+        assert instance._command_queue.coalesce() == 1
+        assert instance._command_queue.cancel(a, "a1") is True
+        instance.update_display()
+        by_id = {r["id"]: r for r in responses}
+        assert by_id["a1"]["code"] == "CANCELLED"
+        assert by_id["b1"]["ok"] is True
+        assert "coalesced" not in by_id["b1"]
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.3
+        instance.disconnect()
+
+    def test_expired_survivor_promotes_newest_live(self, mock_c_instance_for_script,
+                                                   mock_song):
+        instance = create_instance(mock_c_instance_for_script)
+        responses = []
+        for request_id, value, deadline in (
+                ("w0", 0.1, None), ("w1", 0.2, None),
+                ("w2", 0.3, time.monotonic() - 1.0),
+                ("w3", 0.4, time.monotonic() + 0.05)):
+            instance._command_queue.put(Command(
+                request_id, "set_track_volume",
+                {"track_index": 0, "value": value}, responses.append,
+                deadline=deadline))
+        instance._command_queue.coalesce()
+        time.sleep(0.06)  # w3, the survivor, expires after coalescing
+        instance.update_display()
+        by_id = {r["id"]: r for r in responses}
+        assert by_id["w3"]["code"] == "EXPIRED"
+        assert by_id["w2"]["code"] == "EXPIRED"
+        assert by_id["w1"]["ok"] is True
+        assert by_id["w0"]["coalesced"] is True
+        assert by_id["w0"]["result"]["volume"] == 0.2
+        assert mock_song.tracks[0].mixer_device.volume.value == 0.2
+        instance.disconnect()
+
+    def test_request_timeout_sets_deadline(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+
+        class _Client(object):
+            def send_message(self, msg):
+                pass
+
+        before = time.monotonic()
+        instance._on_client_line(_Client(), json.dumps(
+            {"id": "t", "action": "list_tracks", "params": {}, "timeout": 2.5}))
+        command = instance._command_queue.pop()
+        assert before + 2.0 < command.deadline < time.monotonic() + 3.0
+        instance.disconnect()
+
+
+class TestBackpressure:
+    """Test the bounded command queue and BUSY replies."""
+
+    def test_full_queue_replies_busy(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        instance._command_queue.max_size = 2
+
+        class _Client(object):
+            def __init__(self):
+                self.sent = []
+
+            def send_message(self, msg):
+                self.sent.append(msg)
+
+        client = _Client()
+        for i in range(3):
+            instance._on_client_line(client, json.dumps(
+                {"id": "q%d" % i, "action": "set_track_color",
+                 "params": {"track_index": 0, "color": i}}))
+
+        assert instance._command_queue.qsize() == 2
+        assert len(client.sent) == 1
+        busy = client.sent[0]
+        assert busy["id"] == "q2"
+        assert busy["code"] == "BUSY"
+        assert busy["retry_after"] > 0
+        assert instance._stats["busy"] == 1
+
+        # Draining frees room again
+        instance.update_display()
+        instance._on_client_line(client, json.dumps(
+            {"id": "q3", "action": "list_tracks", "params": {}}))
+        assert instance._command_queue.qsize() == 1
+        instance.disconnect()
+
+    def test_max_queue_from_env(self, mock_c_instance_for_script, monkeypatch):
+        monkeypatch.setenv("ABLETON_MCP_MAX_QUEUE", "16")
+        instance = create_instance(mock_c_instance_for_script)
+        assert instance._command_queue.max_size == 16
+        instance.disconnect()
+
+    def test_coalescing_frees_capacity(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        for i in range(4):
+            instance._command_queue.put(Command(
+                "v%d" % i, "set_track_volume",
+                {"track_index": 0, "value": 0.1 * i}, lambda r: None))
+        assert instance._command_queue.coalesce() == 3
+        assert instance._command_queue.qsize() == 1
+        instance.disconnect()
+
+
+class TestSnapshot:
+    """get_snapshot feeds client-side mirrors."""
+
+    def test_snapshot_contents(self, mock_c_instance_for_script):
+        instance = UltimateAbletonMCP(mock_c_instance_for_script)
+        snapshot = instance._execute("get_snapshot", {})["result"]
+        assert snapshot["tracks"] == instance._execute("list_tracks", {})["result"]["tracks"]
+        assert len(snapshot["clip_slots"]) == 2
+        assert snapshot["devices"][0] == ["Simpler"]
+        assert snapshot["mixer"][0] == {"volume": 0.85, "panning": 0.0}
+        assert "subscriptions" not in snapshot
+        instance.disconnect()
+
+    def test_events_precede_responses(self, mock_c_instance_for_script, mock_song):
+        instance = UltimateAbletonMCP(mock_c_instance_for_script)
+        messages = []
+
+        class Client(object):
+            send_message = staticmethod(messages.append)
+
+        client = Client()
+        instance._subscriptions.subscribe(client, {"topic": "tempo"})
+        instance._command_queue.put(Command(
+            "w1", "set_tempo", {"bpm": 133}, messages.append, client=client))
+        instance.update_display()
+        assert messages[0]["event"] == "tempo"
+        assert messages[1]["id"] == "w1"
+        instance.disconnect()
+
+
+class TestStreamedResponses:
+    """Chunked replies for requests sent with "stream": true."""
+
+    def test_list_fields_are_split(self):
+        frames = list(stream_frames(
+            {"ok": True, "result": {"notes": list(range(5)), "name": "A"}},
+            chunk_items=2))
+        assert [f["items"] for f in frames[:-1]] == [[0, 1], [2, 3], [4]]
+        assert [f["frame"] for f in frames[:-1]] == [0, 1, 2]
+        assert frames[-1] == {"ok": True, "done": True, "frames": 3,
+                              "result": {"name": "A"}}
+
+    def test_empty_list_stays_in_final_frame(self):
+        frames = list(stream_frames({"ok": True, "result": {"notes": []}}))
+        assert frames == [{"ok": True, "done": True, "frames": 0,
+                           "result": {"notes": []}}]
+
+    def test_error_is_single_final_frame(self):
+        frames = list(stream_frames({"ok": False, "error": "boom", "code": "X"}))
+        assert frames == [{"ok": False, "error": "boom", "code": "X",
+                           "done": True}]
+
+    def test_nested_lists_are_split_by_path(self):
+        from ultimate_ableton_mcp.connection import assemble_stream
+
+        categories = [{"name": "c%d" % c, "children": [
+            {"name": "f%d" % f, "children": list(range(3))} for f in range(3)]}
+            for c in range(2)]
+        result = {"categories": categories, "next_cursor": None}
+        frames = list(stream_frames({"ok": True, "result": result}, chunk_items=2))
+        assert frames[0]["key"] == "categories"
+        assert frames[0]["items"] == [{"name": "c0"}, {"name": "c1"}]
+        keys = [f["key"] for f in frames[:-1]]
+        assert ["categories", 0, "children"] in keys
+        assert ["categories", 1, "children", 2, "children"] in keys
+        assert max(len(f["items"]) for f in frames[:-1]) == 2
+        assert assemble_stream(frames) == result
+
+    def test_frames_are_built_lazily(self):
+        frames = stream_frames({"ok": True, "result": {"notes": list(range(5))}},
+                               chunk_items=2)
+        assert next(frames)["items"] == [0, 1]
+
+    def test_stream_command_replies_with_frames(self, mock_c_instance_for_script):
+        instance = UltimateAbletonMCP(mock_c_instance_for_script)
+        replies = []
+        instance._command_queue.put(Command(
+            "s1", "list_tracks", {}, replies.extend, PRIORITY_READ, stream=True))
+        instance.update_display()
+        assert all(r["id"] == "s1" for r in replies)
+        assert replies[-1]["done"] is True
+        tracks = [t for r in replies[:-1] for t in r["items"]]
+        assert [t["name"] for t in tracks] == ["Track 1", "Track 2"]
+        instance.disconnect()
+
+
+class TestTickBudget:
+    """Test the per-tick time budget on the queue drain."""
+
+    @staticmethod
+    def _slow_instance(c_instance, budget_ms):
+        instance = create_instance(c_instance)
+        instance._tick_budget = budget_ms / 1000.0
+        instance._dispatch["slow"] = lambda params: time.sleep(0.005) or {}
+        return instance
+
+    def test_budget_carries_work_over(self, mock_c_instance_for_script):
+        instance = self._slow_instance(mock_c_instance_for_script, 8)
+        rq = queue.Queue()
+        for i in range(10):
+            instance._command_queue.put(Command("s%d" % i, "slow", {}, rq.put))
+
+        instance.update_display()
+        first_tick = rq.qsize()
+        assert 1 <= first_tick < 10
+        assert instance._stats["budget_exhausted"] == 1
+
+        for _ in range(10):
+            instance.update_display()
+        assert rq.qsize() == 10
+        ids = [rq.get_nowait()["id"] for _ in range(10)]
+        assert ids == ["s%d" % i for i in range(10)]
+        instance.disconnect()
+
+    def test_deferred_commands_count_against_budget(self, mock_c_instance_for_script):
+        instance = self._slow_instance(mock_c_instance_for_script, 8)
+        calls = []
+
+        def slow_defer(params):
+            calls.append(params)
+            time.sleep(0.005)
+            raise DeferCommand("not ready")
+
+        instance._dispatch["slow_defer"] = slow_defer
+        for i in range(10):
+            instance._command_queue.put(Command("d%d" % i, "slow_defer", {},
+                                                lambda r: None))
+        instance.update_display()
+        assert 1 <= len(calls) < 10
+        assert instance._stats["budget_exhausted"] == 1
+        assert instance._command_queue.qsize() == 10
+        instance.disconnect()
+
+    def test_always_makes_progress(self, mock_c_instance_for_script):
+        instance = self._slow_instance(mock_c_instance_for_script, 0.001)
+        rq = queue.Queue()
+        for i in range(3):
+            instance._command_queue.put(Command("s%d" % i, "slow", {}, rq.put))
+        instance.update_display()
+        assert rq.qsize() == 1
+        instance.disconnect()
+
+    def test_zero_budget_is_unlimited(self, mock_c_instance_for_script):
+        instance = self._slow_instance(mock_c_instance_for_script, 0)
+        rq = queue.Queue()
+        for i in range(5):
+            instance._command_queue.put(Command("s%d" % i, "slow", {}, rq.put))
+        instance.update_display()
+        assert rq.qsize() == 5
+        assert instance._stats["budget_exhausted"] == 0
+        instance.disconnect()
+
+    def test_budget_from_env(self, mock_c_instance_for_script, monkeypatch):
+        monkeypatch.setenv("ABLETON_MCP_TICK_BUDGET_MS", "4")
+        instance = create_instance(mock_c_instance_for_script)
+        assert instance._tick_budget == pytest.approx(0.004)
+        instance.disconnect()
+
+    def test_server_stats(self, mock_c_instance_for_script):
+        instance = create_instance(mock_c_instance_for_script)
+        instance.update_display()
+        response = instance._execute("get_server_stats", {})
+        assert response["ok"] is True
+        assert response["result"]["ticks"] == 1
+        assert response["result"]["queued"] == 0
+        assert response["result"]["tick_budget_ms"] == pytest.approx(8.0)
+        instance.disconnect()
+
 
 class TestEndToEndProtocol:
     """Integration test: real TCP socket communication with the Remote Script."""
@@ -196,7 +871,7 @@ class TestEndToEndProtocol:
         os.environ["ABLETON_MCP_PORT"] = "0"
         instance = UltimateAbletonMCP(mock_c_instance)
         # Get the actual port
-        port = instance._server_socket.getsockname()[1]
+        port = instance._server.port
         yield instance, port
         instance.disconnect()
         os.environ.pop("ABLETON_MCP_PORT", None)
@@ -249,6 +924,205 @@ class TestEndToEndProtocol:
 
         client.close()
 
+    def test_pipelined_burst_in_one_tick(self, live_instance):
+        instance, port = live_instance
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(("localhost", port))
+
+        # Send the whole burst before Live gets a single tick
+        burst = "".join(
+            json.dumps({"id": "burst_%d" % i, "action": "get_session_state",
+                        "params": {}}) + "\n"
+            for i in range(5))
+        client.sendall(burst.encode("utf-8"))
+
+        time.sleep(0.1)
+        assert instance._command_queue.qsize() == 5
+        instance.update_display()
+
+        buffer = ""
+        while buffer.count("\n") < 5:
+            buffer += client.recv(65536).decode("utf-8")
+        ids = [json.loads(line)["id"] for line in buffer.strip().split("\n")]
+        assert ids == ["burst_%d" % i for i in range(5)]
+
+        client.close()
+
+    def test_clients_share_one_io_thread(self, live_instance):
+        instance, port = live_instance
+        threads_before = threading.active_count()
+
+        clients = []
+        for i in range(4):
+            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            client.settimeout(5.0)
+            client.connect(("localhost", port))
+            cmd = {"id": "c%d" % i, "action": "list_tracks", "params": {}}
+            client.sendall((json.dumps(cmd) + "\n").encode("utf-8"))
+            clients.append(client)
+
+        time.sleep(0.1)
+        assert threading.active_count() == threads_before
+        assert instance._server.client_count == 4
+        instance.update_display()
+
+        for i, client in enumerate(clients):
+            response = json.loads(client.recv(65536).decode("utf-8").strip())
+            assert response["id"] == "c%d" % i
+            client.close()
+
+    def test_large_response_is_buffered(self, live_instance):
+        instance, port = live_instance
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(("localhost", port))
+        client.sendall(b'{"id": "big", "action": "list_tracks", "params": {}}\n')
+        time.sleep(0.1)
+
+        # Replace the reply with a payload far larger than the socket buffer
+        command = instance._command_queue.pop()
+        command.reply({"id": "big", "ok": True, "result": {"blob": "x" * 4000000}})
+
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            buffer += client.recv(65536)
+        assert len(json.loads(buffer)["result"]["blob"]) == 4000000
+        client.close()
+
+    def test_stream_through_client(self, live_instance):
+        from ultimate_ableton_mcp.connection import AbletonConnection, assemble_stream
+
+        instance, port = live_instance
+        conn = AbletonConnection()
+        conn.host = "localhost"
+        conn.port = port
+        frames = conn.stream("get_session_state")
+        pump = threading.Timer(0.1, instance.update_display)
+        pump.start()
+        result = assemble_stream(frames)
+        pump.join()
+        assert result["tempo"] == 120.0
+        assert len(result["tracks"]) == 2
+        conn.disconnect()
+
+    def test_reply_encoded_off_the_calling_thread(self, live_instance):
+        instance, port = live_instance
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(("localhost", port))
+        client.sendall(b'{"id": "r", "action": "list_tracks"}\n')
+        time.sleep(0.1)
+
+        command = instance._command_queue.pop()
+        command.reply({"id": "r", "ok": True, "result": {"x": object()}})  # no raise
+
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            buffer += client.recv(65536)
+        reply = json.loads(buffer)
+        assert reply["id"] == "r" and reply["code"] == "EXECUTION_ERROR"
+        assert "done" not in reply
+        client.close()
+
+    def test_unencodable_frame_ends_stream(self, live_instance):
+        instance, port = live_instance
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(("localhost", port))
+        client.sendall(b'{"id": "s", "action": "list_tracks", "stream": true}\n')
+        time.sleep(0.1)
+
+        command = instance._command_queue.pop()
+        command.reply(iter([{"id": "s", "ok": True, "frame": 0, "key": "x",
+                             "items": [object()]},
+                            {"id": "s", "ok": True, "done": True}]))
+
+        buffer = b""
+        while not buffer.endswith(b"\n"):
+            buffer += client.recv(65536)
+        frame = json.loads(buffer)
+        assert frame["id"] == "s" and frame["ok"] is False and frame["done"]
+        client.close()
+
+    def test_subscription_events_pushed(self, live_instance, mock_song):
+        instance, port = live_instance
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(("localhost", port))
+        cmd = {"id": "sub", "action": "subscribe", "params": {"topic": "tempo"}}
+        client.sendall((json.dumps(cmd) + "\n").encode("utf-8"))
+        time.sleep(0.1)
+        instance.update_display()
+        response = json.loads(client.recv(65536).decode("utf-8").strip())
+        assert response["result"]["value"] == 120.0
+
+        mock_song.tempo = 125.0
+        mock_song.tempo = 126.0
+        instance.update_display()
+        event = json.loads(client.recv(65536).decode("utf-8").strip())
+        assert event == {"event": "tempo", "params": {}, "value": 126.0,
+                         "tick": event["tick"]}
+        assert instance._get_server_stats({})["events"] == 1
+
+        # Closing the socket releases the Live listener on the next tick
+        client.close()
+        deadline = time.monotonic() + 2.0
+        while instance._server.client_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        instance.update_display()
+        assert len(instance._subscriptions) == 0
+        assert mock_song._listeners["tempo"] == []
+
+    async def test_mirror_through_client(self, live_instance, mock_song):
+        from ultimate_ableton_mcp.connection import AsyncAbletonConnection
+
+        instance, port = live_instance
+        running = threading.Event()
+        running.set()
+
+        def pump():
+            while running.is_set():
+                instance.update_display()
+                time.sleep(0.005)
+
+        pumper = threading.Thread(target=pump, daemon=True)
+        pumper.start()
+        conn = AsyncAbletonConnection(mirror=True)
+        conn.host = "localhost"
+        conn.port = port
+        try:
+            tracks = await conn.send("list_tracks")  # loads the snapshot
+            executed = instance._stats["executed"]
+            assert await conn.send("list_tracks") == tracks
+            assert instance._stats["executed"] == executed
+
+            # A write's own events land in the mirror before its response
+            await conn.send("set_track_mute", {"track_index": 0, "enabled": True})
+            assert (await conn.send("list_tracks"))["tracks"][0]["muted"] is True
+            assert conn.mirror.hits == 3
+            assert conn.drain_events() == []  # mirror events stay internal
+        finally:
+            running.clear()
+            pumper.join()
+            await conn.disconnect()
+        assert conn.mirror.stale is True
+
+    def test_disconnect_is_prompt(self, mock_song, mock_c_instance):
+        os.environ["ABLETON_MCP_PORT"] = "0"
+        try:
+            instance = UltimateAbletonMCP(mock_c_instance)
+        finally:
+            os.environ.pop("ABLETON_MCP_PORT", None)
+        start = time.monotonic()
+        instance.disconnect()
+        assert time.monotonic() - start < 0.5
+
     def test_error_command(self, live_instance):
         instance, port = live_instance
 
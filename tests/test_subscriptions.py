@@ -0,0 +1,275 @@
+"""Tests for the Remote Script LOM subscriptions."""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "remote_script"))
+
+from UltimateAbletonMCP.subscriptions import SubscriptionManager
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def manager(mock_song):
+    return SubscriptionManager(mock_song, lambda msg: None)
+
+
+class TestSubscribe:
+    def test_returns_current_value(self, manager):
+        result = manager.subscribe(FakeClient(), {"topic": "tempo"})
+        assert result == {"topic": "tempo", "params": {}, "value": 120.0,
+                          "subscribers": 1}
+
+    def test_registers_live_listener(self, manager, mock_song):
+        manager.subscribe(FakeClient(), {"topic": "is_playing"})
+        assert len(mock_song._listeners["is_playing"]) == 1
+
+    def test_subscribers_share_one_listener(self, manager, mock_song):
+        manager.subscribe(FakeClient(), {"topic": "tempo"})
+        result = manager.subscribe(FakeClient(), {"topic": "tempo"})
+        assert result["subscribers"] == 2
+        assert len(mock_song._listeners["tempo"]) == 1
+        assert len(manager) == 1
+
+    def test_scoped_topic(self, manager, mock_song):
+        result = manager.subscribe(FakeClient(),
+                                   {"topic": "track.mute", "track_index": 1})
+        assert result["params"] == {"track_index": 1}
+        assert len(mock_song.tracks[1]._listeners["mute"]) == 1
+
+    def test_unknown_topic(self, manager):
+        with pytest.raises(ValueError, match="Unknown topic"):
+            manager.subscribe(FakeClient(), {"topic": "nope"})
+
+    def test_missing_index(self, manager):
+        with pytest.raises(ValueError, match="track_index"):
+            manager.subscribe(FakeClient(), {"topic": "track.solo"})
+
+    def test_bad_index(self, manager):
+        with pytest.raises(IndexError):
+            manager.subscribe(FakeClient(), {"topic": "track.arm", "track_index": 9})
+
+    def test_requires_client(self, manager):
+        with pytest.raises(ValueError, match="client"):
+            manager.subscribe(None, {"topic": "tempo"})
+
+
+class TestFlush:
+    def test_change_pushes_event(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        mock_song.tempo = 128.0
+        assert manager.flush() == 1
+        assert client.messages == [
+            {"event": "tempo", "params": {}, "value": 128.0, "tick": 0}]
+
+    def test_repeat_changes_coalesce(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        for bpm in (121.0, 122.0, 123.0):
+            mock_song.tempo = bpm
+        manager.flush()
+        assert [m["value"] for m in client.messages] == [123.0]
+
+    def test_unchanged_value_not_sent(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        mock_song.tempo = 130.0
+        mock_song.tempo = 120.0
+        assert manager.flush() == 0
+
+    def test_no_change_no_event(self, manager):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        assert manager.flush() == 0
+        assert client.messages == []
+
+    def test_track_list_event(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tracks"})
+        mock_song.create_audio_track(-1)
+        manager.flush()
+        assert client.messages[0]["value"] == ["Track 1", "Track 2", "New Audio"]
+
+    def test_clip_playing_status(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "clip_slot.playing_status",
+                                   "track_index": 0, "scene_index": 2})
+        mock_song.tracks[0].clip_slots[2].fire()
+        manager.flush()
+        assert client.messages == [{
+            "event": "clip_slot.playing_status",
+            "params": {"track_index": 0, "scene_index": 2}, "value": 1,
+            "tick": 0}]
+
+    def test_volume_event(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "track.volume", "track_index": 0})
+        mock_song.tracks[0].mixer_device.volume.value = 0.5
+        manager.flush()
+        assert client.messages[0]["value"] == 0.5
+
+    def test_every_subscriber_gets_event(self, manager, mock_song):
+        a, b = FakeClient(), FakeClient()
+        manager.subscribe(a, {"topic": "metronome"})
+        manager.subscribe(b, {"topic": "metronome"})
+        mock_song.metronome = True
+        assert manager.flush() == 2
+        assert a.messages == b.messages
+
+
+class TestIndexTracking:
+    def test_event_carries_current_index(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "track.mute", "track_index": 0})
+        mock_song.create_midi_track(0)
+        mock_song.tracks[1].mute = True
+        manager.flush()
+        assert client.messages == [{"event": "track.mute",
+                                    "params": {"track_index": 1},
+                                    "value": True, "tick": 0}]
+
+    def test_resubscribe_after_move_finds_new_target(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "track.name", "track_index": 0})
+        mock_song.create_midi_track(0)
+        result = manager.subscribe(client, {"topic": "track.name", "track_index": 0})
+        assert result["value"] == "New MIDI"
+        assert result["subscribers"] == 1
+        assert len(manager) == 2
+
+    def test_deleted_target_dropped(self, manager, mock_song):
+        track = mock_song.tracks[1]
+        manager.subscribe(FakeClient(), {"topic": "track.solo", "track_index": 1})
+        mock_song.delete_track(1)
+        manager.flush()
+        assert len(manager) == 0
+        assert track._listeners["solo"] == []
+
+    def test_scene_index_follows_scene(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "scene.name", "scene_index": 1})
+        mock_song.create_scene(0)
+        mock_song.scenes[2].name = "Chorus"
+        manager.flush()
+        assert client.messages[0]["params"] == {"scene_index": 2}
+
+    def test_clear_removes_layout_listeners(self, manager, mock_song):
+        manager.subscribe(FakeClient(), {"topic": "track.arm", "track_index": 0})
+        manager.clear()
+        assert mock_song._listeners["tracks"] == []
+        assert mock_song._listeners["scenes"] == []
+
+
+class TestUnsubscribe:
+    def test_last_subscriber_removes_listener(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        result = manager.unsubscribe(client, {"topic": "tempo"})
+        assert result == {"removed": 1, "subscriptions": 0}
+        assert mock_song._listeners["tempo"] == []
+
+    def test_other_subscriber_keeps_listener(self, manager, mock_song):
+        a, b = FakeClient(), FakeClient()
+        manager.subscribe(a, {"topic": "tempo"})
+        manager.subscribe(b, {"topic": "tempo"})
+        manager.unsubscribe(a, {"topic": "tempo"})
+        mock_song.tempo = 99.0
+        manager.flush()
+        assert a.messages == []
+        assert len(b.messages) == 1
+
+    def test_without_topic_removes_all(self, manager):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        manager.subscribe(client, {"topic": "track.mute", "track_index": 0})
+        assert manager.unsubscribe(client, {})["removed"] == 2
+        assert len(manager) == 0
+
+    def test_closed_client_cleaned_on_flush(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        manager.client_closed(client)
+        mock_song.tempo = 90.0
+        manager.flush()
+        assert client.messages == []
+        assert len(manager) == 0
+        assert mock_song._listeners["tempo"] == []
+
+    def test_clear(self, manager, mock_song):
+        manager.subscribe(FakeClient(), {"topic": "tempo"})
+        manager.subscribe(FakeClient(), {"topic": "scenes"})
+        manager.clear()
+        assert len(manager) == 0
+        assert mock_song._listeners["scenes"] == []
+
+
+class TestSubscribeAll:
+    def test_covers_every_target(self, manager, mock_song):
+        total = manager.subscribe_all(FakeClient())
+        assert total == len(manager)
+        assert len(mock_song.tracks[1].clip_slots[1]._listeners["playing_status"]) == 1
+        assert len(mock_song.scenes[1]._listeners["name"]) == 1
+
+    def test_mirror_events_are_tagged(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe_all(client)
+        mock_song.tempo = 101.0
+        manager.flush()
+        assert client.messages[0]["mirror"] is True
+
+    def test_explicit_subscription_wins(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe_all(client)
+        manager.subscribe(client, {"topic": "tempo"})
+        mock_song.tempo = 101.0
+        manager.flush()
+        assert len(client.messages) == 1
+        assert "mirror" not in client.messages[0]
+
+    def test_kept_apart_from_explicit(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe(client, {"topic": "tempo"})
+        manager.subscribe_all(client)
+        manager.subscribe_all(client)  # resync replaces only mirror subs
+        assert manager.unsubscribe(client, {})["removed"] == 1
+        assert len(mock_song._listeners["tempo"]) == 1  # mirror still holds it
+
+    def test_resync_keeps_existing_listeners(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe_all(client)
+        slot_listeners = list(mock_song.tracks[1].clip_slots[1]._listeners["has_clip"])
+        assert manager.subscribe_all(client) == len(manager)
+        assert mock_song.tracks[1].clip_slots[1]._listeners["has_clip"] == slot_listeners
+
+    def test_resync_adds_and_drops_only_the_difference(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe_all(client)
+        old = mock_song.tracks[0]
+        kept = list(mock_song.tracks[1]._listeners["mute"])
+        mock_song.create_audio_track(-1)
+        mock_song.delete_track(0)
+        total = manager.subscribe_all(client)
+        assert total == len(manager)
+        assert mock_song.tracks[0]._listeners["mute"] == kept  # moved, not rebuilt
+        assert len(mock_song.tracks[1]._listeners["mute"]) == 1  # new track
+        assert old._listeners["mute"] == []
+        mock_song.tracks[0].mute = True
+        manager.flush()
+        mutes = [m for m in client.messages if m["event"] == "track.mute"]
+        assert [m["params"] for m in mutes] == [{"track_index": 0}]
+
+    def test_closed_client_releases_mirror(self, manager, mock_song):
+        client = FakeClient()
+        manager.subscribe_all(client)
+        manager.client_closed(client)
+        manager.flush()
+        assert len(manager) == 0
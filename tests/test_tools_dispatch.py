@@ -1,16 +1,18 @@
 """Tests for MCP tool dispatch — verifies each tool routes operations
 to the correct connection.send() calls with proper parameters."""
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 # We need to mock connection before importing tools
 _mock_conn = MagicMock()
+_mock_conn.send = AsyncMock()
 
 
-def _mock_get_connection():
+async def _mock_get_connection():
     return _mock_conn
 
 
@@ -25,13 +27,14 @@ def reset_mock():
 @pytest.fixture(autouse=True)
 def patch_connection():
     """Patch get_connection for all tool tests."""
-    with patch("ultimate_ableton_mcp.tools.session.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.transport.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.track.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.clip.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.device.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.scene.get_connection", _mock_get_connection), \
-         patch("ultimate_ableton_mcp.tools.browser.get_connection", _mock_get_connection):
+    with patch("ultimate_ableton_mcp.tools.session.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.transport.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.track.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.clip.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.device.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.scene.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.browser.get_async_connection", _mock_get_connection), \
+         patch("ultimate_ableton_mcp.tools.browser.get_browser_cache", lambda: None):
         yield
 
 
@@ -48,59 +51,93 @@ from ultimate_ableton_mcp.tools.browser import ableton_browser
 class TestSessionDispatch:
     """Test ableton_session routes to correct actions."""
 
-    def test_get_state(self):
+    async def test_get_state(self):
         _mock_conn.send.return_value = {"tempo": 120}
-        result = ableton_session("get_state")
+        result = await ableton_session("get_state")
         _mock_conn.send.assert_called_once_with("get_session_state")
         assert json.loads(result)["tempo"] == 120
 
-    def test_set_tempo(self):
-        ableton_session("set_tempo", bpm=140.0)
+    async def test_set_tempo(self):
+        await ableton_session("set_tempo", bpm=140.0)
         _mock_conn.send.assert_called_once_with("set_tempo", {"bpm": 140.0})
 
-    def test_set_time_signature(self):
-        ableton_session("set_time_signature", numerator=3, denominator=8)
+    async def test_set_time_signature(self):
+        await ableton_session("set_time_signature", numerator=3, denominator=8)
         _mock_conn.send.assert_called_once_with(
             "set_time_signature", {"numerator": 3, "denominator": 8})
 
-    def test_set_loop(self):
-        ableton_session("set_loop", start=4.0, length=8.0)
+    async def test_set_loop(self):
+        await ableton_session("set_loop", start=4.0, length=8.0)
         _mock_conn.send.assert_called_once_with(
             "set_loop", {"start": 4.0, "length": 8.0})
 
-    def test_set_metronome(self):
-        ableton_session("set_metronome", enabled=True)
+    async def test_set_metronome(self):
+        await ableton_session("set_metronome", enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_metronome", {"enabled": True})
 
-    def test_tap_tempo(self):
-        ableton_session("tap_tempo")
+    async def test_tap_tempo(self):
+        await ableton_session("tap_tempo")
         _mock_conn.send.assert_called_once_with("tap_tempo")
 
-    def test_undo(self):
-        ableton_session("undo")
+    async def test_undo(self):
+        await ableton_session("undo")
         _mock_conn.send.assert_called_once_with("undo")
 
-    def test_redo(self):
-        ableton_session("redo")
+    async def test_redo(self):
+        await ableton_session("redo")
         _mock_conn.send.assert_called_once_with("redo")
 
-    def test_set_arrangement_overdub(self):
-        ableton_session("set_arrangement_overdub", enabled=True)
+    async def test_set_arrangement_overdub(self):
+        await ableton_session("set_arrangement_overdub", enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_arrangement_overdub", {"enabled": True})
 
-    def test_set_session_automation_record(self):
-        ableton_session("set_session_automation_record", enabled=True)
+    async def test_set_session_automation_record(self):
+        await ableton_session("set_session_automation_record", enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_session_automation_record", {"enabled": True})
 
-    def test_re_enable_automation(self):
-        ableton_session("re_enable_automation")
+    async def test_re_enable_automation(self):
+        await ableton_session("re_enable_automation")
         _mock_conn.send.assert_called_once_with("re_enable_automation")
 
-    def test_unknown_operation(self):
-        result = ableton_session("nonexistent")
+    async def test_subscribe(self):
+        await ableton_session("subscribe", topic="tempo")
+        _mock_conn.send.assert_called_once_with("subscribe", {"topic": "tempo"})
+
+    async def test_subscribe_scoped(self):
+        await ableton_session("subscribe", topic="clip_slot.playing_status",
+                              track_index=1, scene_index=0)
+        _mock_conn.send.assert_called_once_with(
+            "subscribe", {"topic": "clip_slot.playing_status",
+                          "track_index": 1, "scene_index": 0})
+
+    async def test_unsubscribe(self):
+        await ableton_session("unsubscribe", topic="track.mute", track_index=0)
+        _mock_conn.send.assert_called_once_with(
+            "unsubscribe", {"topic": "track.mute", "track_index": 0})
+
+    async def test_get_events(self):
+        _mock_conn.drain_events.return_value = [
+            {"event": "tempo", "params": {}, "value": 128.0}]
+        result = json.loads(await ableton_session("get_events"))
+        assert result["events"][0]["value"] == 128.0
+        _mock_conn.send.assert_not_called()
+
+    async def test_mirror_status_disabled(self):
+        _mock_conn.mirror = None
+        result = json.loads(await ableton_session("mirror_status"))
+        assert result == {"enabled": False}
+
+    async def test_cache_stats(self):
+        _mock_conn.cache.stats.return_value = {"hits": 3, "misses": 1}
+        result = json.loads(await ableton_session("cache_stats"))
+        assert result["hits"] == 3
+        _mock_conn.send.assert_not_called()
+
+    async def test_unknown_operation(self):
+        result = await ableton_session("nonexistent")
         assert "Unknown operation" in result
         _mock_conn.send.assert_not_called()
 
@@ -108,260 +145,298 @@ class TestSessionDispatch:
 class TestTransportDispatch:
     """Test ableton_transport routes to correct actions."""
 
-    def test_play(self):
-        ableton_transport("play")
+    async def test_play(self):
+        await ableton_transport("play")
         _mock_conn.send.assert_called_once_with("start_playback")
 
-    def test_stop(self):
-        ableton_transport("stop")
+    async def test_stop(self):
+        await ableton_transport("stop")
         _mock_conn.send.assert_called_once_with("stop_playback")
 
-    def test_continue(self):
-        ableton_transport("continue")
+    async def test_continue(self):
+        await ableton_transport("continue")
         _mock_conn.send.assert_called_once_with("continue_playback")
 
-    def test_record(self):
-        ableton_transport("record", enabled=True)
+    async def test_record(self):
+        await ableton_transport("record", enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_record", {"enabled": True})
 
-    def test_seek(self):
-        ableton_transport("seek", time=16.0)
+    async def test_seek(self):
+        await ableton_transport("seek", time=16.0)
         _mock_conn.send.assert_called_once_with("seek", {"time": 16.0})
 
-    def test_jump_to_cue_next(self):
-        ableton_transport("jump_to_cue", direction="next")
+    async def test_jump_to_cue_next(self):
+        await ableton_transport("jump_to_cue", direction="next")
         _mock_conn.send.assert_called_once_with(
             "jump_to_cue", {"direction": "next"})
 
-    def test_jump_to_cue_prev(self):
-        ableton_transport("jump_to_cue", direction="prev")
+    async def test_jump_to_cue_prev(self):
+        await ableton_transport("jump_to_cue", direction="prev")
         _mock_conn.send.assert_called_once_with(
             "jump_to_cue", {"direction": "prev"})
 
-    def test_scroll_to_time(self):
-        ableton_transport("scroll_to_time", time=32.0)
+    async def test_scroll_to_time(self):
+        await ableton_transport("scroll_to_time", time=32.0)
         _mock_conn.send.assert_called_once_with(
             "scroll_to_time", {"time": 32.0})
 
-    def test_show_view(self):
-        ableton_transport("show_view", view="arrangement")
+    async def test_show_view(self):
+        await ableton_transport("show_view", view="arrangement")
         _mock_conn.send.assert_called_once_with(
             "show_view", {"view": "arrangement"})
 
-    def test_unknown_operation(self):
-        result = ableton_transport("warp")
+    async def test_unknown_operation(self):
+        result = await ableton_transport("warp")
         assert "Unknown operation" in result
 
 
 class TestTrackDispatch:
     """Test ableton_track routes to correct actions."""
 
-    def test_list(self):
-        ableton_track("list")
+    async def test_list(self):
+        await ableton_track("list")
         _mock_conn.send.assert_called_once_with("list_tracks")
 
-    def test_get(self):
-        ableton_track("get", track_index=2)
+    async def test_get(self):
+        await ableton_track("get", track_index=2)
         _mock_conn.send.assert_called_once_with(
             "get_track", {"track_index": 2})
 
-    def test_create_midi(self):
-        ableton_track("create", type="midi", name="Bass", index=0)
+    async def test_create_midi(self):
+        await ableton_track("create", type="midi", name="Bass", index=0)
         _mock_conn.send.assert_called_once_with(
             "create_track", {"type": "midi", "name": "Bass", "index": 0})
 
-    def test_create_audio(self):
-        ableton_track("create", type="audio")
+    async def test_create_audio(self):
+        await ableton_track("create", type="audio")
         _mock_conn.send.assert_called_once_with(
             "create_track", {"type": "audio", "name": "", "index": -1})
 
-    def test_delete(self):
-        ableton_track("delete", track_index=3)
+    async def test_delete(self):
+        await ableton_track("delete", track_index=3)
         _mock_conn.send.assert_called_once_with(
             "delete_track", {"track_index": 3})
 
-    def test_duplicate(self):
-        ableton_track("duplicate", track_index=1)
+    async def test_duplicate(self):
+        await ableton_track("duplicate", track_index=1)
         _mock_conn.send.assert_called_once_with(
             "duplicate_track", {"track_index": 1})
 
-    def test_rename(self):
-        ableton_track("rename", track_index=0, name="Lead Synth")
+    async def test_rename(self):
+        await ableton_track("rename", track_index=0, name="Lead Synth")
         _mock_conn.send.assert_called_once_with(
             "rename_track", {"track_index": 0, "name": "Lead Synth"})
 
-    def test_set_volume(self):
-        ableton_track("set_volume", track_index=0, value=0.75)
+    async def test_set_volume(self):
+        await ableton_track("set_volume", track_index=0, value=0.75)
         _mock_conn.send.assert_called_once_with(
             "set_track_volume", {"track_index": 0, "value": 0.75})
 
-    def test_set_pan(self):
-        ableton_track("set_pan", track_index=0, value=-0.5)
+    async def test_set_pan(self):
+        await ableton_track("set_pan", track_index=0, value=-0.5)
         _mock_conn.send.assert_called_once_with(
             "set_track_pan", {"track_index": 0, "value": -0.5})
 
-    def test_set_mute(self):
-        ableton_track("set_mute", track_index=0, enabled=True)
+    async def test_set_mute(self):
+        await ableton_track("set_mute", track_index=0, enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_track_mute", {"track_index": 0, "enabled": True})
 
-    def test_set_solo(self):
-        ableton_track("set_solo", track_index=0, enabled=True)
+    async def test_set_solo(self):
+        await ableton_track("set_solo", track_index=0, enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_track_solo", {"track_index": 0, "enabled": True})
 
-    def test_set_arm(self):
-        ableton_track("set_arm", track_index=0, enabled=True)
+    async def test_set_arm(self):
+        await ableton_track("set_arm", track_index=0, enabled=True)
         _mock_conn.send.assert_called_once_with(
             "set_track_arm", {"track_index": 0, "enabled": True})
 
-    def test_set_color(self):
-        ableton_track("set_color", track_index=0, color=42)
+    async def test_set_color(self):
+        await ableton_track("set_color", track_index=0, color=42)
         _mock_conn.send.assert_called_once_with(
             "set_track_color", {"track_index": 0, "color": 42})
 
-    def test_set_send(self):
-        ableton_track("set_send", track_index=0, send_index=1, value=0.6)
+    async def test_set_send(self):
+        await ableton_track("set_send", track_index=0, send_index=1, value=0.6)
         _mock_conn.send.assert_called_once_with(
             "set_track_send",
             {"track_index": 0, "send_index": 1, "value": 0.6})
 
-    def test_set_input_routing(self):
-        ableton_track("set_input_routing", track_index=0,
+    async def test_set_input_routing(self):
+        await ableton_track("set_input_routing", track_index=0,
                       routing_type="All Ins", channel="1/2")
         _mock_conn.send.assert_called_once_with(
             "set_track_input_routing",
             {"track_index": 0, "routing_type": "All Ins", "channel": "1/2"})
 
-    def test_set_output_routing(self):
-        ableton_track("set_output_routing", track_index=0,
+    async def test_set_output_routing(self):
+        await ableton_track("set_output_routing", track_index=0,
                       routing_type="Sends Only")
         _mock_conn.send.assert_called_once_with(
             "set_track_output_routing",
             {"track_index": 0, "routing_type": "Sends Only", "channel": ""})
 
-    def test_freeze(self):
-        ableton_track("freeze", track_index=0)
+    async def test_freeze(self):
+        await ableton_track("freeze", track_index=0)
         _mock_conn.send.assert_called_once_with(
             "freeze_track", {"track_index": 0})
 
-    def test_flatten(self):
-        ableton_track("flatten", track_index=0)
+    async def test_flatten(self):
+        await ableton_track("flatten", track_index=0)
         _mock_conn.send.assert_called_once_with(
             "flatten_track", {"track_index": 0})
 
-    def test_stop_all_clips(self):
-        ableton_track("stop_all_clips", track_index=0)
+    async def test_stop_all_clips(self):
+        await ableton_track("stop_all_clips", track_index=0)
         _mock_conn.send.assert_called_once_with(
             "stop_track_clips", {"track_index": 0})
 
-    def test_unknown_operation(self):
-        result = ableton_track("warp")
+    async def test_get_mixer(self):
+        await ableton_track("get_mixer")
+        _mock_conn.send.assert_called_once_with("get_mixer")
+
+    async def test_set_mixer(self):
+        changes = [{"track_index": 0, "volume": 0.5},
+                   {"kind": "master", "pan": 0.1}]
+        await ableton_track("set_mixer", changes=changes)
+        _mock_conn.send.assert_called_once_with(
+            "set_mixer", {"changes": changes})
+
+    async def test_get_send_matrix(self):
+        await ableton_track("get_send_matrix")
+        _mock_conn.send.assert_called_once_with("get_send_matrix")
+
+    async def test_set_send_matrix(self):
+        await ableton_track("set_send_matrix", cells=[[0, 1, 0.5]])
+        _mock_conn.send.assert_called_once_with(
+            "set_send_matrix", {"cells": [[0, 1, 0.5]]})
+
+    async def test_unknown_operation(self):
+        result = await ableton_track("warp")
         assert "Unknown operation" in result
 
 
 class TestClipDispatch:
     """Test ableton_clip routes to correct actions."""
 
-    def test_create(self):
-        ableton_clip("create", track_index=0, scene_index=0, length=8.0)
+    async def test_create(self):
+        await ableton_clip("create", track_index=0, scene_index=0, length=8.0)
         _mock_conn.send.assert_called_once_with(
             "create_clip",
             {"track_index": 0, "scene_index": 0, "length": 8.0})
 
-    def test_delete(self):
-        ableton_clip("delete", track_index=0, scene_index=1)
+    async def test_delete(self):
+        await ableton_clip("delete", track_index=0, scene_index=1)
         _mock_conn.send.assert_called_once_with(
             "delete_clip", {"track_index": 0, "scene_index": 1})
 
-    def test_fire(self):
-        ableton_clip("fire", track_index=0, scene_index=0)
+    async def test_fire(self):
+        await ableton_clip("fire", track_index=0, scene_index=0)
         _mock_conn.send.assert_called_once_with(
             "fire_clip", {"track_index": 0, "scene_index": 0})
 
-    def test_add_notes(self):
+    async def test_add_notes(self):
         notes = [{"pitch": 60, "start": 0, "duration": 1, "velocity": 100}]
-        ableton_clip("add_notes", track_index=0, scene_index=0, notes=notes)
+        await ableton_clip("add_notes", track_index=0, scene_index=0, notes=notes)
         _mock_conn.send.assert_called_once_with(
             "add_clip_notes",
             {"track_index": 0, "scene_index": 0, "notes": notes})
 
-    def test_get_notes(self):
-        ableton_clip("get_notes", track_index=0, scene_index=0)
+    async def test_get_notes(self):
+        await ableton_clip("get_notes", track_index=0, scene_index=0)
         _mock_conn.send.assert_called_once_with(
             "get_clip_notes", {"track_index": 0, "scene_index": 0})
 
-    def test_set_notes(self):
+    async def test_set_notes(self):
         notes = [{"pitch": 64, "start": 0, "duration": 2, "velocity": 80}]
-        ableton_clip("set_notes", track_index=0, scene_index=0, notes=notes)
+        await ableton_clip("set_notes", track_index=0, scene_index=0, notes=notes)
         _mock_conn.send.assert_called_once_with(
             "set_clip_notes",
             {"track_index": 0, "scene_index": 0, "notes": notes})
 
-    def test_set_loop(self):
-        ableton_clip("set_loop", track_index=0, scene_index=0,
+    async def test_set_loop(self):
+        await ableton_clip("set_loop", track_index=0, scene_index=0,
                      start=2.0, end=6.0)
         _mock_conn.send.assert_called_once_with(
             "set_clip_loop",
             {"track_index": 0, "scene_index": 0, "start": 2.0, "end": 6.0})
 
-    def test_stop_all(self):
-        ableton_clip("stop_all")
+    async def test_stop_all(self):
+        await ableton_clip("stop_all")
         _mock_conn.send.assert_called_once_with("stop_all_clips")
 
-    def test_get_arrangement_clips(self):
-        ableton_clip("get_arrangement_clips", track_index=1)
+    async def test_get_arrangement_clips(self):
+        await ableton_clip("get_arrangement_clips", track_index=1)
         _mock_conn.send.assert_called_once_with(
             "get_arrangement_clips", {"track_index": 1})
 
-    def test_unknown_operation(self):
-        result = ableton_clip("quantize")
+    async def test_unknown_operation(self):
+        result = await ableton_clip("quantize")
         assert "Unknown operation" in result
 
 
 class TestDeviceDispatch:
     """Test ableton_device routes to correct actions."""
 
-    def test_list(self):
-        ableton_device("list", track_index=0)
+    async def test_list(self):
+        await ableton_device("list", track_index=0)
         _mock_conn.send.assert_called_once_with(
             "list_devices", {"track_index": 0})
 
-    def test_get(self):
-        ableton_device("get", track_index=0, device_index=1)
+    async def test_get(self):
+        await ableton_device("get", track_index=0, device_index=1)
         _mock_conn.send.assert_called_once_with(
             "get_device", {"track_index": 0, "device_index": 1})
 
-    def test_get_param_by_index(self):
-        ableton_device("get_param", track_index=0, device_index=0, param=2)
+    async def test_get_param_by_index(self):
+        await ableton_device("get_param", track_index=0, device_index=0, param=2)
         _mock_conn.send.assert_called_once_with(
             "get_device_param",
             {"track_index": 0, "device_index": 0, "param": 2})
 
-    def test_set_param(self):
-        ableton_device("set_param", track_index=0, device_index=0,
+    async def test_set_param(self):
+        await ableton_device("set_param", track_index=0, device_index=0,
                        param="Filter Freq", value=5000.0)
         _mock_conn.send.assert_called_once_with(
             "set_device_param",
             {"track_index": 0, "device_index": 0,
              "param": "Filter Freq", "value": 5000.0})
 
-    def test_set_enabled(self):
-        ableton_device("set_enabled", track_index=0, device_index=0,
+    async def test_set_param_fuzzy(self):
+        await ableton_device("set_param", param="cutof", value=0.5, fuzzy=True)
+        _mock_conn.send.assert_called_once_with(
+            "set_device_param",
+            {"track_index": 0, "device_index": 0, "param": "cutof",
+             "fuzzy": True, "value": 0.5})
+
+    async def test_set_params(self):
+        items = [[0, 0, "Cutoff", 0.5], [1, 2, 3, 0.1]]
+        await ableton_device("set_params", items=items)
+        _mock_conn.send.assert_called_once_with(
+            "set_device_params", {"items": items})
+
+    async def test_dump_parameters(self):
+        await ableton_device("dump_parameters", track_indices=[0, 2])
+        _mock_conn.send.assert_called_once_with(
+            "dump_parameters", {"track_indices": [0, 2], "class_name": ""})
+
+    async def test_set_enabled(self):
+        await ableton_device("set_enabled", track_index=0, device_index=0,
                        enabled=False)
         _mock_conn.send.assert_called_once_with(
             "set_device_enabled",
             {"track_index": 0, "device_index": 0, "enabled": False})
 
-    def test_get_chains(self):
-        ableton_device("get_chains", track_index=0, device_index=0)
+    async def test_get_chains(self):
+        await ableton_device("get_chains", track_index=0, device_index=0)
         _mock_conn.send.assert_called_once_with(
             "get_device_chains",
             {"track_index": 0, "device_index": 0})
 
-    def test_insert_automation_point(self):
-        ableton_device("insert_automation_point", track_index=0,
+    async def test_insert_automation_point(self):
+        await ableton_device("insert_automation_point", track_index=0,
                        clip_index=0, device_index=0, param_index=1,
                        time=2.0, value=0.5)
         _mock_conn.send.assert_called_once_with(
@@ -369,89 +444,153 @@ class TestDeviceDispatch:
             {"track_index": 0, "device_index": 0, "clip_index": 0,
              "param_index": 1, "time": 2.0, "value": 0.5})
 
-    def test_unknown_operation(self):
-        result = ableton_device("morph")
+    async def test_write_automation_curve(self):
+        await ableton_device("write_automation_curve", track_index=1,
+                             param_index=2, times=[0.0, 1.0], values=[0.1, 0.9],
+                             tolerance=0.01)
+        _mock_conn.send.assert_called_once_with(
+            "write_automation_curve",
+            {"track_index": 1, "device_index": 0, "clip_index": 0,
+             "param_index": 2, "times": [0.0, 1.0], "values": [0.1, 0.9],
+             "tolerance": 0.01, "clear": False})
+
+    async def test_unknown_operation(self):
+        result = await ableton_device("morph")
         assert "Unknown operation" in result
 
 
 class TestSceneDispatch:
     """Test ableton_scene routes to correct actions."""
 
-    def test_list(self):
-        ableton_scene("list")
+    async def test_list(self):
+        await ableton_scene("list")
         _mock_conn.send.assert_called_once_with("list_scenes")
 
-    def test_create(self):
-        ableton_scene("create", name="Drop")
+    async def test_create(self):
+        await ableton_scene("create", name="Drop")
         _mock_conn.send.assert_called_once_with(
             "create_scene", {"name": "Drop"})
 
-    def test_fire(self):
-        ableton_scene("fire", scene_index=2)
+    async def test_fire(self):
+        await ableton_scene("fire", scene_index=2)
         _mock_conn.send.assert_called_once_with(
             "fire_scene", {"scene_index": 2})
 
-    def test_rename(self):
-        ableton_scene("rename", scene_index=0, name="Intro")
+    async def test_rename(self):
+        await ableton_scene("rename", scene_index=0, name="Intro")
         _mock_conn.send.assert_called_once_with(
             "rename_scene", {"scene_index": 0, "name": "Intro"})
 
-    def test_set_tempo(self):
-        ableton_scene("set_tempo", scene_index=0, bpm=128.0)
+    async def test_set_tempo(self):
+        await ableton_scene("set_tempo", scene_index=0, bpm=128.0)
         _mock_conn.send.assert_called_once_with(
             "set_scene_tempo", {"scene_index": 0, "bpm": 128.0})
 
-    def test_unknown_operation(self):
-        result = ableton_scene("shuffle")
+    async def test_unknown_operation(self):
+        result = await ableton_scene("shuffle")
         assert "Unknown operation" in result
 
 
 class TestBrowserDispatch:
     """Test ableton_browser routes to correct actions."""
 
-    def test_get_tree(self):
-        ableton_browser("get_tree", category="instruments")
+    async def test_get_tree(self):
+        await ableton_browser("get_tree", category="instruments")
+        _mock_conn.send.assert_called_once_with(
+            "get_browser_tree",
+            {"category": "instruments", "limit": 0, "offset": 0, "cursor": ""})
+
+    async def test_get_items(self):
+        await ableton_browser("get_items", path="instruments/Analog")
         _mock_conn.send.assert_called_once_with(
-            "get_browser_tree", {"category": "instruments"})
+            "get_browser_items",
+            {"path": "instruments/Analog", "uri": "", "limit": 0, "offset": 0,
+             "cursor": ""})
 
-    def test_get_items(self):
-        ableton_browser("get_items", path="instruments/Analog")
+    async def test_get_items_next_page(self):
+        await ableton_browser("get_items", cursor="100|path|sounds", limit=50)
         _mock_conn.send.assert_called_once_with(
-            "get_browser_items", {"path": "instruments/Analog"})
+            "get_browser_items",
+            {"path": "", "uri": "", "limit": 50, "offset": 0,
+             "cursor": "100|path|sounds"})
 
-    def test_load_item(self):
-        ableton_browser("load_item", track_index=0, uri="query:Analog")
+    async def test_load_item(self):
+        await ableton_browser("load_item", track_index=0, uri="query:Analog")
         _mock_conn.send.assert_called_once_with(
             "load_browser_item",
             {"track_index": 0, "uri": "query:Analog"})
 
-    def test_get_grooves(self):
-        ableton_browser("get_grooves")
+    async def test_get_grooves(self):
+        await ableton_browser("get_grooves")
         _mock_conn.send.assert_called_once_with("get_grooves")
 
-    def test_unknown_operation(self):
-        result = ableton_browser("preview")
+    async def test_search(self):
+        await ableton_browser("search", query="operator", category="instruments",
+                              limit=5)
+        _mock_conn.send.assert_called_once_with(
+            "search_browser",
+            {"query": "operator", "category": "instruments", "limit": 5})
+
+    async def test_search_partial(self):
+        await ableton_browser("search", query="kick", partial=True)
+        _mock_conn.send.assert_called_once_with(
+            "search_browser",
+            {"query": "kick", "category": "all", "limit": 20, "partial": True})
+
+    async def test_search_falls_back_to_partial(self, monkeypatch):
+        monkeypatch.setattr("ultimate_ableton_mcp.tools.browser.SEARCH_WAIT", 0.01)
+
+        async def send(action, params):
+            if not params.get("partial"):
+                await asyncio.sleep(1)  # index still building: deferred
+            return {"results": [], "complete": False}
+
+        monkeypatch.setattr(_mock_conn.send, "side_effect", send)
+        result = json.loads(await ableton_browser("search", query="kick"))
+        assert result["complete"] is False
+        assert _mock_conn.send.call_args_list[-1][0][1]["partial"] is True
+
+    async def test_search_prefers_disk_cache(self):
+        cache = MagicMock()
+        cache.search = AsyncMock(return_value={"results": [], "source": "disk"})
+        with patch("ultimate_ableton_mcp.tools.browser.get_browser_cache",
+                   lambda: cache):
+            result = await ableton_browser("search", query="kick")
+        cache.search.assert_called_once_with(_mock_conn, "kick", None, 20)
+        _mock_conn.send.assert_not_called()
+        assert json.loads(result)["source"] == "disk"
+
+    async def test_browser_cache_stats_disabled(self):
+        result = json.loads(await ableton_browser("cache_stats"))
+        assert result == {"enabled": False}
+
+    async def test_refresh_index(self):
+        await ableton_browser("refresh_index")
+        _mock_conn.send.assert_called_once_with("refresh_browser_index")
+
+    async def test_unknown_operation(self):
+        result = await ableton_browser("preview")
         assert "Unknown operation" in result
 
 
 class TestToolReturnFormat:
     """All tools must return JSON strings or error messages."""
 
-    def test_session_returns_valid_json(self):
+    async def test_session_returns_valid_json(self):
         _mock_conn.send.return_value = {"tempo": 120}
-        result = ableton_session("get_state")
+        result = await ableton_session("get_state")
         parsed = json.loads(result)
         assert isinstance(parsed, dict)
 
-    def test_transport_returns_valid_json(self):
+    async def test_transport_returns_valid_json(self):
         _mock_conn.send.return_value = {"is_playing": True}
-        result = ableton_transport("play")
+        result = await ableton_transport("play")
         parsed = json.loads(result)
         assert isinstance(parsed, dict)
 
-    def test_track_list_returns_indented_json(self):
+    async def test_track_list_returns_indented_json(self):
         _mock_conn.send.return_value = {"tracks": []}
-        result = ableton_track("list")
+        result = await ableton_track("list")
         assert "\n" in result  # indented output
         parsed = json.loads(result)
         assert "tracks" in parsed